@@ -22,6 +22,7 @@
 # ---------------------------------------------------------------------------##
 
 
+import copy
 import os
 import re
 import sys
@@ -31,11 +32,15 @@ from pickle import UnpicklingError
 import pysollib.app_stat
 from pysollib.actions import PysolMenubar
 from pysollib.actions import PysolToolbar
+from pysollib.app_stat_journal import StatisticsJournal
 from pysollib.app_stat_result import GameStatResult
 from pysollib.app_statistics import Statistics
+from pysollib.cardsetloader import CardsetLoader
 from pysollib.cardsetparser import read_cardset_config
 from pysollib.gamedb import GAME_DB, GI, loadGame
 from pysollib.help import destroy_help_html, help_about
+from pysollib.hint import solver_cache
+from pysollib.imagecache import ScaledImageCache
 from pysollib.images import Images, SubsampledImages
 from pysollib.mfxutil import Struct, destruct
 from pysollib.mfxutil import USE_PIL
@@ -44,6 +49,7 @@ from pysollib.mfxutil import latin1_normalize, print_err
 from pysollib.mfxutil import pickle, unpickle
 from pysollib.mygettext import _
 from pysollib.options import Options
+from pysollib.previewcache import PreviewCache
 from pysollib.pysolrandom import PysolRandom, construct_random
 from pysollib.pysoltk import HTMLViewer
 from pysollib.pysoltk import MfxDialog, MfxExceptionDialog, MfxMessageDialog
@@ -54,8 +60,8 @@ from pysollib.pysoltk import SelectCardsetDialogWithPreview
 from pysollib.pysoltk import SelectDialogTreeData
 from pysollib.pysoltk import destroy_find_card_dialog
 from pysollib.pysoltk import loadImage, wm_withdraw
-from pysollib.resource import CSI, CardsetManager
-from pysollib.resource import Music, MusicManager
+from pysollib.resource import CSI, Cardset, CardsetManager
+from pysollib.resource import Music, MusicManager, ResourceIndex
 from pysollib.resource import Sample, SampleManager
 from pysollib.resource import Tile, TileManager
 from pysollib.settings import DEBUG
@@ -69,6 +75,8 @@ else:
     from pysollib.pysoltk import destroy_solver_dialog
 if TOOLKIT == 'kivy':
     import logging
+if USE_PIL:
+    from pysollib.pysoltk import PIL_Image, decodeImage
 
 _GameStatResult = GameStatResult
 GameStat = pysollib.app_stat.GameStat
@@ -123,6 +131,7 @@ class Application:
         self.sample_manager = SampleManager()
         self.music_manager = MusicManager()
         self.music_playlist = []
+        self.resource_index = ResourceIndex()
         self.intro = Struct(
             progress=None,            # progress bar
         )
@@ -133,6 +142,8 @@ class Application:
             plugins=os.path.join(config, "plugins"),
             savegames=os.path.join(config, "savegames"),
             maint=os.path.join(config, "maint"),          # debug
+            previews=os.path.join(config, "previews"),
+            imagecache=os.path.join(config, "imagecache"),
         )
         for k, v in self.dn.__dict__.items():
             #             if os.name == "nt":
@@ -144,14 +155,29 @@ class Application:
             opt=os.path.join(self.dn.config, "options.dat"),
             opt_cfg=os.path.join(self.dn.config, "options.cfg"),
             stats=os.path.join(self.dn.config, "statistics.dat"),
+            stats_journal=os.path.join(self.dn.config, "statistics.journal"),
             holdgame=os.path.join(self.dn.config, "holdgame.dat"),
             comments=os.path.join(self.dn.config, "comments.dat"),
+            solver=os.path.join(self.dn.config, "solver.dat"),
+            resources=os.path.join(self.dn.config, "resources.dat"),
         )
         for k, v in self.dn.__dict__.items():
             if os.name == "nt":
                 v = os.path.normcase(v)
             v = os.path.normpath(v)
             self.fn.__dict__[k] = v
+        # pictures for the select game dialog (needs PIL)
+        self.preview_cache = None
+        if USE_PIL:
+            self.preview_cache = PreviewCache(self.dn.previews)
+        # scaled images of the cardsets (needs PIL)
+        self.image_cache = None
+        if USE_PIL:
+            self.image_cache = ScaledImageCache(self.dn.imagecache)
+        # decoding the images of the cardsets in threads (needs PIL)
+        self.cardset_loader = None
+        if USE_PIL:
+            self.cardset_loader = CardsetLoader(decodeImage, PIL_Image)
         # random generators
         self.gamerandom = PysolRandom()
         self.miscrandom = PysolRandom()
@@ -291,6 +317,12 @@ class Application:
             except Exception:
                 traceback.print_exc()
                 pass
+            # save solutions
+            try:
+                self.saveSolverCache()
+            except Exception:
+                traceback.print_exc()
+                pass
             # shut down audio
             try:
                 self.audio.destroy()
@@ -312,6 +344,12 @@ class Application:
         except Exception:
             traceback.print_exc()
             pass
+        # try to load known solutions
+        try:
+            self.loadSolverCache()
+        except Exception:
+            traceback.print_exc()
+            pass
 
         # Under normal circumstances, this won't trigger.
         # But if the config has been incorrectly edited or
@@ -674,7 +712,7 @@ class Application:
         # from pprint import pprint; pprint(self.opt.cardset)
 
     def loadCardset(self, cs, id=0, update=7, progress=None,
-                    tocache=False, noprogress=False):
+                    tocache=False, noprogress=False, wait=True):
         # print 'loadCardset', cs.ident
         r = 0
         if cs is None or cs.error:
@@ -698,6 +736,13 @@ class Application:
                     if self.menubar is not None:
                         self.menubar.updateBackgroundImagesMenu()
                 return 1
+        # the images are decoded in the threads of the cardset loader
+        job = None
+        if self.cardset_loader is not None:
+            job = self.cardset_loader.start(cs)
+            if not wait and not job.isDone():
+                # call again later (see isCardsetLoading)
+                return 0
         #
         if progress is None and not noprogress:
             self.wm_save_state()
@@ -711,6 +756,8 @@ class Application:
                                         images=self.progress_images)
         images = Images(self.dataloader, cs)
         images.cardset_bottoms = self.opt.use_cardset_bottoms
+        images.cache = self.image_cache
+        images.loader_job = job
         try:
             if not images.load(app=self, progress=progress):
                 raise Exception("Invalid or damaged cardset")
@@ -757,11 +804,20 @@ class Application:
             MfxExceptionDialog(
                 self.top, ex, title=_("Cardset load error"),
                 text=_("Error while loading cardset"))
+        if job is not None:
+            self.cardset_loader.discard(cs)
+            images.loader_job = None
         self.intro.progress = progress
         if r and not tocache and self.menubar is not None:
             self.menubar.updateBackgroundImagesMenu()
         return r
 
+    def isCardsetLoading(self, cs):
+        # loadCardset(cs, wait=False) returned before the images of the
+        # cardset were decoded
+        return (self.cardset_loader is not None and
+                self.cardset_loader.get(cs) is not None)
+
     def checkCompatibleCardsetType(self, gi, cs):
         assert gi is not None
         assert cs is not None
@@ -943,12 +999,8 @@ class Application:
         self.opt.setConstants()
 
     def loadStatistics(self):
-        if not os.path.exists(self.fn.stats):
-            return
-        stats = unpickle(self.fn.stats)
-        if stats:
-            # print "loaded:", stats.__dict__
-            self.stats.__dict__.update(stats.__dict__)
+        journal = StatisticsJournal(self.fn.stats, self.fn.stats_journal)
+        journal.load(self.stats)
         # start a new session
         self.stats.session_games = {}
         self.stats.session_balance = {}
@@ -963,7 +1015,24 @@ class Application:
         self.opt.save(self.fn.opt_cfg)
 
     def saveStatistics(self):
-        self.__saveObject(self.stats, self.fn.stats)
+        if self.stats.journal:
+            self.stats.journal.compact(self.stats)
+        else:
+            self.__saveObject(self.stats, self.fn.stats)
+
+    def loadSolverCache(self):
+        if os.path.exists(self.fn.solver):
+            solver_cache.load(self.fn.solver)
+
+    def saveSolverCache(self):
+        solver_cache.save(self.fn.solver)
+
+    def loadResourceIndex(self):
+        if os.path.exists(self.fn.resources):
+            self.resource_index.load(self.fn.resources)
+
+    def saveResourceIndex(self):
+        self.resource_index.save(self.fn.resources)
 
     #
     # access games database
@@ -982,71 +1051,29 @@ class Application:
         return self.gdb.getGamesIdSortedByName()
 
     ##
-    def getGamesIdSortedByPlayed(self, player=''):
+    def getStatsIndex(self, player=''):
         if player == '':
             player = self.opt.player
+        return self.stats.getStatsIndex(
+            player, self.gdb.getGamesIdSortedByName())
 
-        def _key(a):
-            wa, la, ta, ma = self.stats.getFullStats(player, a)
-            return wa+la
-        games = list(self.gdb.getGamesIdSortedByName())
-        games.sort(key=_key)
-        return games[::-1]
+    def getGamesIdSortedByPlayed(self, player=''):
+        return self.getStatsIndex(player).getGamesIdSortedBy('played')
 
     def getGamesIdSortedByWon(self, player=''):
-        if player == '':
-            player = self.opt.player
-
-        def _key(a):
-            wa, la, ta, ma = self.stats.getFullStats(player, a)
-            return wa
-        games = list(self.gdb.getGamesIdSortedByName())
-        games.sort(key=_key)
-        return games[::-1]
+        return self.getStatsIndex(player).getGamesIdSortedBy('won')
 
     def getGamesIdSortedByLost(self, player=''):
-        if player == '':
-            player = self.opt.player
-
-        def _key(a):
-            wa, la, ta, ma = self.stats.getFullStats(player, a)
-            return la
-        games = list(self.gdb.getGamesIdSortedByName())
-        games.sort(key=_key)
-        return games[::-1]
+        return self.getStatsIndex(player).getGamesIdSortedBy('lost')
 
     def getGamesIdSortedByPercent(self, player=''):
-        if player == '':
-            player = self.opt.player
-
-        def _key(a):
-            wa, la, ta, ma = self.stats.getFullStats(player, a)
-            return float(wa)/(1 if wa+la == 0 else wa+la)
-        games = list(self.gdb.getGamesIdSortedByName())
-        games.sort(key=_key)
-        return games[::-1]
+        return self.getStatsIndex(player).getGamesIdSortedBy('percent')
 
     def getGamesIdSortedByPlayingTime(self, player=''):
-        if player == '':
-            player = self.opt.player
-
-        def _key(a):
-            wa, la, ta, ma = self.stats.getFullStats(player, a)
-            return ta
-        games = list(self.gdb.getGamesIdSortedByName())
-        games.sort(key=_key)
-        return games[::-1]
+        return self.getStatsIndex(player).getGamesIdSortedBy('time')
 
     def getGamesIdSortedByMoves(self, player=''):
-        if player == '':
-            player = self.opt.player
-
-        def _key(a):
-            wa, la, ta, ma = self.stats.getFullStats(player, a)
-            return ma
-        games = list(self.gdb.getGamesIdSortedByName())
-        games.sort(key=_key)
-        return games[::-1]
+        return self.getStatsIndex(player).getGamesIdSortedBy('moves')
 
     def getGameInfo(self, id):
         return self.gdb.get(id)
@@ -1137,7 +1164,19 @@ class Application:
 
     # read & parse a cardset config.txt file - see class Cardset in resource.py
     def _readCardsetConfig(self, dirname, filename):
-        cs = read_cardset_config(dirname, filename)
+        # the parsed config is kept in the resource index until the
+        # directory or config.txt change
+        def read():
+            cs = read_cardset_config(dirname, filename)
+            if cs:
+                return cs.__dict__
+            return None
+        mtimes = (os.stat(dirname).st_mtime, os.stat(filename).st_mtime)
+        config = self.resource_index.lookup('cardset', dirname, mtimes, read)
+        if not config:
+            return None
+        cs = Cardset()
+        cs.update(copy.deepcopy(config))
         # set offsets from options.cfg
         if cs.ident in self.opt.offsets:
             cs.CARD_XOFFSET, cs.CARD_YOFFSET = self.opt.offsets[cs.ident]
@@ -1154,10 +1193,11 @@ class Application:
             dirs += manager.getSearchDirs(self, "cardsets-*")
         found = []
         found_names = []  # (to check for duplicates)
+        index = self.resource_index
         for dirname in dirs:
             try:
                 subdirs = [os.path.join(dirname, subdir)
-                           for subdir in os.listdir(dirname)
+                           for subdir in index.listdir(dirname)[0]
                            if subdir.startswith('cardset-')]
             except EnvironmentError:
                 traceback.print_exc()
@@ -1165,7 +1205,11 @@ class Application:
             subdirs.sort()
             for d in subdirs:
                 config_txt_path = os.path.join(d, "config.txt")
-                if not os.path.isfile(config_txt_path):
+                try:
+                    files = set(map(os.path.normcase, index.listdir(d)[1]))
+                except EnvironmentError:
+                    continue
+                if "config.txt" not in files:
                     continue
                 try:
                     cs = self._readCardsetConfig(d, config_txt_path)
@@ -1177,13 +1221,11 @@ class Application:
                               % config_txt_path)
                     continue
                 back = cs.backnames[cs.backindex]
-                back_im_path = os.path.join(d, back)
-                shade_im_path = os.path.join(d, "shade" + cs.ext)
                 if (cs.name not in found_names and
                         cs.ext in IMAGE_EXTENSIONS and
                         cs.CARDD <= screendepth and
-                        os.path.isfile(back_im_path) and
-                        os.path.isfile(shade_im_path)):
+                        os.path.normcase(back) in files and
+                        os.path.normcase("shade" + cs.ext) in files):
                     found.append(cs)
                     found_names.append(cs.name)
 
@@ -1200,13 +1242,11 @@ class Application:
         """docstring for _init_tiles_process_die"""
         names = []
         if dirname and os.path.isdir(dirname):
-            names = os.listdir(dirname)
+            names = self.resource_index.listdir(dirname)[1]
         for name in names:
             if not name or not image_ext_re.search(name):
                 continue
             f = os.path.join(dirname, name)
-            if not os.path.isfile(f):
-                continue
             tile = Tile()
             tile.filename = f
             n = image_ext_re.sub("", name)
@@ -1267,13 +1307,12 @@ class Application:
             if dirname:
                 dirname = os.path.normpath(dirname)
             try:
-                for name in self._my_list_dir(dirname):
+                files = self.resource_index.listdir(dirname)[1]
+                for name in sorted(map(os.path.normcase, files)):
                     if not name or not ext_re.search(name):
                         continue
                     f = os.path.join(dirname, name)
                     f = os.path.normpath(f)
-                    if not os.path.isfile(f):
-                        continue
                     obj = Resource_Class()
                     obj.filename = f
                     n = ext_re.sub("", name.strip())
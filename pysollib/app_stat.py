@@ -36,9 +36,28 @@ class GameStat:
         self.score_casino_result = GameStatResult()
 
     def update(self, game, status):
-        #
+        return self.updateValues(status, self.getValues(game, status))
+
+    @staticmethod
+    def getValues(game, status):
+        # everything update() needs to know about a finished game:
+        # (gameid, game_number, start_time, score, score_casino,
+        #  elapsed_time, moves, total_moves)
         game_number = game.getGameNumber(format=0)
         game_start_time = game.gstats.start_time
+        if status == 0:
+            return (game.id, game_number, game_start_time,
+                    None, None, None, None, None)
+        score = game.getGameScore()
+        score_casino = game.getGameScoreCasino()
+        game.updateTime()
+        return (game.id, game_number, game_start_time, score, score_casino,
+                game.stats.elapsed_time, game.moves.index,
+                game.stats.total_moves)
+
+    def updateValues(self, status, values):
+        gameid, game_number, game_start_time, score, score_casino, \
+            elapsed_time, moves, total_moves = values
         # update number of games
         # status:
         # -1 - NOT WON (not played)
@@ -55,28 +74,22 @@ class GameStat:
         else:  # status == 2
             self.num_perfect += 1
 
-        score = game.getGameScore()
         # print 'GameScore:', score
         score_p = None
         if score is not None:
             score_p = self.score_result.update(
-                game.id, score, game_number, game_start_time)
-        score = game.getGameScoreCasino()
-        # print 'GameScoreCasino:', score
+                gameid, score, game_number, game_start_time)
+        # print 'GameScoreCasino:', score_casino
         score_casino_p = None
-        if score is not None:
+        if score_casino is not None:
             score_casino_p = self.score_casino_result.update(
-                game.id, score, game_number, game_start_time)
-
-        if status == 0:
-            return
+                gameid, score_casino, game_number, game_start_time)
 
-        game.updateTime()
         time_p = self.time_result.update(
-            game.id, game.stats.elapsed_time, game_number, game_start_time)
+            gameid, elapsed_time, game_number, game_start_time)
         moves_p = self.moves_result.update(
-            game.id, game.moves.index, game_number, game_start_time)
+            gameid, moves, game_number, game_start_time)
         total_moves_p = self.total_moves_result.update(
-            game.id, game.stats.total_moves, game_number, game_start_time)
+            gameid, total_moves, game_number, game_start_time)
 
         return time_p, moves_p, total_moves_p, score_p, score_casino_p
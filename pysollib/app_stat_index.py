@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  Copyright (C) 1998-2003 Markus Franz Xaver Johannes Oberhumer
+#  Copyright (C) 2003 Mt. Hood Playing Card Co.
+#  Copyright (C) 2005-2009 Skomoroh
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+from array import array
+from bisect import bisect_left, insort
+
+
+# ************************************************************************
+# * The statistics of one player for all games, kept in columns (one row
+# * per game, in name order) with the sort orders of the statistics
+# * dialog. Statistics keeps it up to date when a game is finished.
+# ************************************************************************
+
+class PlayerStatsIndex:
+
+    SORT_KEYS = ('played', 'won', 'lost', 'time', 'moves', 'percent')
+
+    def __init__(self, games, games_stats):
+        # games: the game ids sorted by name
+        # games_stats: the GameStat dictionary of the player
+        self.games = games
+        self._rows = dict((id, row) for row, id in enumerate(games))
+        n = len(games)
+        self.won = array('l', [0]) * n
+        self.lost = array('l', [0]) * n
+        self.time = array('d', [0.0]) * n
+        self.moves = array('d', [0.0]) * n
+        # sort_by: sorted list of (key, row); built when first used
+        self._orders = {}
+        for id, s in games_stats.items():
+            row = self._rows.get(id)
+            if row is not None:
+                self._setRow(row, s)
+
+    def _setRow(self, row, s):
+        if s is None:
+            self.won[row] = self.lost[row] = 0
+            self.time[row] = self.moves[row] = 0.0
+        else:
+            self.won[row] = s.num_won + s.num_perfect
+            self.lost[row] = s.num_lost
+            self.time[row] = s.time_result.average
+            self.moves[row] = s.moves_result.average
+
+    def _key(self, sort_by, row):
+        won, lost = self.won[row], self.lost[row]
+        if sort_by == 'played':
+            return won + lost
+        if sort_by == 'won':
+            return won
+        if sort_by == 'lost':
+            return lost
+        if sort_by == 'time':
+            return self.time[row]
+        if sort_by == 'moves':
+            return self.moves[row]
+        # percent
+        return float(won) / (1 if won + lost == 0 else won + lost)
+
+    def update(self, gameid, game_stat):
+        # game_stat is None when the statistics of the game were reset
+        row = self._rows.get(gameid)
+        if row is None:
+            return
+        old_keys = [(sort_by, self._key(sort_by, row))
+                    for sort_by in self._orders]
+        self._setRow(row, game_stat)
+        # move the row within the orders that are already built
+        for sort_by, key in old_keys:
+            order = self._orders[sort_by]
+            del order[bisect_left(order, (key, row))]
+            insort(order, (self._key(sort_by, row), row))
+
+    def getFullStats(self, gameid):
+        # returned (won, lost, playing time, moves)
+        row = self._rows.get(gameid)
+        if row is None:
+            return (0, 0, 0, 0)
+        return (self.won[row], self.lost[row], self.time[row],
+                self.moves[row])
+
+    def getGamesIdSortedBy(self, sort_by):
+        if sort_by == 'name':
+            return list(self.games)
+        order = self._orders.get(sort_by)
+        if order is None:
+            order = [(self._key(sort_by, row), row)
+                     for row in range(len(self.games))]
+            order.sort()
+            self._orders[sort_by] = order
+        # descending, like sorting the name list and reversing it
+        games = self.games
+        return [games[row] for key, row in reversed(order)]
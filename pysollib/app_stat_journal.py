@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  Copyright (C) 1998-2003 Markus Franz Xaver Johannes Oberhumer
+#  Copyright (C) 2003 Mt. Hood Playing Card Co.
+#  Copyright (C) 2005-2009 Skomoroh
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import os
+from pickle import Pickler, Unpickler, UnpicklingError
+
+from pysollib.settings import VERSION_TUPLE
+
+
+# ************************************************************************
+# * Statistics are saved in two files:
+# *  - the checkpoint (statistics.dat) is the pickled Statistics without
+# *    the game logs (prev_games and all_prev_games)
+# *  - the journal (statistics.journal) is a sequence of pickled records,
+# *    every finished game and every reset is appended to it:
+# *      ('game', player, status, log, values)   see Statistics.updateStats
+# *      ('reset', player, gameid)
+# *      ('log', player, log, 'prev' or 'all')   see compact()
+# * The checkpoint knows how much of the journal it covers, at startup
+# * only the records after it are replayed. The logs are read from the
+# * whole journal when they are first used (Statistics.prev_games).
+# * compact() writes a new checkpoint; this is done on exit and after
+# * COMPACT_RECORDS records.
+# ************************************************************************
+
+class StatisticsJournal:
+    COMPACT_RECORDS = 100
+
+    def __init__(self, checkpoint, filename):
+        self.checkpoint = checkpoint
+        self.filename = filename
+        self.records = 0            # records since the last checkpoint
+        # write the logs into a new journal (old statistics.dat format)
+        self.rewrite = False
+
+    def _size(self):
+        try:
+            return os.path.getsize(self.filename)
+        except OSError:
+            return 0
+
+    def load(self, stats):
+        if os.path.exists(self.checkpoint):
+            with open(self.checkpoint, 'rb') as fh:
+                obj = Unpickler(fh).load()
+            if obj:
+                stats.__dict__.update(obj.__dict__)
+        stats.journal = self
+        if stats._logs_loaded and (stats._prev_games or
+                                   stats._all_prev_games):
+            # the logs are in the checkpoint, whatever is in the journal
+            # is not related to it
+            self.rewrite = True
+            return
+        stats._logs_loaded = False
+        if stats.journal_size > self._size():
+            # lost or replaced
+            stats.journal_size = 0
+        records, end = [], stats.journal_size
+        for record, end in self._read(stats.journal_size):
+            records.append(record)
+        if end < self._size():
+            # the last write was not completed; cut it off, or the next
+            # records would be appended after it and never be read
+            with open(self.filename, 'r+b') as fh:
+                fh.truncate(end)
+        stats.replayJournal(records)
+        self.records = len(records)
+
+    def read(self, offset=0):
+        for record, end in self._read(offset):
+            yield record
+
+    def _read(self, offset):
+        # yield (record, offset of the end of the record)
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, 'rb') as fh:
+            fh.seek(offset)
+            unpickler = Unpickler(fh)
+            while True:
+                try:
+                    record = unpickler.load()
+                except EOFError:
+                    return
+                except (UnpicklingError, ValueError, TypeError):
+                    # the last write was not completed
+                    return
+                yield record, fh.tell()
+
+    def append(self, stats, record):
+        if self.rewrite:
+            # the journal is not in use until the next checkpoint
+            self.records += 1
+        else:
+            with open(self.filename, 'ab') as fh:
+                Pickler(fh, -1).dump(record)
+            self.records += 1
+        if self.records >= self.COMPACT_RECORDS:
+            self.compact(stats)
+
+    def compact(self, stats):
+        if self.rewrite:
+            tmp = self.filename + '.tmp'
+            with open(tmp, 'wb') as fh:
+                p = Pickler(fh, -1)
+                for which, games in (('prev', stats.prev_games),
+                                     ('all', stats.all_prev_games)):
+                    for player, logs in games.items():
+                        for log in logs:
+                            p.dump(('log', player, log, which))
+                            # every record is a pickle of its own
+                            p.clear_memo()
+            os.replace(tmp, self.filename)
+            self.rewrite = False
+        stats.journal_size = self._size()
+        stats.version_tuple = VERSION_TUPLE
+        stats.saved += 1
+        tmp = self.checkpoint + '.tmp'
+        with open(tmp, 'wb') as fh:
+            Pickler(fh, -1).dump(stats)
+        os.replace(tmp, self.checkpoint)
+        self.records = 0
@@ -15,46 +15,86 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from pysollib.mfxutil import Struct
+from bisect import bisect_right
+from collections import namedtuple
+
 from pysollib.settings import TOP_SIZE
 
 
+TopResult = namedtuple(
+    'TopResult', ('gameid', 'value', 'game_number', 'game_start_time'))
+
+
+class TopResults:
+    # The TOP_SIZE lowest results, in ascending order; an equal result
+    # goes after the ones that are already there.
+
+    def __init__(self, results=()):
+        self._results = []
+        self._values = []       # the values, for bisect
+        for r in results:
+            self.add(r.gameid, r.value, r.game_number, r.game_start_time)
+
+    def __len__(self):
+        return len(self._results)
+
+    def __iter__(self):
+        return iter(self._results)
+
+    def __getitem__(self, i):
+        return self._results[i]
+
+    def rank(self, value):
+        # the position (1-based) a result would get, or None when it
+        # would not be in the top
+        n = bisect_right(self._values, value)
+        if n >= TOP_SIZE:
+            return None
+        return n + 1
+
+    def add(self, gameid, value, game_number, game_start_time):
+        position = self.rank(value)
+        if position is None:
+            return None
+        self._values.insert(position - 1, value)
+        self._results.insert(position - 1, TopResult(
+            gameid, value, game_number, game_start_time))
+        del self._values[TOP_SIZE:]
+        del self._results[TOP_SIZE:]
+        return position
+
+    # statistics.dat stores plain tuples
+
+    def __getstate__(self):
+        return [tuple(r) for r in self._results]
+
+    def __setstate__(self, state):
+        self.__init__([TopResult(*r) for r in state])
+
+
 class GameStatResult:
     def __init__(self):
         self.min = 0
         self.max = 0
-        self.top = []
+        self.top = TopResults()
         self.num = 0
         self.total = 0  # sum of all values
         self.average = 0
 
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if isinstance(self.top, list):
+            # a list of Struct, from older versions
+            self.top = TopResults(self.top)
+
     def update(self, gameid, value, game_number, game_start_time):
         # update min & max
         if not self.min or value < self.min:
             self.min = value
         if not self.max or value > self.max:
             self.max = value
-        # calculate position & update top
-        position = None
-        n = 0
-        for i in self.top:
-            if value < i.value:
-                position = n+1
-                v = Struct(gameid=gameid,
-                           value=value,
-                           game_number=game_number,
-                           game_start_time=game_start_time)
-                self.top.insert(n, v)
-                del self.top[TOP_SIZE:]
-                break
-            n += 1
-        if not position and len(self.top) < TOP_SIZE:
-            v = Struct(gameid=gameid,
-                       value=value,
-                       game_number=game_number,
-                       game_start_time=game_start_time)
-            self.top.append(v)
-            position = len(self.top)
+        # update top
+        position = self.top.add(gameid, value, game_number, game_start_time)
         # update average
         self.total += value
         self.num += 1
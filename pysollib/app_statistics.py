@@ -22,6 +22,7 @@
 # ---------------------------------------------------------------------------##
 
 from pysollib.app_stat import GameStat
+from pysollib.app_stat_index import PlayerStatsIndex
 from pysollib.settings import VERSION_TUPLE
 
 
@@ -32,24 +33,115 @@ class Statistics:
         # a dictionary of dictionaries of GameStat (keys: player and gameid)
         self.games_stats = {}
         # a dictionary of lists of tuples (key: player)
-        self.prev_games = {}
-        self.all_prev_games = {}
+        # (prev_games and all_prev_games, see below)
+        self._prev_games = {}
+        self._all_prev_games = {}
         self.session_games = {}
         # some simple balance scores (key: gameid)
         self.total_balance = {}     # a dictionary of integers
         self.session_balance = {}   # reset per session
         self.gameid_balance = 0     # reset when changing the gameid
+        # the StatisticsJournal (see app_stat_journal.py); the checkpoint
+        # covers the first journal_size bytes of it
+        self.journal = None
+        self.journal_size = 0
+        # the logs are read from the journal when they are first used
+        self._logs_loaded = True
+        # PlayerStatsIndex (key: player) and session counters, see
+        # getStatsIndex() and getSessionStats()
+        self._indexes = {}
+        self._session_counts = {}
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['journal']
+        del state['_logs_loaded']
+        del state['_indexes']
+        del state['_session_counts']
+        prev_games = state.pop('_prev_games')
+        all_prev_games = state.pop('_all_prev_games')
+        if self.journal is None:
+            del state['journal_size']
+            state['prev_games'] = prev_games
+            state['all_prev_games'] = all_prev_games
+        else:
+            # the logs are in the journal
+            state['prev_games'] = {}
+            state['all_prev_games'] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.journal = None
+        self.journal_size = 0
+        self._indexes = {}
+        self._session_counts = {}
+        self._prev_games = state.pop('prev_games', {})
+        self._all_prev_games = state.pop('all_prev_games', {})
+        # a checkpoint of a journal has its logs in the journal
+        self._logs_loaded = 'journal_size' not in state
+        self.__dict__.update(state)
 
     def new(self):
         return Statistics()
 
+    @property
+    def prev_games(self):
+        self._loadLogs()
+        return self._prev_games
+
+    @property
+    def all_prev_games(self):
+        self._loadLogs()
+        return self._all_prev_games
+
+    def _loadLogs(self):
+        if self._logs_loaded:
+            return
+        self._logs_loaded = True
+        if self.journal is None:
+            return
+        prev_games, all_prev_games = self._prev_games, self._all_prev_games
+        for record in self.journal.read():
+            kind, player = record[:2]
+            if kind == 'game':
+                status, log = record[2:4]
+                if player is not None and status >= 0:
+                    prev_games.setdefault(player, []).append(log)
+                    all_prev_games.setdefault(player, []).append(log)
+            elif kind == 'log':
+                # see StatisticsJournal.compact()
+                log, which = record[2:4]
+                games = prev_games if which == 'prev' else all_prev_games
+                games.setdefault(player, []).append(log)
+            elif kind == 'reset':
+                self.__resetPrevGames(player, prev_games, record[2])
+
+    def replayJournal(self, records):
+        # update the aggregates from the records after the checkpoint
+        for record in records:
+            kind, player = record[:2]
+            if kind == 'game':
+                status, log, values = record[2:5]
+                self._updateGameStat(player, status, values)
+            elif kind == 'reset':
+                self.__resetGamesStats(player, record[2])
+
+    def _addJournalRecord(self, record):
+        if self.journal is not None:
+            self.journal.append(self, record)
+
     #
     # player & demo statistics
     #
 
     def resetStats(self, player, gameid):
-        self.__resetPrevGames(player, self.prev_games, gameid)
+        if self._logs_loaded:
+            self.__resetPrevGames(player, self._prev_games, gameid)
         self.__resetPrevGames(player, self.session_games, gameid)
+        self.__resetGamesStats(player, gameid)
+        self._addJournalRecord(('reset', player, gameid))
+
+    def __resetGamesStats(self, player, gameid):
         if player not in self.games_stats:
             return
         if gameid == 0:
@@ -58,11 +150,14 @@ class Statistics:
                 del self.games_stats[player]
             except KeyError:
                 pass
+            self._indexes.pop(player, None)
         else:
             try:
                 del self.games_stats[player][gameid]
             except KeyError:
                 pass
+            if player in self._indexes:
+                self._indexes[player].update(gameid, None)
 
     def __resetPrevGames(self, player, games, gameid):
         if player not in games:
@@ -87,11 +182,29 @@ class Statistics:
                     s.moves_result.average,)
         return (0, 0, 0, 0)
 
+    def getStatsIndex(self, player, games):
+        # games: the game ids sorted by name (GameDB.getGamesIdSortedByName)
+        index = self._indexes.get(player)
+        if index is None or index.games is not games:
+            index = PlayerStatsIndex(games, self.games_stats.get(player, {}))
+            self._indexes[player] = index
+        return index
+
     def getSessionStats(self, player, gameid):
+        # count the session log incrementally; the log is replaced (not
+        # shortened in place) when it is reset
         games = self.session_games.get(player, [])
-        games = [g for g in games if g[0] == gameid]
-        won = len([g for g in games if g[2] > 0])
-        lost = len([g for g in games if g[2] == 0])
+        log, n, counts = self._session_counts.get(player, (None, 0, None))
+        if log is not games or n > len(games):
+            n, counts = 0, {}
+        for g in games[n:]:
+            c = counts.setdefault(g[0], [0, 0])
+            if g[2] > 0:
+                c[0] += 1
+            elif g[2] == 0:
+                c[1] += 1
+        self._session_counts[player] = (games, len(games), counts)
+        won, lost = counts.get(gameid, (0, 0))
         return won, lost
 
     def updateStats(self, player, game, status):
@@ -102,18 +215,15 @@ class Statistics:
                game.GAME_VERSION)
         # full log
         if status >= 0:
-            if player is None:
-                # demo
-                ret = self.updateGameStat(player, game, status)
-            else:
+            values = GameStat.getValues(game, status)
+            if player is not None:
                 # player
-                if player not in self.prev_games:
-                    self.prev_games[player] = []
-                self.prev_games[player].append(log)
-                if player not in self.all_prev_games:
-                    self.all_prev_games[player] = []
-                self.all_prev_games[player].append(log)
-                ret = self.updateGameStat(player, game, status)
+                if self._logs_loaded:
+                    self._prev_games.setdefault(player, []).append(log)
+                    self._all_prev_games.setdefault(player, []).append(log)
+            ret = self._updateGameStat(player, status, values)
+            # one small write per game, see StatisticsJournal
+            self._addJournalRecord(('game', player, status, log, values))
         # session log
         if player not in self.session_games:
             self.session_games[player] = []
@@ -121,23 +231,26 @@ class Statistics:
         return ret
 
     def updateGameStat(self, player, game, status):
+        return self._updateGameStat(
+            player, status, GameStat.getValues(game, status))
+
+    def _updateGameStat(self, player, status, values):
+        gameid = values[0]
         #
         if player not in self.games_stats:
             self.games_stats[player] = {}
-        if game.id not in self.games_stats[player]:
-            game_stat = GameStat(game.id)
-            self.games_stats[player][game.id] = game_stat
+        if gameid not in self.games_stats[player]:
+            game_stat = GameStat(gameid)
+            self.games_stats[player][gameid] = game_stat
         else:
-            game_stat = self.games_stats[player][game.id]
+            game_stat = self.games_stats[player][gameid]
         if 'all' not in self.games_stats[player]:
             all_games_stat = GameStat('all')
             self.games_stats[player]['all'] = all_games_stat
         else:
             all_games_stat = self.games_stats[player]['all']
-        all_games_stat.update(game, status)
-        return game_stat.update(game, status)
-
-#      def __setstate__(self, state):      # for backward compatible
-#          if 'gameid' not in state:
-#              self.gameid = None
-#          self.__dict__.update(state)
+        all_games_stat.updateValues(status, values)
+        ret = game_stat.updateValues(status, values)
+        if player in self._indexes:
+            self._indexes[player].update(gameid, game_stat)
+        return ret
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+# Copyright (C) 1998-2003 Markus Franz Xaver Johannes Oberhumer
+# Copyright (C) 2003 Mt. Hood Playing Card Co.
+# Copyright (C) 2005-2009 Skomoroh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import os
+import threading
+
+from six.moves import queue
+
+# ************************************************************************
+# * Decoding the image files of cardsets in a pool of threads.
+# *
+# * Only the decoding (PIL) runs in the threads; Images.load takes the
+# * decoded images of a CardsetJob in its order and makes the Tk images.
+# * Application.loadCardset(wait=False) starts a job and returns, the
+# * cardset is loaded when it is called again after the job is done.
+# ************************************************************************
+
+
+class CardsetJob:
+    def __init__(self, cs, filenames, make):
+        self.cs = cs
+        self.make = make
+        self.filenames = frozenset(filenames)
+        self._images = {}               # filename: PIL image or None
+        self._cond = threading.Condition()
+        self.discarded = False
+
+    def _put(self, filename, image):
+        with self._cond:
+            self._images[filename] = image
+            self._cond.notify_all()
+
+    def isDone(self):
+        with self._cond:
+            return len(self._images) == len(self.filenames)
+
+    def getImage(self, filename):
+        # the image of filename (made in this thread from the decoded PIL
+        # image), or None if the file is not part of the job or could not
+        # be decoded
+        if filename not in self.filenames:
+            return None
+        with self._cond:
+            while filename not in self._images and not self.discarded:
+                self._cond.wait()
+            image = self._images.get(filename)
+        if image is None:
+            return None
+        return self.make(image=image)
+
+
+class CardsetLoader:
+    WORKERS = 4
+
+    def __init__(self, decode, make):
+        # decode(filename) returns a PIL image (see tkutil.decodeImage),
+        # make(image=...) the image of the toolkit (see tkutil.PIL_Image)
+        self.decode = decode
+        self.make = make
+        self._jobs = {}                 # cardset ident: CardsetJob
+        self._queue = queue.Queue()
+        self._threads = []
+
+    def start(self, cs):
+        # start decoding the images of cardset cs, unless it is already
+        job = self._jobs.get(cs.ident)
+        if job is not None:
+            return job
+        filenames = getCardsetFilenames(cs)
+        job = self._jobs[cs.ident] = CardsetJob(cs, filenames, self.make)
+        for filename in filenames:
+            self._queue.put((job, filename))
+        while len(self._threads) < self.WORKERS:
+            thread = threading.Thread(target=self._run)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+        return job
+
+    def get(self, cs):
+        return self._jobs.get(cs.ident)
+
+    def discard(self, cs):
+        # the images of the job were used (or are not needed)
+        job = self._jobs.pop(cs.ident, None)
+        if job is not None:
+            # the files not yet decoded are skipped
+            with job._cond:
+                job.discarded = True
+                job._cond.notify_all()
+
+    def _run(self):
+        while True:
+            job, filename = self._queue.get()
+            if job.discarded:
+                continue
+            try:
+                image = self.decode(filename)
+                image.load()
+            except Exception:
+                # Images.load reads the file again and reports the error
+                image = None
+            job._put(filename, image)
+
+
+def getCardsetFilenames(cs):
+    # the image files of a cardset read by Images.load: faces, backs and
+    # the bottoms and letters of the cardset
+    names = [n + cs.ext for n in cs.getFaceCardNames()]
+    names.extend(n for n in cs.backnames if n)
+    for i in range(cs.nbottoms):
+        names.append("bottom%02d%s" % (i + 1, cs.ext))
+        names.append("bottom%02d-n%s" % (i + 1, cs.ext))
+    for i in range(cs.nletters):
+        names.append("l%02d%s" % (i + 1, cs.ext))
+        names.append("l%02d-n%s" % (i + 1, cs.ext))
+    filenames = []
+    for name in names:
+        filename = os.path.join(cs.dir, name)
+        if filename not in filenames and os.path.exists(filename):
+            filenames.append(filename)
+    return filenames
@@ -22,6 +22,8 @@
 # ---------------------------------------------------------------------------
 
 
+import bisect
+import functools
 import math
 import time
 import traceback
@@ -32,10 +34,11 @@ import attr
 from pysol_cards.cards import ms_rearrange
 from pysol_cards.random import random__int2str
 
-from pysollib.game.dump import pysolDumpGame
+from pysollib.game.dump import SAVE_FORMAT, pysolDumpGame
 from pysollib.gamedb import GI
+from pysollib.headless import HeadlessCard
 from pysollib.help import help_about
-from pysollib.hint import DefaultHint
+from pysollib.hint import DefaultHint, HintCache
 from pysollib.mfxutil import Image, ImageTk, USE_PIL
 from pysollib.mfxutil import Struct, SubclassResponsibility, destruct
 from pysollib.mfxutil import format_time, print_err
@@ -52,6 +55,7 @@ from pysollib.move import ASingleCardMove
 from pysollib.move import ASingleFlipMove
 from pysollib.move import ATurnStackMove
 from pysollib.move import AUpdateStackMove
+from pysollib.move import MoveHistory
 from pysollib.mygettext import _
 from pysollib.mygettext import ungettext
 from pysollib.pysolrandom import LCRandom31, PysolRandom, construct_random
@@ -65,7 +69,9 @@ from pysollib.pysoltk import bind, wm_map
 from pysollib.settings import DEBUG
 from pysollib.settings import PACKAGE, TITLE, TOOLKIT, TOP_SIZE
 from pysollib.settings import VERSION, VERSION_TUPLE
+from pysollib.snapshot import SnapshotStore, stack_snapshot_key
 from pysollib.struct_new import NewStruct
+from pysollib.ui.tktile.animation import Animation, CardsMotion
 
 import random2
 
@@ -74,6 +80,7 @@ from six import BytesIO
 from six.moves import range
 
 if TOOLKIT == 'tk':
+    from pysollib.ui.tktile.animation import AnimationScheduler
     from pysollib.ui.tktile.solverdialog import reset_solver_dialog
 else:
     from pysollib.pysoltk import reset_solver_dialog
@@ -310,6 +317,40 @@ class StackGroups(NewStruct):
         self.hp_stacks = tuple(self.hp_stacks)
 
 
+class StackIndex:
+    # the stacks sorted by x, for getClosestStack(); the search walks
+    # outwards from cx and stops when the x distance alone is too far
+    def __init__(self, stacks):
+        self.stacks = stacks
+        self.order = sorted(range(len(stacks)), key=lambda i: stacks[i].x)
+        self.xs = [stacks[i].x for i in self.order]
+
+    def closest(self, cx, cy, accept=None):
+        # the same stack as a linear search in stacks: the first of
+        # the closest; accept(stack, dist) can reject a stack
+        stacks, order, xs = self.stacks, self.order, self.xs
+        closest, cdist, ci = None, 999999999, len(stacks)
+        hi = bisect.bisect_left(xs, cx)
+        lo = hi - 1
+        while lo >= 0 or hi < len(xs):
+            if lo < 0 or (hi < len(xs) and xs[hi] - cx <= cx - xs[lo]):
+                j = hi
+                hi += 1
+            else:
+                j = lo
+                lo -= 1
+            dx = xs[j] - cx
+            if dx * dx > cdist:
+                break
+            i = order[j]
+            stack = stacks[i]
+            dist = dx * dx + (stack.y - cy)**2
+            if dist < cdist or (dist == cdist and i < ci):
+                if accept is None or accept(stack, dist):
+                    closest, cdist, ci = stack, dist, i
+        return closest
+
+
 @attr.s
 class StackRegions(NewStruct):
     # list of tuples(stacks, rect)
@@ -319,6 +360,14 @@ class StackRegions(NewStruct):
     data = attr.ib(factory=list)
     # init info (at the start)
     init_info = attr.ib(factory=list)
+    # StackIndex of the stacks of a region, by id(stacks)
+    indexes = attr.ib(factory=dict)
+
+    def getIndex(self, stacks):
+        index = self.indexes.get(id(stacks))
+        if index is None or index.stacks is not stacks:
+            index = self.indexes[id(stacks)] = StackIndex(stacks)
+        return index
 
     def calc_info(self, xf, yf, widthpad=0, heightpad=0):
         """docstring for calc_info"""
@@ -330,6 +379,8 @@ class StackRegions(NewStruct):
                        int(round((rect[3] + heightpad) * yf)))
             info.append((stacks, newrect))
         self.info = tuple(info)
+        # the stacks have moved
+        self.indexes = {}
 
     def optimize(self, remaining):
         """docstring for optimize"""
@@ -348,6 +399,7 @@ class StackRegions(NewStruct):
                     remaining.remove(stack)
         self.remaining = tuple(remaining)
         self.init_info = self.info
+        self.indexes = {}
 
 
 @attr.s
@@ -473,6 +525,7 @@ class GameWinAnimation(NewStruct):
     saved_images = attr.ib(factory=dict)          # saved resampled images
     canvas_images = attr.ib(factory=list)         # ids of canvas images
     frame_num = attr.ib(default=0)              # number of the current frame
+    start = attr.ib(default=0)                  # uclock() at the start
     width = attr.ib(default=0)
     height = attr.ib(default=0)
 
@@ -480,7 +533,7 @@ class GameWinAnimation(NewStruct):
 @attr.s
 class GameMoves(NewStruct):
     current = attr.ib(factory=list)
-    history = attr.ib(factory=list)
+    history = attr.ib(factory=MoveHistory)
     index = attr.ib(default=0)
     state = attr.ib(default=S_PLAY)
 
@@ -530,9 +583,13 @@ class Game(object):
     # the format for a saved game changed (see also canLoadGame())
     GAME_VERSION = 1
 
+    # size limit of the snapshot stores (see pysollib.snapshot)
+    MAX_SNAPSHOTS = 100000
+
     # only basic initialization here
     def __init__(self, gameinfo):
         self.preview = 0
+        self.headless = False
         self.random = None
         self.gameinfo = gameinfo
         self.id = gameinfo.id
@@ -547,8 +604,8 @@ class Game(object):
         self.stackmap = {}              # dict with (x,y) tuples as key
         self.allstacks = []
         self.sn_groups = []  # snapshot groups; list of list of similar stacks
-        self.snapshots = []
-        self.failed_snapshots = []
+        self.snapshots = SnapshotStore(maxlen=self.MAX_SNAPSHOTS)
+        self.failed_snapshots = SnapshotStore(maxlen=self.MAX_SNAPSHOTS)
         self.stackdesc_list = []
         self.demo_logo = None
         self.pause_logo = None
@@ -558,6 +615,7 @@ class Game(object):
         self.init_size = (0, 0)
         self.center_offset = (0, 0)
         self.event_handled = False      # if click event handled by Stack (???)
+        self.animations = None          # AnimationScheduler
         self.reset()
 
     # main constructor
@@ -565,6 +623,8 @@ class Game(object):
         # print 'Game.create'
         old_busy = self.busy
         self.__createCommon(app)
+        if TOOLKIT == 'tk':
+            self.animations = AnimationScheduler(self.canvas)
         self.setCursor(cursor=CURSOR_WATCH)
         # print 'gameid:', self.id
         self.top.wm_title(TITLE + " - " + self.getTitleName())
@@ -750,6 +810,33 @@ class Game(object):
         self.canvas.setInitialSize(self.width, self.height)
         self.busy = old_busy
 
+    # create the game model only: no bindings, no images and no card
+    # items (see pysollib.headless). A headless game behaves like a
+    # preview, so it never shows dialogs or updates the statistics.
+    def createHeadless(self, app):
+        old_busy = self.busy
+        self.__createCommon(app)
+        self.preview = 1
+        self.headless = True
+        # create game
+        self.createGame()
+        # set some defaults
+        self.createSnGroups()
+        self.allstacks = tuple(self.allstacks)
+        self.sg.to_tuples()
+        self.s.to_tuples()
+        for stack in self.allstacks:
+            stack.headless = True
+            stack.prepareStack()
+            stack.assertStack()
+        self.optimizeRegions()
+        # create cards
+        self.cards = self.createCards()
+        hint_class = self.getHintClass()
+        if hint_class is not None:
+            self.Stuck_Class = hint_class(self, 0)
+        self.busy = old_busy
+
     def destruct(self):
         # help breaking circular references
         for obj in self.cards:
@@ -764,10 +851,11 @@ class Game(object):
         self.demo = None
         self.solver = None
         self.hints = GameHints()
+        self.hint_cache = HintCache()
         self.saveinfo = GameSaveInfo()
         self.loadinfo = GameLoadInfo()
-        self.snapshots = []
-        self.failed_snapshots = []
+        self.snapshots = SnapshotStore(maxlen=self.MAX_SNAPSHOTS)
+        self.failed_snapshots = SnapshotStore(maxlen=self.MAX_SNAPSHOTS)
         # local statistics are reset on each game restart
         self.stats = GameStatsStruct()
         self.startMoves()
@@ -938,6 +1026,7 @@ class Game(object):
 
     def resetGame(self):
         self.hints.list = None
+        self.hint_cache.clear()
         self.s.talon.removeAllCards()
         for stack in self.allstacks:
             stack.resetGame()
@@ -1147,8 +1236,14 @@ class Game(object):
         return sn
 
     def getSnapshot(self):
-        # optimisation
-        sn = hash(self.getSnapshotHash())
+        # Zobrist hash of the current position; only the stacks that
+        # changed since the last snapshot are rehashed (see pysollib.snapshot)
+        sn = 0
+        for stack in self.allstacks:
+            key = stack.snapshot_key
+            if key is None:
+                key = stack.snapshot_key = stack_snapshot_key(stack)
+            sn ^= key
         return sn
 
     def createSnGroups(self):
@@ -1168,13 +1263,7 @@ class Game(object):
         self.sn_groups = sg
 
     def updateSnapshots(self):
-        sn = self.getSnapshot()
-        if sn in self.snapshots:
-            # self.updateStatus(snapshot=True)
-            pass
-        else:
-            self.snapshots.append(sn)
-            # self.updateStatus(snapshot=False)
+        self.snapshots.add(self.getSnapshot())
 
     # Create all cards for the game.
     def createCards(self, progress=None):
@@ -1204,6 +1293,8 @@ class Game(object):
         return cards
 
     def _createCard(self, id, deck, suit, rank, x, y):
+        if self.headless:
+            return HeadlessCard(id, deck, suit, rank, game=self, x=x, y=y)
         return Card(id, deck, suit, rank, game=self, x=x, y=y)
 
     # shuffle cards
@@ -1354,6 +1445,11 @@ class Game(object):
 
     def _resizeHandler(self):
         self._resizeHandlerID = None
+        if self.animations and self.animations.animations:
+            # the cards are moving, try again later
+            self._resizeHandlerID = self.canvas.after(
+                250, self._resizeHandler)
+            return
         self.resizeGame()
 
     def _configureHandler(self, event=None):
@@ -1439,7 +1535,7 @@ class Game(object):
 
     # main animation method
     def animatedMoveTo(self, from_stack, to_stack, cards, x, y,
-                       tkraise=1, frames=-1, shadow=-1):
+                       tkraise=1, frames=-1, shadow=-1, wait=True):
         # available values of app.opt.animations:
         # 0 - without animations
         # 1 - very fast (without timer)
@@ -1448,17 +1544,16 @@ class Game(object):
         # 4 - slow (1/4 of fast speed)
         # 5 - very slow (1/8 of fast speed)
         # 10 - used internally in game preview
+        # returns the animation if wait is false (see waitAnimations)
         if self.app.opt.animations == 0 or frames == 0:
-            return
-        # init timer - need a high resolution for this to work
-        clock, delay, skip = None, 1, 1
-        if self.app.opt.animations >= 2:
-            clock = uclock
+            return None
         SPF = 0.15 / 8          # animation speed - seconds per frame
         if frames < 0:
             frames = 8
         assert frames >= 2
-        if self.app.opt.animations == 3:        # medium
+        if self.app.opt.animations == 1:        # very fast
+            SPF /= 4
+        elif self.app.opt.animations == 3:      # medium
             frames *= 3
             SPF /= 2
         elif self.app.opt.animations == 4:      # slow
@@ -1472,10 +1567,9 @@ class Game(object):
             # the initial dealing
             # if self.moves.state == self.S_INIT and frames > 4:
             #     frames //= 2
-            return
+            return None
         if shadow < 0:
             shadow = self.app.opt.shadow
-        shadows = ()
         # start animation
         if TOOLKIT == 'kivy':
             c0 = cards[0]
@@ -1484,53 +1578,68 @@ class Game(object):
                 base = float(self.app.opt.animations)
                 duration = base*0.1
                 card.animatedMove(dx, dy, duration)
-            return
+            return None
 
         if tkraise:
             for card in cards:
                 card.tkraise()
-        c0 = cards[0]
-        dx, dy = (x - c0.x) / float(frames), (y - c0.y) / float(frames)
-        tx, ty = 0, 0
-        i = 1
+        shadows = None
+        if shadow and from_stack:
+            # the shadows are created in the first frame
+            sx, sy = self.app.images.SHADOW_XOFFSET, \
+                self.app.images.SHADOW_YOFFSET
+            shadows = functools.partial(from_stack.createShadows,
+                                        cards, sx, sy)
+        animation = CardsMotion(cards, x, y, frames * SPF, shadows)
+        if not self.animations:
+            self._playAnimation(animation, frames, first=1)
+            return None
+        self.animations.start(animation)
+        if not wait:
+            return animation
+        self.waitAnimations(animation)
+        return None
+
+    def _playAnimation(self, animation, frames, first=0):
+        # without an AnimationScheduler (gtk, kivy) the animation is
+        # played in a loop here, stepped frames times over its duration;
+        # slow frames are skipped
+        SPF = animation.duration / frames
+        clock = uclock if self.app.opt.animations >= 2 else None
         if clock:
             starttime = clock()
+        i = first
         while i < frames:
-            mx, my = int(round(dx * i)) - tx, int(round(dy * i)) - ty
-            tx, ty = tx + mx, ty + my
-            if i == 1 and shadow and from_stack:
-                # create shadows in the first frame
-                sx, sy = self.app.images.SHADOW_XOFFSET, \
-                    self.app.images.SHADOW_YOFFSET
-                shadows = from_stack.createShadows(cards, sx, sy)
-            for s in shadows:
-                s.move(mx, my)
-            for card in cards:
-                card.moveBy(mx, my)
+            animation.step(float(i) / frames)
             self.canvas.update_idletasks()
             step = 1
             if clock:
-                endtime = starttime + i*SPF
-                sleep = endtime - clock()
-                if delay and sleep >= 0.005:
+                sleep = starttime + (i + 1 - first) * SPF - clock()
+                if sleep >= 0.005:
                     # we're fast - delay
-                    # print "Delay frame", i, sleep
                     usleep(sleep)
-                elif skip and sleep <= -0.75*SPF:
+                elif sleep <= -0.75*SPF:
                     # we're slow - skip 1 or 2 frames
-                    # print "Skip frame", i, sleep
                     step += 1
                     if frames > 4 and sleep < -1.5*SPF:
                         step += 1
-                # print i, step, mx, my; time.sleep(0.5)
             i += step
-        # last frame: delete shadows, move card to final position
-        for s in shadows:
-            s.delete()
-        dx, dy = x - c0.x, y - c0.y
-        for card in cards:
-            card.moveBy(dx, dy)
+        animation.step(1.0)
         self.canvas.update_idletasks()
+        animation.finished = True
+
+    def waitAnimations(self, *animations):
+        # the moves of the game wait for their animations; the events are
+        # handled meanwhile, but the game is busy (an event fast-forwards
+        # the animations, see interruptSleep)
+        animations = [a for a in animations if a is not None]
+        if not animations:
+            return
+        old_busy, self.busy = self.busy, 1
+        try:
+            self.animations.wait(*animations)
+        finally:
+            self.busy = old_busy
 
     def doAnimatedFlipAndMove(self, from_stack, to_stack=None, frames=-1):
         if self.app.opt.animations == 0 or frames == 0:
@@ -1553,16 +1662,13 @@ class Game(object):
         id = card.item.id
 
         SPF = 0.1/8                     # animation speed - seconds per frame
-        frames = 4.0                    # num frames for each step
+        frames = 4                      # num frames for each step
         if self.app.opt.animations == 3:  # medium
-            SPF = 0.1/8
-            frames = 7.0
+            frames = 7
         elif self.app.opt.animations == 4:  # slow
-            SPF = 0.1/8
-            frames = 12.0
+            frames = 12
         elif self.app.opt.animations == 5:  # very slow
-            SPF = 0.1/8
-            frames = 24.0
+            frames = 24
 
         if to_stack is None:
             x0, y0 = from_stack.getPositionFor(card)
@@ -1605,68 +1711,44 @@ class Game(object):
             # dest_x != 0 and dest_y != 0
             return False
 
-        move_dx = dest_x / frames / 2
-        move_dy = dest_y / frames / 2
-        xpos, ypos = float(x0), float(y0)
+        move_dx = dest_x / float(frames) / 2
+        move_dy = dest_y / float(frames) / 2
+        # step 1 shrinks im1, step 2 grows im2
+        d_x1 = shrink_dx/2+move_dx-ascent_dx
+        d_y1 = shrink_dy/2+move_dy-ascent_dy
+        d_x2 = -shrink_dx/2+move_dx+ascent_dx
+        d_y2 = -shrink_dy/2+move_dy+ascent_dy
+        state = Struct(nframe=-1, tk_image=None)
+
+        def step(p):
+            if p >= 1.0:
+                card.moveTo(x1, y1)
+                return
+            nframe = int(p * 2 * frames)
+            if nframe == state.nframe:
+                return
+            state.nframe = nframe
+            if nframe < frames:
+                im = im1.resize((int(w - nframe*shrink_dx),
+                                 int(h - nframe*shrink_dy)))
+                xpos = x0 + (nframe+1)*d_x1
+                ypos = y0 + (nframe+1)*d_y1
+            else:
+                n = nframe - frames
+                im = im2.resize((int(w - (frames-n-1)*shrink_dx),
+                                 int(h - (frames-n-1)*shrink_dy)))
+                xpos = x0 + frames*d_x1 + (n+1)*d_x2
+                ypos = y0 + frames*d_y1 + (n+1)*d_y2
+            state.tk_image = ImageTk.PhotoImage(image=im)
+            canvas.itemconfig(id, image=state.tk_image)
+            card.moveTo(int(round(xpos)), int(round(ypos)))
 
         card.tkraise()
-
-        # step 1
-        d_x = shrink_dx/2+move_dx-ascent_dx
-        d_y = shrink_dy/2+move_dy-ascent_dy
-        nframe = 0
-        while nframe < frames:
-            starttime = uclock()
-            # resize img
-            ww = w - nframe*shrink_dx
-            hh = h - nframe*shrink_dy
-            tmp = im1.resize((int(ww), int(hh)))
-            tk_tmp = ImageTk.PhotoImage(image=tmp)
-            canvas.itemconfig(id, image=tk_tmp)
-            # move img
-            xpos += d_x
-            ypos += d_y
-            card.moveTo(int(round(xpos)), int(round(ypos)))
-            canvas.update_idletasks()
-
-            nframe += 1
-            t = (SPF-(uclock()-starttime))*1000   # milliseconds
-            if t > 0:
-                usleep(t/1000)
-                # else:
-                # nframe += 1
-                # xpos += d_x
-                # ypos += d_y
-
-        # step 2
-        d_x = -shrink_dx/2+move_dx+ascent_dx
-        d_y = -shrink_dy/2+move_dy+ascent_dy
-        nframe = 0
-        while nframe < frames:
-            starttime = uclock()
-            # resize img
-            ww = w - (frames-nframe-1)*shrink_dx
-            hh = h - (frames-nframe-1)*shrink_dy
-            tmp = im2.resize((int(ww), int(hh)))
-            tk_tmp = ImageTk.PhotoImage(image=tmp)
-            canvas.itemconfig(id, image=tk_tmp)
-            # move img
-            xpos += d_x
-            ypos += d_y
-            card.moveTo(int(round(xpos)), int(round(ypos)))
-            canvas.update_idletasks()
-
-            nframe += 1
-            t = (SPF-(uclock()-starttime))*1000  # milliseconds
-            if t > 0:
-                usleep(t/1000)
-                # else:
-                # nframe += 1
-                # xpos += d_x
-                # ypos += d_y
-
-        card.moveTo(x1, y1)
-        # canvas.update_idletasks()
+        animation = Animation(step, 2 * frames * SPF)
+        if not self.animations:
+            self._playAnimation(animation, 2 * frames)
+            return True
+        self.waitAnimations(self.animations.start(animation))
         return True
 
     def animatedFlip(self, stack):
@@ -1679,11 +1761,15 @@ class Game(object):
             return False
         return self.doAnimatedFlipAndMove(from_stack, to_stack, frames)
 
-    def winAnimationEvent(self):
+    def winAnimationEvent(self, seconds):
         # based on code from pygtk-demo
         FRAME_DELAY = 80
         CYCLE_LEN = 60
-        starttime = uclock()
+        START_DELAY = 200
+        frame_num = int((seconds*1000-START_DELAY) // FRAME_DELAY)
+        if frame_num < 0 or frame_num == self.win_animation.frame_num:
+            return
+        self.win_animation.frame_num = frame_num
         images = self.win_animation.images
         saved_images = self.win_animation.saved_images  # cached images
         canvas = self.canvas
@@ -1705,7 +1791,7 @@ class Game(object):
         ymid = height / 2.0
         radius = min(xmid, ymid) / 2.0
 
-        f = float(self.win_animation.frame_num % CYCLE_LEN) / float(CYCLE_LEN)
+        f = float(frame_num % CYCLE_LEN) / float(CYCLE_LEN)
         r = radius + (radius / 3.0) * math.sin(f * 2.0 * math.pi)
         img_index = 0
 
@@ -1743,22 +1829,22 @@ class Game(object):
 
         for id in raised_images:
             canvas.tag_raise(id)
-        self.win_animation.frame_num = \
-            (self.win_animation.frame_num+1) % CYCLE_LEN
         self.win_animation.tk_images = tmp_tk_images
-        canvas.update_idletasks()
-        # loop
-        t = FRAME_DELAY-int((uclock()-starttime)*1000)
-        if t > 0:
-            self.win_animation.timer = after(canvas, t, self.winAnimationEvent)
-        else:
-            self.win_animation.timer = after_idle(
-                canvas,
-                self.winAnimationEvent)
+
+    def _winAnimationTimer(self):
+        # without an AnimationScheduler the win animation is a chain of
+        # timers
+        self.winAnimationEvent(uclock() - self.win_animation.start)
+        self.canvas.update_idletasks()
+        self.win_animation.timer = after(
+            self.canvas, 40, self._winAnimationTimer)
 
     def stopWinAnimation(self):
         if self.win_animation.timer:
-            after_cancel(self.win_animation.timer)  # stop loop
+            if self.animations:
+                self.animations.cancel(self.win_animation.timer)
+            else:
+                after_cancel(self.win_animation.timer)  # stop loop
             self.win_animation.timer = None
             self.canvas.delete(*self.win_animation.canvas_images)
             self.win_animation.canvas_images = []
@@ -1792,8 +1878,14 @@ class Game(object):
         self.win_animation.width = self.canvas.winfo_width()
         self.win_animation.height = self.canvas.winfo_height()
         # run win animation in background
-        # after_idle(self.canvas, self.winAnimationEvent)
-        after(self.canvas, 200, self.winAnimationEvent)
+        self.win_animation.frame_num = -1
+        if not self.animations:
+            self.win_animation.start = uclock()
+            self.win_animation.timer = after(
+                self.canvas, 200, self._winAnimationTimer)
+            return
+        self.win_animation.timer = self.animations.start(
+            Animation(self.winAnimationEvent))
         return
 
     def redealAnimation(self):
@@ -1828,22 +1920,26 @@ class Game(object):
                 scards.remove((c, s))
                 if not scards:
                     break
-        # animate
+        # animate: the selected cards fly together to the middle and
+        # then to the talon
         sx, sy = self.s.talon.x, self.s.talon.y
         w, h = self.width, self.height
+        moved = []
         while cards:
             # get and un-tuple a random card
             t = self.app.miscrandom.choice(cards)
             c, s = t
             s.removeCard(c, update=0)
-            # animation
             if c in acards or len(cards) <= 2:
-                self.animatedMoveTo(
-                    s, None, [c], w//2, h//2, tkraise=0, shadow=0)
-                self.animatedMoveTo(s, None, [c], sx, sy, tkraise=0, shadow=0)
+                moved.append((c, s))
             else:
                 c.moveTo(sx, sy)
             cards.remove(t)
+        for x, y in ((w//2, h//2), (sx, sy)):
+            self.waitAnimations(*[
+                self.animatedMoveTo(s, None, [c], x, y,
+                                    tkraise=0, shadow=0, wait=False)
+                for c, s in moved])
         self.app.opt.animations = old_a
 
     def sleep(self, seconds):
@@ -1857,6 +1953,8 @@ class Game(object):
                 time.sleep(seconds)
 
     def interruptSleep(self):
+        if self.animations:
+            self.animations.finish()
         if self.top:
             self.top.interruptSleep()
 
@@ -1870,14 +1968,9 @@ class Game(object):
         return self.app.images.getShade()
 
     def _getClosestStack(self, cx, cy, stacks, dragstack):
-        closest, cdist = None, 999999999
         # Since we only compare distances,
         # we don't bother to take the square root.
-        for stack in stacks:
-            dist = (stack.x - cx)**2 + (stack.y - cy)**2
-            if dist < cdist:
-                closest, cdist = stack, dist
-        return closest
+        return self.regions.getIndex(stacks).closest(cx, cy)
 
     def getClosestStack(self, card, dragstack):
         cx, cy = card.x, card.y
@@ -2484,7 +2577,24 @@ class Game(object):
         if hint_class is None:
             return None
         hint = hint_class(self, level)      # call constructor
-        return hint.getHints(taken_hint)    # and return all hints
+        return self._getCachedHints(hint, level, taken_hint)
+
+    # the hints of a position only depend on the cards, the talon round
+    # and the game state (see getState)
+    def _getHintCacheKey(self, hint, level):
+        return (hint.__class__, level, self.getSnapshot(),
+                self.s.talon and self.s.talon.round, repr(self.getState()))
+
+    def _getCachedHints(self, hint, level, taken_hint=None):
+        if taken_hint and taken_hint[6]:
+            # forced move
+            return hint.getHints(taken_hint)
+        key = self._getHintCacheKey(hint, level)
+        hints = self.hint_cache.get(key)
+        if hints is None:
+            hints = hint.getHints(taken_hint)
+            self.hint_cache.put(key, hints)
+        return hints
 
     # give a hint
     def showHint(self, level=0, sleep=1.5, taken_hint=None):
@@ -2597,7 +2707,7 @@ class Game(object):
             mixed=mixed,
             sleep=self.app.opt.timeouts['demo'],
             last_deal=[],
-            snapshots=[],
+            snapshots=SnapshotStore(maxlen=self.MAX_SNAPSHOTS),
             hint=None,
             keypress=None,
             start_demo_moves=self.stats.demo_moves,
@@ -2772,7 +2882,7 @@ class Game(object):
                 if sn in demo.snapshots:
                     # not unique
                     return 1
-                demo.snapshots.append(sn)
+                demo.snapshots.add(sn)
         elif from_stack == to_stack:
             # a flip-move
             from_stack.flipMove(animation=True)
@@ -2862,9 +2972,9 @@ class Game(object):
         self.canvas.setTopImage(self.demo_logo)
 
     def getStuck(self):
-        h = self.Stuck_Class.getHints(None)
+        h = self._getCachedHints(self.Stuck_Class, 0)
         if h:
-            self.failed_snapshots = []
+            self.failed_snapshots.clear()
             return True
         if not self.canDealCards():
             return False
@@ -2872,7 +2982,7 @@ class Game(object):
         sn = self.getSnapshot()
         if sn in self.failed_snapshots:
             return False
-        self.failed_snapshots.append(sn)
+        self.failed_snapshots.add(sn)
         return True
 
     def updateStuck(self):
@@ -3113,7 +3223,7 @@ class Game(object):
         self.updateStatus(moves=(self.moves.index, self.stats.total_moves))
         self.updateMenus()
         self.updateStatus(stuck='')
-        self.failed_snapshots = []
+        self.failed_snapshots.clear()
         reset_solver_dialog()
 
     def redo(self):
@@ -3318,8 +3428,19 @@ class Game(object):
                 'ver': version})
         p.set_version(version_tuple)
         game_version = 1
-        bookmark = pload(int)
-        validate(0 <= bookmark <= 2, err_txt)
+        bookmark = pload()
+        save_format = 1
+        if isinstance(bookmark, tuple):
+            validate(len(bookmark) == 2 and bookmark[0] == 'save_format',
+                     err_txt)
+            save_format = bookmark[1]
+            validate(
+                save_format <= SAVE_FORMAT,
+                _('Cannot load games saved with\n%(app)s version %(ver)s') % {
+                    'app': PACKAGE,
+                    'ver': version})
+            bookmark = pload()
+        validate(isinstance(bookmark, int) and 0 <= bookmark <= 2, err_txt)
         game_version = pload(int)
         validate(game_version > 0, err_txt)
         #
@@ -3372,8 +3493,18 @@ class Game(object):
             game.gsaveinfo.__dict__.update(gsaveinfo.__dict__)
         moves = pload(GameMoves)
         game.moves.__dict__.update(moves.__dict__)
-        snapshots = pload(list)
-        game.snapshots = snapshots
+        snapshots = pload()
+        if save_format == 1:
+            validate(isinstance(game.moves.history, list) and
+                     isinstance(snapshots, list), err_txt)
+            game.moves.history = MoveHistory(game.moves.history)
+            game.snapshots = SnapshotStore(
+                snapshots, maxlen=game.MAX_SNAPSHOTS)
+        else:
+            validate(isinstance(game.moves.history, MoveHistory) and
+                     isinstance(snapshots, bytes), err_txt)
+            game.snapshots = SnapshotStore.frombytes(
+                snapshots, maxlen=game.MAX_SNAPSHOTS)
         if 0 <= bookmark <= 1:
             gstats = pload(GameGlobalStatsStruct)
             game.gstats.__dict__.update(gstats.__dict__)
@@ -20,6 +20,13 @@ from pysol_cards.random import random__str2int
 from pysollib.settings import PACKAGE
 from pysollib.settings import VERSION, VERSION_TUPLE
 
+# the format of the saved games, see Game._undumpGame:
+#   1 - the moves are a list, the snapshots a list of ints
+#   2 - the moves are a MoveHistory, the snapshots SnapshotStore bytes;
+#       the number is saved as ('save_format', 2) before the bookmark, so
+#       that older versions reject the file
+SAVE_FORMAT = 2
+
 
 def pysolDumpGame(game_, p, bookmark=0):
     game_.updateTime()
@@ -27,6 +34,7 @@ def pysolDumpGame(game_, p, bookmark=0):
     p.dump(PACKAGE)
     p.dump(VERSION)
     p.dump(VERSION_TUPLE)
+    p.dump(('save_format', SAVE_FORMAT))
     p.dump(bookmark)
     p.dump(game_.GAME_VERSION)
     p.dump(game_.id)
@@ -46,7 +54,7 @@ def pysolDumpGame(game_, p, bookmark=0):
         p.dump(game_.saveinfo)
         p.dump(game_.gsaveinfo)
     p.dump(game_.moves)
-    p.dump(game_.snapshots)
+    p.dump(game_.snapshots.tobytes())
     if 0 <= bookmark <= 1:
         if bookmark == 0:
             game_.gstats.saved += 1
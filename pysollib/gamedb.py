@@ -21,8 +21,13 @@
 #
 # ---------------------------------------------------------------------------##
 
+import hashlib
+import importlib
+import json
+import os
+
 import pysollib.settings
-from pysollib.mfxutil import Struct, print_err
+from pysollib.mfxutil import Struct, print_err, uclock
 from pysollib.mygettext import _, n_
 from pysollib.resource import CSI
 
@@ -713,7 +718,19 @@ class GameInfo(Struct):
                         skill_level=skill_level,
                         suits=tuple(suits), ranks=tuple(ranks),
                         trumps=tuple(trumps),
-                        si=gi_si, rules_filename=rules_filename)
+                        si=gi_si, rules_filename=rules_filename,
+                        module=None)
+
+    # the class of a game registered from the manifest is None until
+    # its module is imported, which registers the game again
+    @property
+    def gameclass(self):
+        if self.__dict__['gameclass'] is None and self.module is not None:
+            importlib.import_module(self.module)
+            if self.__dict__['gameclass'] is None:
+                raise GameInfoException(
+                    "game %d not found in %s" % (self.id, self.module))
+        return self.__dict__['gameclass']
 
 
 class GameManager:
@@ -727,12 +744,16 @@ class GameManager:
         self.__games_by_altname = None
         self.__all_games = {}           # includes hidden games
         self.__all_gamenames = {}       # includes hidden games
+        self.__all_gameclasses = {}     # includes hidden games
         self.__games_for_solver = []
+        self.__search_index = None
         self.check_game = True
         self.current_filename = None
         self.registered_game_types = {}
         self.callback = None            # update progress-bar (see main.py)
         self._num_games = 0             # for callback only
+        self.register_time = 0.0        # seconds spent in register()
+        self.manifest_loaded = False
 
     def setCallback(self, func):
         self.callback = func
@@ -758,12 +779,11 @@ class GameManager:
             raise GameInfoException("duplicate game name %s: %s and %s" %
                                     (gi.name, str(gi.gameclass),
                                      str(gameclass)))
-        if 1:
-            for id, game in self.__all_games.items():
-                if gi.gameclass is game.gameclass:
-                    raise GameInfoException(
-                        "duplicate game class %s: %s and %s" %
-                        (gi.id, str(gi.gameclass), str(game.gameclass)))
+        if gi.module is None and gi.gameclass in self.__all_gameclasses:
+            game = self.__all_gameclasses[gi.gameclass]
+            raise GameInfoException(
+                "duplicate game class %s: %s and %s" %
+                (gi.id, str(gi.gameclass), str(game.gameclass)))
         for n in gi.altnames:
             if n in self.__all_gamenames:
                 raise GameInfoException("duplicate game altname %s: %s" %
@@ -773,6 +793,18 @@ class GameManager:
         # print gi.id, gi.short_name.encode('utf-8')
         if not isinstance(gi, GameInfo):
             raise GameInfoException("wrong GameInfo class")
+        old = self.__all_games.get(gi.id)
+        if old is not None and old.module is not None:
+            if gi.gameclass.__module__ != old.module:
+                # not the game from the manifest (a plugin with the id
+                # of a game that is not imported yet)
+                self._check_game(gi)
+            # the module of a game from the manifest has been imported
+            if old.__dict__['gameclass'] is None:
+                old.gameclass = gi.gameclass
+                self.__all_gameclasses[gi.gameclass] = old
+            return
+        t = uclock()
         if self.check_game and pysollib.settings.CHECK_GAMES:
             self._check_game(gi)
         # if 0 and gi.si.game_flags & GI.GT_XORIGINAL:
@@ -783,6 +815,8 @@ class GameManager:
         self.__all_gamenames[gi.name] = gi
         for n in gi.altnames:
             self.__all_gamenames[n] = gi
+        if gi.module is None:
+            self.__all_gameclasses[gi.gameclass] = gi
         if not (gi.si.game_flags & GI.GT_HIDDEN):
             self.__games[gi.id] = gi
             self.__gamenames[gi.name] = gi
@@ -791,6 +825,7 @@ class GameManager:
             # invalidate sorted lists
             self.__games_by_id = None
             self.__games_by_name = None
+            self.__search_index = None
             # update registry
             k = gi.si.game_type
             self.registered_game_types[k] = \
@@ -800,11 +835,13 @@ class GameManager:
 #                      if gi.id in k: break
 #                  else:
 #                      print gi.id
-            if hasattr(gi.gameclass, 'Solver_Class') and \
-               gi.gameclass.Solver_Class is not None:
+            # the games from the manifest are added by loadManifest
+            if gi.module is None and \
+               getattr(gi.gameclass, 'Solver_Class', None) is not None:
                 self.__games_for_solver.append(gi.id)
         if self.current_filename is not None:
             gi.gameclass.MODULE_FILENAME = self.current_filename
+        self.register_time += uclock() - t
 
         if self.callback and self._num_games % 10 == 0:
             self.callback()
@@ -866,6 +903,194 @@ class GameManager:
     def getGamesForSolver(self):
         return self.__games_for_solver
 
+    def getSearchIndex(self):
+        if self.__search_index is None:
+            self.__search_index = GameSearchIndex(self.__games.values())
+        return self.__search_index
+
+    #
+    # the manifest of the games in pysollib.games
+    #
+
+    def getManifest(self):
+        # the game names must not be translated, see
+        # scripts/gen_games_manifest.py
+        games = []
+        for gi in self.__all_games.values():
+            module = gi.gameclass.__module__
+            if not module.startswith('pysollib.games.'):
+                continue                # a plugin
+            games.append(dict(
+                id=gi.id, module=module, name=gi.en_name,
+                short_name=gi.short_name, altnames=list(gi.altnames),
+                decks=gi.decks, redeals=gi.redeals, ncards=gi.ncards,
+                skill_level=gi.skill_level, category=gi.category,
+                subcategory=gi.subcategory, suits=list(gi.suits),
+                ranks=list(gi.ranks), trumps=list(gi.trumps),
+                rules_filename=gi.rules_filename, si=dict(gi.si.__dict__),
+                solver=getattr(gi.gameclass, 'Solver_Class', None)
+                is not None))
+        return dict(version=pysollib.settings.VERSION,
+                    digest=getGameModulesDigest(), games=games)
+
+    def loadManifest(self, filename, subpackages=True):
+        # register the games of a manifest without importing their
+        # modules; returns False when the manifest is missing or does
+        # not match the sources of the game modules
+        try:
+            with open(filename) as f:
+                manifest = json.load(f)
+        except (IOError, OSError, ValueError):
+            return False
+        if manifest.get('version') != pysollib.settings.VERSION:
+            return False
+        digest = getGameModulesDigest()
+        if digest is not None and manifest.get('digest') != digest:
+            return False
+        for entry in manifest['games']:
+            if not subpackages and entry['module'].count('.') > 2:
+                continue                # e.g. pysollib.games.ultra.tarock
+            si = entry['si']
+            gi = GameInfo(entry['id'], None, entry['name'],
+                          si['game_type'] | si['game_flags'],
+                          entry['decks'], entry['redeals'],
+                          entry['skill_level'], si=si,
+                          category=entry['category'],
+                          subcategory=entry['subcategory'],
+                          short_name=entry['short_name'],
+                          altnames=entry['altnames'], suits=entry['suits'],
+                          ranks=entry['ranks'], trumps=entry['trumps'],
+                          rules_filename=entry['rules_filename'])
+            gi.ncards = entry['ncards']
+            gi.module = entry['module']
+            self.register(gi)
+            if entry['solver'] and not (si['game_flags'] & GI.GT_HIDDEN):
+                self.__games_for_solver.append(gi.id)
+        self.manifest_loaded = True
+        return True
+
+    def writeManifest(self, filename):
+        with open(filename, 'w') as f:
+            json.dump(self.getManifest(), f, indent=0, sort_keys=True)
+
+
+# ************************************************************************
+# * The game search of the select game dialogs. The criteria become
+# * set intersections: the names are indexed by their substrings of up
+# * to NGRAM characters (a search term matches anywhere in a name, see
+# * Application.checkSearchString), everything else by value.
+# ************************************************************************
+
+class GameSearchIndex:
+    NGRAM = 3
+    ATTRIBUTES = ('category', 'game_type', 'skill_level', 'decks', 'redeals')
+
+    def __init__(self, games):
+        games = list(games)
+        self.ids = frozenset(gi.id for gi in games)
+        # (name, gameid, is_altname) and the upper case names
+        self.names = []
+        self._upper_names = []
+        self._grams = {}
+        # attribute: value: ids
+        self.attributes = dict((attr, {}) for attr in self.ATTRIBUTES)
+        self.flags = {}                 # game flag: ids
+        for gi in games:
+            self._addName(gi.name, gi.id, False)
+            for n in gi.altnames:
+                self._addName(n, gi.id, True)
+            values = (gi.category, gi.si.game_type, gi.skill_level,
+                      gi.decks, gi.redeals)
+            for attr, value in zip(self.ATTRIBUTES, values):
+                self.attributes[attr].setdefault(value, set()).add(gi.id)
+            flags = gi.si.game_flags
+            while flags:
+                flag = flags & -flags
+                self.flags.setdefault(flag, set()).add(gi.id)
+                flags ^= flag
+        # name: ids
+        self.compatibility = self._groups(GI.GAMES_BY_COMPATIBILITY)
+        self.inventors = self._groups(GI.GAMES_BY_INVENTORS)
+        self.versions = self._groups(GI.GAMES_BY_PYSOL_VERSION)
+
+    def _addName(self, name, gameid, altname):
+        i = len(self.names)
+        self.names.append((name, gameid, altname))
+        upper = name.upper()
+        self._upper_names.append(upper)
+        for n in range(1, self.NGRAM + 1):
+            for j in range(len(upper) - n + 1):
+                self._grams.setdefault(upper[j:j+n], set()).add(i)
+
+    def _groups(self, groups):
+        return dict((name, self.ids.intersection(games))
+                    for name, games in groups if name is not None)
+
+    def _findTerm(self, term):
+        # the names that contain term
+        n = min(len(term), self.NGRAM)
+        found = None
+        for j in range(len(term) - n + 1):
+            names = self._grams.get(term[j:j+n], ())
+            found = set(names) if found is None else found & names
+            if not found:
+                return set()
+        if len(term) > self.NGRAM:
+            found = set(i for i in found if term in self._upper_names[i])
+        return found
+
+    def searchNames(self, search_string, usealt=True):
+        # the (name, gameid, is_altname) tuples that contain all the
+        # words of search_string
+        found = None
+        for term in search_string.split():
+            names = self._findTerm(term.upper())
+            found = names if found is None else found & names
+        if found is None:
+            found = range(len(self.names))
+        return [self.names[i] for i in sorted(found)
+                if usealt or not self.names[i][2]]
+
+    def getVersionGames(self, version, compare='New in'):
+        # compare: 'New in', 'Present in' (this or an older version) or
+        # 'New since' (this or a newer version)
+        games, found = set(), False
+        for name, ids in GI.GAMES_BY_PYSOL_VERSION:
+            if name == version:
+                found = True
+                games |= self.versions[name]
+            elif ((not found and compare == 'Present in') or
+                  (found and compare == 'New since')):
+                games |= self.versions[name]
+        return games
+
+    def select(self, category=None, game_type=None, skill_level=None,
+               decks=None, redeals=None, min_redeals=None,
+               compatibility=None, inventor=None, version=None,
+               version_compare='New in', flags=0):
+        # the ids of the games matching all the given criteria; flags
+        # is a mask of GI.GT_* flags the games must all have
+        ids = set(self.ids)
+        values = (category, game_type, skill_level, decks, redeals)
+        for attr, value in zip(self.ATTRIBUTES, values):
+            if value is not None:
+                ids &= self.attributes[attr].get(value, set())
+        if min_redeals is not None:
+            ids &= set().union(*[
+                games for value, games in self.attributes['redeals'].items()
+                if value >= min_redeals])
+        if compatibility in self.compatibility:
+            ids &= self.compatibility[compatibility]
+        if inventor in self.inventors:
+            ids &= self.inventors[inventor]
+        if version is not None:
+            ids &= self.getVersionGames(version, version_compare)
+        while flags and ids:
+            flag = flags & -flags
+            ids &= self.flags.get(flag, set())
+            flags ^= flag
+        return ids
+
 
 # ************************************************************************
 # *
@@ -885,6 +1110,27 @@ def hideGame(game):
     registerGame(game.gameinfo)
 
 
+def getGameModulesDigest():
+    # the md5 digest of the sources of pysollib.games, or None when they
+    # are not available (e.g. in a frozen build)
+    top = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'games')
+    md5 = hashlib.md5()
+    found = False
+    for dirpath, dirnames, filenames in os.walk(top):
+        dirnames.sort()
+        for fn in sorted(filenames):
+            if fn.endswith('.py'):
+                filename = os.path.join(dirpath, fn)
+                name = os.path.relpath(filename, top).replace(os.sep, '/')
+                md5.update(name.encode('utf-8'))
+                with open(filename, 'rb') as f:
+                    md5.update(f.read())
+                found = True
+    if not found:
+        return None
+    return md5.hexdigest()
+
+
 def loadGame(modname, filename, check_game=False):
     # print "load game", modname, filename
     GAME_DB.check_game = check_game
@@ -100,6 +100,9 @@ class Calculation(Game):
         lines = help.split('\n')
         lines.sort(key=len)
         max_line = lines[-1]
+        if self.headless:
+            # there are no fonts without a toplevel window
+            return help, 0
         text_width = get_text_width(max_line,
                                     font=self.app.getFont("canvas_fixed"))
         return help, text_width
@@ -20,7 +20,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 # ---------------------------------------------------------------------------##
-from . import mahjongg1  # noqa: F401
-from . import mahjongg2  # noqa: F401
-from . import mahjongg3  # noqa: F401
-from . import shisensho  # noqa: F401
+from pysollib.gamedb import GAME_DB
+
+# with a manifest the modules are imported when their games are used,
+# see GameManager.loadManifest
+if not GAME_DB.manifest_loaded:
+    from . import mahjongg1  # noqa: F401
+    from . import mahjongg2  # noqa: F401
+    from . import mahjongg3  # noqa: F401
+    from . import shisensho  # noqa: F401
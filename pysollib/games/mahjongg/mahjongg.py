@@ -22,6 +22,7 @@
 # ---------------------------------------------------------------------------
 
 import re
+import sys
 import time
 
 from pysollib.game import Game
@@ -984,17 +985,11 @@ a solvable configuration.'''),
         return Game._createCard(self, id, deck, suit, rank, x, y)
 
     def _getClosestStack(self, cx, cy, stacks, dragstack):
-        closest, cdist = None, 999999999
-        # Since we only compare distances,
-        # we don't bother to take the square root.
-        for stack in stacks:
-            dist = (stack.x - cx)**2 + (stack.y - cy)**2
-            if dist < cdist:
-                # Mahjongg special: if the stack is very close, do
-                # not consider blocked stacks
-                if dist > self.check_dist or not stack.basicIsBlocked():
-                    closest, cdist = stack, dist
-        return closest
+        # Mahjongg special: if the stack is very close, do
+        # not consider blocked stacks
+        def accept(stack, dist):
+            return dist > self.check_dist or not stack.basicIsBlocked()
+        return self.regions.getIndex(stacks).closest(cx, cy, accept)
 
     #
     # Mahjongg extras
@@ -1041,8 +1036,11 @@ def r(id, short_name, name=None, ncards=144, layout=None):
     if not name:
         name = "Mahjongg " + short_name
     classname = re.sub('\\W', '', name)
-    # create class
-    gameclass = type(classname, (AbstractMahjonggGame,), {})
+    # create class in the module that registers the game (like
+    # collections.namedtuple), see GameManager.getManifest
+    module = sys._getframe(1).f_globals.get('__name__', __name__)
+    gameclass = type(classname, (AbstractMahjonggGame,),
+                     {'__module__': module})
     gameclass.L = layout
     gameclass.NCARDS = ncards
     decks, ranks, trumps = comp_cardset(ncards)
@@ -20,13 +20,18 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 # ---------------------------------------------------------------------------##
-from . import cribbage  # noqa: F401
-from . import hanoi  # noqa: F401
-from . import lightsout  # noqa: F401
-from . import memory  # noqa: F401
-from . import pegged  # noqa: F401
-from . import poker  # noqa: F401
-from . import tarock  # noqa: F401
+from pysollib.gamedb import GAME_DB
+
+# with a manifest the modules are imported when their games are used,
+# see GameManager.loadManifest
+if not GAME_DB.manifest_loaded:
+    from . import cribbage  # noqa: F401
+    from . import hanoi  # noqa: F401
+    from . import lightsout  # noqa: F401
+    from . import memory  # noqa: F401
+    from . import pegged  # noqa: F401
+    from . import poker  # noqa: F401
+    from . import tarock  # noqa: F401
 
 
 def no_use():
@@ -549,6 +549,9 @@ class Matrimony(Game):
         # in an identical snapshot.
         return Game.getSnapshotHash(self) + str(self.s.talon.round)
 
+    def getSnapshot(self):
+        return hash((Game.getSnapshot(self), self.s.talon.round))
+
 
 # ************************************************************************
 # * Picture Patience
@@ -20,12 +20,17 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 # ---------------------------------------------------------------------------##
-from . import dashavatara  # noqa: F401
-from . import hanafuda  # noqa: F401
-from . import hanafuda1  # noqa: F401
-from . import hexadeck  # noqa: F401
-from . import larasgame  # noqa: F401
-from . import matrix  # noqa: F401
-from . import mughal  # noqa: F401
-from . import tarock  # noqa: F401
-from . import tilepuzzle  # noqa: F401
+from pysollib.gamedb import GAME_DB
+
+# with a manifest the modules are imported when their games are used,
+# see GameManager.loadManifest
+if not GAME_DB.manifest_loaded:
+    from . import dashavatara  # noqa: F401
+    from . import hanafuda  # noqa: F401
+    from . import hanafuda1  # noqa: F401
+    from . import hexadeck  # noqa: F401
+    from . import larasgame  # noqa: F401
+    from . import matrix  # noqa: F401
+    from . import mughal  # noqa: F401
+    from . import tarock  # noqa: F401
+    from . import tilepuzzle  # noqa: F401
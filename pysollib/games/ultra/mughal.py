@@ -1023,8 +1023,7 @@ class Dikapala_Hint(AbstractHint):
                 if not pile or len(pile) != 1:
                     continue
                 if r in game.s.tableaux:
-                    rr = self.ClonedStack(r, stackcards=r.cards[:-1])
-                    if rr.acceptsCards(None, pile):
+                    if self.acceptsCardsWith(r, r.cards[:-1], None, pile):
                         # do not move a card that is already in correct place
                         continue
                     base_score = 80000 + (4 - r.cap.base_suit)
@@ -1045,8 +1044,7 @@ class Dikapala_Hint(AbstractHint):
                 pile = r.getPile()
                 if not pile or len(pile) != 1:
                     continue
-                rr = self.ClonedStack(r, stackcards=r.cards[:-1])
-                if rr.acceptsCards(None, pile):
+                if self.acceptsCardsWith(r, r.cards[:-1], None, pile):
                     # do not move a card that is already in correct place
                     continue
                 # find a stack that would accept this card
@@ -0,0 +1,462 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+# Copyright (C) 1998-2003 Markus Franz Xaver Johannes Oberhumer
+# Copyright (C) 2003 Mt. Hood Playing Card Co.
+# Copyright (C) 2005-2009 Skomoroh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+from pysollib.acard import AbstractCard
+from pysollib.app_statistics import Statistics
+from pysollib.gamedb import GAME_DB
+from pysollib.mfxutil import Struct
+from pysollib.options import Options
+from pysollib.pysolrandom import PysolRandom, construct_random
+from pysollib.snapshot import SnapshotStore
+
+# ************************************************************************
+# * Headless games
+# *
+# * A headless game has the full game model (stacks, cards, moves, hints)
+# * but no view at all: there is no toplevel window, the canvas only hands
+# * out item ids and the cards never touch it. This is used for batch
+# * simulations, benchmarks and solver surveys.
+# *
+# * Usage:
+# *   app = HeadlessApp()
+# *   game = app.constructGame(id)
+# *   app.newGame(game, seed)
+# *   game.s.rows[0].moveMove(1, game.s.foundations[0])
+# *   app.playDemo(game)
+# ************************************************************************
+
+
+class HeadlessItem:
+    # A canvas item that does nothing.
+
+    def __init__(self, canvas=None, *args, **kw):
+        self.canvas = canvas
+        self.init_coord = (0, 0)
+        self.text_format = None
+
+    def __setitem__(self, key, value):
+        pass
+
+    def __getitem__(self, key):
+        return None
+    cget = __getitem__
+
+    def addtag(self, tag, option='withtag'):
+        pass
+
+    def dtag(self, tag):
+        pass
+
+    def bind(self, sequence=None, command=None, add=None):
+        pass
+
+    def unbind(self, sequence, funcid=None):
+        pass
+
+    def config(self, cnf={}, **kw):
+        pass
+    configure = config
+
+    def coords(self, *args):
+        return [0, 0]
+
+    def delete(self):
+        pass
+
+    def move(self, dx, dy):
+        pass
+
+    def moveTo(self, x, y):
+        pass
+
+    def tkraise(self, abovethis=None):
+        pass
+
+    def lower(self, belowthis=None):
+        pass
+
+    def show(self):
+        pass
+
+    def hide(self):
+        pass
+
+
+_NULL_ITEM = HeadlessItem()
+
+
+class HeadlessCanvas:
+    # Stands in for MfxCanvas. Canvas items created on it (MfxCanvasText,
+    # MfxCanvasImage, MfxCanvasGroup, ...) get an id, and everything else
+    # is a no-op.
+
+    def __init__(self):
+        self.preview = 0
+        self.busy = False
+        self.items = {}
+        self.xmargin, self.ymargin = 0, 0
+        self._text_color = "#000000"
+        self._text_items = []
+        self._last_id = 0
+
+    # item handling
+
+    def _create(self, itemType, args, kw):
+        self._last_id += 1
+        return self._last_id
+    _x_create = _create
+
+    def _do(self, cmd, args=()):
+        return ''
+
+    def _getints(self, s):
+        return ()
+
+    def delete(self, *args):
+        pass
+
+    def move(self, *args):
+        pass
+
+    def coords(self, *args):
+        return [0, 0]
+
+    def itemconfig(self, *args, **kw):
+        pass
+    itemconfigure = itemconfig
+
+    def addtag(self, *args):
+        pass
+
+    def dtag(self, *args):
+        pass
+
+    def gettags(self, *args):
+        return ()
+
+    def tag_raise(self, *args):
+        pass
+
+    def tag_lower(self, *args):
+        pass
+
+    def tag_bind(self, *args, **kw):
+        pass
+
+    def tag_unbind(self, *args):
+        pass
+
+    def bbox(self, *args):
+        return (0, 0, 0, 0)
+
+    def find_overlapping(self, *args):
+        return ()
+
+    # widget handling
+
+    def config(self, *args, **kw):
+        pass
+    configure = config
+
+    def cget(self, key):
+        return 0
+
+    def bind(self, *args, **kw):
+        pass
+
+    def unbind(self, *args):
+        pass
+
+    def after(self, ms, func=None, *args):
+        pass
+
+    def after_idle(self, func, *args):
+        pass
+
+    def after_cancel(self, id):
+        pass
+
+    def update(self):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+    def winfo_ismapped(self):
+        return False
+
+    def winfo_width(self):
+        return 0
+
+    def winfo_height(self):
+        return 0
+
+    def xview(self, *args):
+        return (0.0, 1.0)
+
+    def yview(self, *args):
+        return (0.0, 1.0)
+
+    # MfxCanvas
+
+    def setInitialSize(self, width, height, margins=True, scrollregion=True):
+        pass
+
+    def setTextColor(self, color):
+        pass
+
+    def setTile(self, image, stretch=0, save_aspect=0):
+        return 1
+
+    def setTopImage(self, image, cw=0, ch=0):
+        return 1
+
+    def deleteAllItems(self):
+        self._text_items = []
+        self.items = {}
+
+    def findCard(self, stack, event):
+        return -1
+
+    def hideAllItems(self):
+        pass
+
+    def showAllItems(self):
+        pass
+
+
+class HeadlessCard(AbstractCard):
+    # A card without any canvas item. The position is kept up to date
+    # (it is cheap), but raising, hiding and turning only touch the model.
+
+    def __init__(self, id, deck, suit, rank, game, x=0, y=0):
+        AbstractCard.__init__(self, id, deck, suit, rank, game, x=x, y=y)
+        self.item = _NULL_ITEM
+
+    def moveTo(self, x, y):
+        self.x, self.y = int(x), int(y)
+
+    def moveBy(self, dx, dy):
+        self.x += int(dx)
+        self.y += int(dy)
+
+    def tkraise(self, unhide=1):
+        pass
+
+    def showFace(self, unhide=1):
+        self.face_up = 1
+
+    def showBack(self, unhide=1):
+        self.face_up = 0
+
+    def updateCardBackground(self, image):
+        pass
+
+    def update(self, id, deck, suit, rank, game):
+        pass
+
+
+class HeadlessImages:
+    # The card geometry of the default cardset, without any image.
+
+    def __init__(self, cardw=73, cardh=97, xoffset=20, yoffset=25):
+        # the few cardset attributes games look at while creating stacks
+        self.cs = Struct(
+            version=1,
+            mahjongg3d=False,
+            SHADOW_XOFFSET=0,
+            SHADOW_YOFFSET=0,
+        )
+        self.reduced = 1
+        self._xfactor = 1.0
+        self._yfactor = 1.0
+        self.CARDW, self.CARDH = cardw, cardh
+        self.CARD_XOFFSET, self.CARD_YOFFSET = xoffset, yoffset
+        self.SHADOW_XOFFSET, self.SHADOW_YOFFSET = 0, 0
+        self.CARD_DX, self.CARD_DY = 0, 0
+
+    def destruct(self):
+        pass
+
+    def getSize(self):
+        return self.CARDW, self.CARDH
+
+    def getOffsets(self):
+        return self.CARD_XOFFSET, self.CARD_YOFFSET
+
+    def getDelta(self):
+        return self.CARD_DX, self.CARD_DY
+
+    def resize(self, xf, yf, resample=1):
+        pass
+
+    def getFace(self, deck, suit, rank):
+        return None
+
+    def getBack(self, update=False):
+        return None
+
+    def getTalonBottom(self):
+        return None
+
+    def getReserveBottom(self):
+        return None
+
+    def getBlankBottom(self):
+        return None
+
+    def getSuitBottom(self, suit=-1):
+        return None
+
+    def getBraidBottom(self):
+        return None
+
+    def getLetter(self, rank):
+        return None
+
+    def getShadow(self, ncards):
+        return None
+
+    def getShade(self):
+        return None
+
+    def getHighlightedCard(self, deck, suit, rank, color=None):
+        return None
+
+    def getHighlightedBack(self):
+        return None
+
+
+class HeadlessApp:
+    # Just enough of Application to construct and play games.
+
+    def __init__(self, opt=None):
+        self.gdb = GAME_DB
+        if opt is None:
+            opt = Options()
+            opt.animations = 0
+            opt.redeal_animation = False
+            opt.flip_animation = False
+            opt.win_animation = False
+            opt.stuck_notification = False
+            opt.randomize_place = False
+            opt.compact_stacks = False
+            opt.shrink_face_down = False
+            opt.shadow = False
+            opt.shade = False
+            opt.sound = False
+            opt.update_player_stats = False
+        self.opt = opt
+        self.stats = Statistics()
+        self.top = None
+        self.top_cursor = None
+        self.menubar = None
+        self.toolbar = None
+        self.statusbar = None
+        self.canvas = HeadlessCanvas()
+        self.audio = None
+        self.images = HeadlessImages()
+        self.subsampled_images = None
+        self.gimages = Struct(
+            demo=[],
+            pause=[],
+            logos=[],
+            redeal=[None, None],
+        )
+        self.cardset = None
+        self.intro = Struct(
+            progress=None,
+        )
+        self.gamerandom = PysolRandom()
+        self.miscrandom = PysolRandom()
+        self.nextgame = Struct(
+            id=0,
+            random=None,
+            loadedgame=None,
+            startdemo=0,
+            cardset=None,
+            holdgame=0,
+            bookmark=None,
+        )
+        self.demo_counter = 0
+
+    def constructGame(self, id):
+        gi = self.gdb.get(id)
+        if gi is None:
+            raise Exception("Unknown game (id %d)" % id)
+        game = gi.gameclass(gi)
+        game.createHeadless(self)
+        return game
+
+    def newGame(self, game, seed=None, autoplay=1):
+        # deal a game; seed is anything construct_random() accepts
+        random = None
+        if seed is not None:
+            random = construct_random(str(seed))
+        game.newGame(random=random, autoplay=autoplay)
+        return game
+
+    def playDemo(self, game, level=2, max_moves=None):
+        # play like the autopilot does (see Game.demoEvent), but without
+        # any delay; return True if the game was won
+        game.demo = Struct(
+            level=level,
+            mixed=0,
+            sleep=0,
+            last_deal=[],
+            snapshots=SnapshotStore(maxlen=game.MAX_SNAPSHOTS),
+            hint=None,
+            keypress=None,
+            start_demo_moves=game.stats.demo_moves,
+            info_text=None,
+        )
+        try:
+            while max_moves is None or game.moves.index < max_moves:
+                finished = game.playOneDemoMove(game.demo)
+                game.finishMove()
+                game.hints.list = None
+                if game.isGameWon():
+                    return True
+                if finished:
+                    return False
+            return False
+        finally:
+            game.demo = None
+
+    def getFont(self, name):
+        return self.opt.fonts.get(name)
+
+    def getGameTitleName(self, id):
+        gi = self.gdb.get(id)
+        if gi is None:
+            return None
+        return gi.name
+
+    def getGamesIdSortedById(self):
+        return self.gdb.getGamesIdSortedById()
+
+    def getRandomGameId(self):
+        return self.miscrandom.choice(self.gdb.getGamesIdSortedById())
+
+    def getGamesForSolver(self):
+        return self.gdb.getGamesForSolver()
@@ -24,16 +24,21 @@
 
 import os
 import re
+import signal
 import subprocess
+import threading
 import time
+import traceback
+from collections import OrderedDict
 from io import BytesIO
 
-from pysollib.mfxutil import destruct
+from pysollib.mfxutil import destruct, pickle, unpickle
 from pysollib.pysolrandom import construct_random
 from pysollib.settings import DEBUG, FCS_COMMAND
 from pysollib.util import KING
 
 import six
+from six.moves import queue
 
 FCS_VERSION = None
 
@@ -74,6 +79,35 @@ class HintInterface:
         return []
 
 
+# ************************************************************************
+# * HintCache keeps the hints of the most recently analysed positions,
+# * so undo/redo, the stuck check, showHint() and the demo do not compute
+# * the same hints again. See Game.getHints().
+# ************************************************************************
+
+class HintCache:
+    def __init__(self, maxlen=64):
+        self.maxlen = maxlen
+        self._hints = OrderedDict()
+
+    def get(self, key):
+        hints = self._hints.get(key)
+        if hints is not None:
+            self._hints.move_to_end(key)
+        return hints
+
+    def put(self, key, hints):
+        if hints is None:
+            return
+        self._hints[key] = hints
+        self._hints.move_to_end(key)
+        while len(self._hints) > self.maxlen:
+            self._hints.popitem(last=False)
+
+    def clear(self):
+        self._hints.clear()
+
+
 # ************************************************************************
 # * AbstractHint provides a useful framework for derived hint classes.
 # *
@@ -91,6 +125,7 @@ class AbstractHint(HintInterface):
         self.bonus_color = None
         #
         self.__clones = []
+        self.__scratch = {}         # see _scratchStack()
         self.reset()
 
     def __del__(self):
@@ -126,6 +161,26 @@ class AbstractHint(HintInterface):
             s.__class__ = self.AClonedStack     # restore orignal class
             destruct(s)
         self.__clones = []
+        self.__scratch = {}
+
+    # Ask a stack what it would do if it held stackcards instead of its
+    # own cards. The question goes to a clone, as some stacks look at
+    # the other stacks of the game (like the foundation of Aces Up); the
+    # clone of a stack is made once and only gets new cards after that.
+    def _scratchStack(self, stack, stackcards):
+        s = self.__scratch.get(stack.id)
+        if s is None:
+            s = self.__scratch[stack.id] = self.ClonedStack(stack, ())
+        s.cards = stackcards
+        return s
+
+    def acceptsCardsWith(self, stack, stackcards, from_stack, cards):
+        s = self._scratchStack(stack, stackcards)
+        return s.acceptsCards(from_stack, cards)
+
+    def canDropCardsWith(self, stack, stackcards, stacks):
+        s = self._scratchStack(stack, stackcards)
+        return s.canDropCards(stacks)
 
     # When computing hints for level 0, the scores are flattened
     # (rounded down) to a multiple of score_flatten_value.
@@ -220,8 +275,7 @@ class AbstractHint(HintInterface):
         if len(rpile) == 0:
             return 1
         # now check for loops
-        rr = self.ClonedStack(from_stack, stackcards=rpile)
-        if rr.acceptsCards(to_stack, pile):
+        if self.acceptsCardsWith(from_stack, rpile, to_stack, pile):
             # the pile we are going to move could be moved back -
             # this is dangerous as we can create endless loops...
             return 0
@@ -237,8 +291,7 @@ class AbstractHint(HintInterface):
             if len(rpile) == 0:
                 return 1
             # now check for loops
-            rr = self.ClonedStack(from_stack, stackcards=rpile)
-            if rr.acceptsCards(to_stack, pile):
+            if self.acceptsCardsWith(from_stack, rpile, to_stack, pile):
                 # the pile we are going to move could be moved back -
                 # this is dangerous as we can create endless loops...
                 return 0
@@ -309,8 +362,7 @@ class DefaultHint(AbstractHint):
         assert pile
         bonus = 0
         if rpile:
-            rr = self.ClonedStack(r, stackcards=rpile)
-            if (rr.canDropCards(self.game.s.foundations))[0]:
+            if self.canDropCardsWith(r, rpile, self.game.s.foundations)[0]:
                 # the card below the pile can be dropped
                 bonus = self.BONUS_DROP_CARD
         if t.cards and t.cards[-1].suit == pile[0].suit:
@@ -545,8 +597,7 @@ class DefaultHint(AbstractHint):
                 drop_info = []
                 i = 0
                 for c in pile:
-                    rr = self.ClonedStack(r, stackcards=[c])
-                    stack, ncards = rr.canDropCards(foundations)
+                    stack, ncards = self.canDropCardsWith(r, [c], foundations)
                     if stack and stack is not r:
                         assert ncards == 1
                         drop_info.append((c, stack, ncards, i))
@@ -583,7 +634,7 @@ class DefaultHint(AbstractHint):
             for t in rows:
                 if t is s or not t.acceptsCards(s, [card]):
                     continue
-                tt = self.ClonedStack(t, stackcards=t.cards+[card])
+                tcards = t.cards + [card]
                 # search a Stack that would benefit from this card
                 for r in dropstacks:
                     if r is t:
@@ -591,12 +642,11 @@ class DefaultHint(AbstractHint):
                     pile = r.getPile()
                     if not pile:
                         continue
-                    if not tt.acceptsCards(r, pile):
+                    if not self.acceptsCardsWith(t, tcards, r, pile):
                         continue
                     # compute remaining pile in r
                     rpile = r.cards[:(len(r.cards)-len(pile))]
-                    rr = self.ClonedStack(r, stackcards=rpile)
-                    if rr.acceptsCards(t, pile):
+                    if self.acceptsCardsWith(r, rpile, t, pile):
                         # the pile we are going to move from r to t
                         # could be moved back from t ro r - this is
                         # dangerous as we can create loops...
@@ -620,11 +670,10 @@ class DefaultHint(AbstractHint):
             pile = [card]
             # compute remaining pile in r
             rpile = r.cards[:(len(r.cards)-len(pile))]
-            rr = self.ClonedStack(r, stackcards=rpile)
             for t in reservestacks:
                 if t is r or not t.acceptsCards(r, pile):
                     continue
-                if rr.acceptsCards(t, pile):
+                if self.acceptsCardsWith(r, rpile, t, pile):
                     # the pile we are going to move from r to t
                     # could be moved back from t ro r - this is
                     # dangerous as we can create loops...
@@ -693,9 +742,8 @@ class Yukon_Hint(YukonType_Hint):
         tpile = t.getPile()
         if tpile:
             for cr in pile:
-                rr = self.ClonedStack(r, stackcards=[cr])
                 for ct in tpile:
-                    if rr.acceptsCards(t, [ct]):
+                    if self.acceptsCardsWith(r, [cr], t, [ct]):
                         d = bonus // 1000
                         bonus = (d * 1000) + bonus % 100
                         break
@@ -739,6 +787,11 @@ class Base_Solver_Hint:
             }
         self.hints = []
         self.hints_index = 0
+        self.solver_state = 'unknown'
+        # the SolverJob when running in the solver_worker thread
+        self.job = None
+        # the hints are from the solver_cache, see solve()
+        self.cached = False
 
         # correct cards rank if foundations.base_rank != 0 (Penguin, Opus)
         if 'base_rank' in game_type:    # (Simple Simon)
@@ -747,8 +800,136 @@ class Base_Solver_Hint:
             self.base_rank = game.s.foundations[0].cap.base_rank
 
     def _setText(self, **kw):
+        if self.job:
+            # the dialog is not thread safe, it polls the job instead
+            self.job.post('progress', kw)
+            return
+        if self.dialog is None:
+            return
         return self.dialog.setText(**kw)
 
+    def _addHint(self, hints, hint):
+        hints.append(hint)
+        if self.job:
+            self.job.post('move', hint)
+
+    def _isCancelled(self):
+        return self.job is not None and self.job.cancelled
+
+    def computeHints(self):
+        board = self.calcBoardString()
+        if not self.solve(board):
+            self.cacheSuffixes(board)
+
+    def solve(self, board):
+        # look the board up in the solver_cache before running the solver;
+        # return True if the solution is from the cache
+        key = self._getCacheKey(board)
+        moves = solver_cache.get(key)
+        self.cached = moves is not None
+        if moves is not None:
+            hints = []
+            for m in moves:
+                self._addHint(hints, self._unpackMove(m))
+            hints.append(None)
+            self.hints = hints
+            self.solver_state = 'solved'
+            return True
+        self.solveBoard(board)
+        if self.solver_state == 'solved':
+            solver_cache.put(
+                key, [self._packMove(h) for h in self.hints[:-1]])
+        return False
+
+    def cacheSuffixes(self, board):
+        # Every position along a solution is solved by the rest of it, so
+        # following the solution (or solving again after some of its
+        # moves) is a lookup. The moves are replayed on a headless copy
+        # of the game to get the board strings of these positions.
+        if self.cached or self.solver_state != 'solved' or \
+                len(self.hints) < 3:
+            return
+        if self.calcBoardString() != board:
+            # the game has moved on
+            return
+        from pysollib.game import Game
+        if type(self.game)._restoreGameHook is not Game._restoreGameHook:
+            # the game has state of its own (like the base card of
+            # Canfield) that a new game does not share
+            return
+        from pysollib.headless import HeadlessApp
+        app = HeadlessApp()
+        game = app.constructGame(self.game.id)
+        app.newGame(game, autoplay=0)
+        cards = dict((c.id, c) for c in game.cards)
+        for stack, copy in zip(self.game.allstacks, game.allstacks):
+            copy.cards = [cards[c.id] for c in stack.cards]
+            for c in stack.cards:
+                cards[c.id].face_up = c.face_up
+            copy.snapshot_key = None
+        if self.game.s.talon:
+            game.s.talon.round = self.game.s.talon.round
+        game.setState(self.game.getState())
+        solver = self.__class__(game, None, **self.game_type)
+        moves = tuple(self._packMove(h) for h in self.hints[:-1])
+        solver.hints = [solver._unpackMove(m) for m in moves] + [None]
+        try:
+            for i in range(1, len(moves)):
+                try:
+                    hint = solver.getHints()[0]
+                except AssertionError:
+                    # no foundation accepts the card
+                    break
+                ncards, src, dest, thint = hint[2], hint[3], hint[4], hint[6]
+                if len(src.cards) < ncards:
+                    break
+                src.moveMove(ncards, dest, frames=0)
+                if thint:
+                    src.flipMove()
+                solver_cache.put(
+                    solver._getCacheKey(solver.calcBoardString()),
+                    moves, i)
+        finally:
+            game.destruct()
+            destruct(game)
+
+    def _getCacheKey(self, board):
+        # the board does not show the talon round of games with redeals
+        game = self.game
+        return (self.__class__.__name__,
+                tuple(sorted(self.game_type.items())), board,
+                game.s.talon and game.s.talon.round, repr(game.getState()))
+
+    # moves are cached as (ncards, src, dest) with the stacks as
+    # (name, index) in game.s, so that they can be saved
+
+    def _packStack(self, stack):
+        if stack is None:
+            return None
+        if stack is self.game.s.talon:
+            return ('talon', 0)
+        for name in ('rows', 'reserves'):
+            stacks = getattr(self.game.s, name)
+            if stack in stacks:
+                return (name, stacks.index(stack))
+        raise ValueError('cannot cache a move to %s' % stack)
+
+    def _unpackStack(self, packed):
+        if packed is None:
+            return None
+        name, index = packed
+        if name == 'talon':
+            return self.game.s.talon
+        return getattr(self.game.s, name)[index]
+
+    def _packMove(self, h):
+        ncards, src, dest = h
+        return (ncards, self._packStack(src), self._packStack(dest))
+
+    def _unpackMove(self, m):
+        ncards, src, dest = m
+        return [ncards, self._unpackStack(src), self._unpackStack(dest)]
+
     def config(self, **kw):
         self.options.update(kw)
 
@@ -826,6 +1007,39 @@ class Base_Solver_Hint:
             raise RuntimeError('Solver exited with {}'.format(p.returncode))
         return BytesIO(pout), BytesIO(perr)
 
+    def start_solver(self, command, board):
+        # like run_solver(), but the output can be read while the solver
+        # is running and a SolverJob can kill the process
+        if DEBUG:
+            print(command)
+        kw = {'shell': True,
+              'stdin': subprocess.PIPE,
+              'stdout': subprocess.PIPE,
+              'stderr': subprocess.DEVNULL}
+        if os.name != 'nt':
+            kw['close_fds'] = True
+            # SolverJob.cancel() kills the shell and the solver
+            kw['start_new_session'] = True
+        p = subprocess.Popen(command, **kw)
+        if self.job:
+            self.job.process = p
+        try:
+            p.stdin.write(six.binary_type(board, 'utf-8'))
+            p.stdin.close()
+        except (IOError, OSError):
+            # killed or not started at all; see finish_solver()
+            pass
+        return p
+
+    def finish_solver(self, p):
+        p.stdout.close()
+        p.wait()
+        if self.job:
+            self.job.process = None
+        if p.returncode in (127, 1) and not self._isCancelled():
+            # Linux and Windows return codes for "command not found" error
+            raise RuntimeError('Solver exited with {}'.format(p.returncode))
+
 
 use_fc_solve_lib = False
 
@@ -846,6 +1060,157 @@ except BaseException:
     pass
 
 
+# ************************************************************************
+# * Solving in the background
+# *
+# * The solver_worker thread is started on the first submit() and stays
+# * alive; it runs the jobs one after the other, so the solver library
+# * objects above are only ever used by one thread. The hint instance
+# * posts ('progress', kw), ('move', [ncards, src, dest]) and finally
+# * ('done', solver_state) or ('error', exception) to the job, and the
+# * caller polls them with SolverJob.events() from the GUI thread.
+# ************************************************************************
+
+
+class SolverJob:
+    def __init__(self, solver, board):
+        self.solver = solver
+        self.board = board
+        self.cancelled = False
+        self.finished = False
+        self.process = None
+        self._events = queue.Queue()
+
+    def post(self, event, value=None):
+        self._events.put((event, value))
+
+    def events(self):
+        # the events posted so far; never blocks
+        while True:
+            try:
+                yield self._events.get_nowait()
+            except queue.Empty:
+                return
+
+    def cancel(self):
+        self.cancelled = True
+        p = self.process
+        if p is not None:
+            try:
+                if os.name != 'nt':
+                    os.killpg(p.pid, signal.SIGKILL)
+                else:
+                    p.kill()
+            except OSError:
+                pass
+
+
+class SolverWorker:
+    def __init__(self):
+        self._jobs = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, solver, board=None):
+        # board defaults to solver.calcBoardString(), which must be called
+        # from the GUI thread as it reads the stacks
+        if board is None:
+            board = solver.calcBoardString()
+        job = SolverJob(solver, board)
+        solver.job = job
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='solver')
+                self._thread.daemon = True
+                self._thread.start()
+        self._jobs.put(job)
+        return job
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                if job.cancelled:
+                    job.solver.solver_state = 'cancelled'
+                else:
+                    job.solver.solve(job.board)
+            except Exception as ex:
+                # the dialog shows it, see BaseSolverDialog._pollSolver
+                if DEBUG:
+                    traceback.print_exc()
+                job.post('error', ex)
+            else:
+                job.post('done', job.solver.solver_state)
+            finally:
+                job.finished = True
+
+
+solver_worker = SolverWorker()
+
+
+# ************************************************************************
+# * Known solutions
+# *
+# * Solutions by solver, game type and calcBoardString(). A position
+# * along a solution shares the moves of the whole solution, the entry
+# * only stores where its part of them starts.
+# * Application keeps them in solver.dat in the config dir.
+# ************************************************************************
+
+class SolverCache:
+    def __init__(self, maxlen=20000):
+        self.maxlen = maxlen
+        self.changed = False
+        self._solutions = OrderedDict()     # key: (moves, start)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._solutions)
+
+    def get(self, key):
+        with self._lock:
+            solution = self._solutions.get(key)
+            if solution is None:
+                return None
+            self._solutions.move_to_end(key)
+        moves, start = solution
+        return moves[start:]
+
+    def put(self, key, moves, start=0):
+        with self._lock:
+            self._solutions[key] = (tuple(moves), start)
+            self._solutions.move_to_end(key)
+            while len(self._solutions) > self.maxlen:
+                self._solutions.popitem(last=False)
+            self.changed = True
+
+    def clear(self):
+        with self._lock:
+            self._solutions.clear()
+            self.changed = True
+
+    def load(self, filename):
+        solutions = unpickle(filename)
+        if not isinstance(solutions, OrderedDict):
+            return
+        with self._lock:
+            solutions.update(self._solutions)
+            self._solutions = solutions
+            while len(self._solutions) > self.maxlen:
+                self._solutions.popitem(last=False)
+
+    def save(self, filename):
+        with self._lock:
+            if not self.changed:
+                return
+            pickle(self._solutions, filename, protocol=-1)
+            self.changed = False
+
+
+solver_cache = SolverCache()
+
+
 class FreeCellSolver_Hint(Base_Solver_Hint):
     def _determineIfSolverState(self, line):
         if re.search('^(?:Iterations count exceeded)', line):
@@ -1006,9 +1371,8 @@ class FreeCellSolver_Hint(Base_Solver_Hint):
 
         return self.board
 
-    def computeHints(self):
-        game = self.game
-        game_type = self.game_type
+    def _getFcsVersion(self):
+        # the version of the fc-solve command is only queried once
         global FCS_VERSION
         if FCS_VERSION is None:
             if use_fc_solve_lib:
@@ -1022,25 +1386,24 @@ class FreeCellSolver_Hint(Base_Solver_Hint):
                                    int(m.group(3)))
                 else:
                     FCS_VERSION = (0, 0, 0)
+        return FCS_VERSION
 
+    def _getSolverArgs(self):
+        game = self.game
+        game_type = self.game_type
+        fcs_version = self._getFcsVersion()
         progress = self.options['progress']
-
-        board = self.calcBoardString()
-        if DEBUG:
-            print('--------------------\n', board, '--------------------')
         args = []
         if use_fc_solve_lib:
             args += ['--reset', '-opt', ]
         else:
             args += ['-m', '-p', '-opt', '-sel']
-            if FCS_VERSION >= (4, 20, 0):
+            if fcs_version >= (4, 20, 0):
                 args += ['-hoi']
         if (not use_fc_solve_lib) and progress:
             args += ['--iter-output']
-            fcs_iter_output_step = None
-            if FCS_VERSION >= (4, 20, 0):
-                fcs_iter_output_step = self.options['iters_step']
-                args += ['--iter-output-step', str(fcs_iter_output_step)]
+            if fcs_version >= (4, 20, 0):
+                args += ['--iter-output-step', str(self.options['iters_step'])]
             if DEBUG:
                 args += ['-s']
         if self.options['preset'] and self.options['preset'] != 'none':
@@ -1058,13 +1421,48 @@ class FreeCellSolver_Hint(Base_Solver_Hint):
             args += ['--sequence-move', game_type['sm']]
         if 'esf' in game_type:
             args += ['--empty-stacks-filled-by', game_type['esf']]
+        return args
+
+    # freecell_solver returns it when the iterations limit is reached
+    FCS_STATE_SUSPEND_PROCESS = 5
+
+    def _solveWithLib(self, args, board):
+        # solve in steps of iterations, so that a SolverJob can be
+        # cancelled and the progress is shown
+        fc_solve_lib_obj.input_cmd_line(args)
+        if not hasattr(fc_solve_lib_obj, 'resume_solution'):
+            # an old freecell_solver module
+            return fc_solve_lib_obj.solve_board(board)
+        max_iters = self.options['max_iters']
+        step = max(self.options['iters_step'], 1000)
+        limit = min(step, max_iters)
+        fc_solve_lib_obj.limit_iterations(limit)
+        status = fc_solve_lib_obj.solve_board(board)
+        while status == self.FCS_STATE_SUSPEND_PROCESS and \
+                limit < max_iters and not self._isCancelled():
+            self._setText(
+                iter=fc_solve_lib_obj.get_num_times(),
+                states=fc_solve_lib_obj.get_num_states_in_collection())
+            limit = min(limit + step, max_iters)
+            fc_solve_lib_obj.limit_iterations(limit)
+            status = fc_solve_lib_obj.resume_solution()
+        return status
+
+    def solveBoard(self, board):
+        # board is the output of calcBoardString(); this runs in the
+        # solver_worker thread when started with solver_worker.submit()
+        game = self.game
+        progress = self.options['progress']
 
+        if DEBUG:
+            print('--------------------\n', board, '--------------------')
+        args = self._getSolverArgs()
         if use_fc_solve_lib:
-            fc_solve_lib_obj.input_cmd_line(args)
-            status = fc_solve_lib_obj.solve_board(board)
+            status = self._solveWithLib(args, board)
         else:
             command = FCS_COMMAND+' '+' '.join(args)
-            pout, perr = self.run_solver(command, board)
+            p = self.start_solver(command, board)
+            pout = p.stdout
         self.solver_state = 'unknown'
         stack_types = {
             'the': game.s.foundations,
@@ -1077,6 +1475,7 @@ class FreeCellSolver_Hint(Base_Solver_Hint):
             iter_ = 0
             depth = 0
             states = 0
+            iters_step = FCS_VERSION >= (4, 20, 0)
 
             for sbytes in pout:
                 s = six.text_type(sbytes, encoding='utf-8')
@@ -1089,7 +1488,7 @@ class FreeCellSolver_Hint(Base_Solver_Hint):
                     depth = self._v
                 elif self.colonPrefixMatch('Stored-States', s):
                     states = self._v
-                    if iter_ % 100 == 0 or fcs_iter_output_step:
+                    if iter_ % 100 == 0 or iters_step:
                         self._setText(iter=iter_, depth=depth, states=states)
                 elif re.search('^(?:-=-=)', s):
                     break
@@ -1110,7 +1509,7 @@ class FreeCellSolver_Hint(Base_Solver_Hint):
                     type_ = ord(m.s[0])
                     src = ord(m.s[1])
                     dest = ord(m.s[2])
-                    hints.append([
+                    self._addHint(hints, [
                         (ord(m.s[3]) if type_ == 0
                          else (13 if type_ == 11 else 1)),
                         (game.s.rows if (type_ in [0, 1, 4, 11, ])
@@ -1183,21 +1582,20 @@ class FreeCellSolver_Hint(Base_Solver_Hint):
                         dt = stack_types[m.group('dest_type')]
                         dest = dt[int(m.group('dest_idx'))]
 
-                hints.append([ncards, src, dest])
+                self._addHint(hints, [ncards, src, dest])
+            self.finish_solver(p)
 
         if DEBUG:
             print('time:', time.time()-start_time)
 
         self.hints = hints
-        if len(hints) > 0:
+        if self._isCancelled():
+            self.solver_state = 'cancelled'
+        elif len(hints) > 0:
             if self.solver_state != 'intractable':
                 self.solver_state = 'solved'
         self.hints.append(None)
 
-        if not use_fc_solve_lib:
-            pout.close()
-            perr.close()
-
 
 class BlackHoleSolver_Hint(Base_Solver_Hint):
     BLACK_HOLE_SOLVER_COMMAND = 'black-hole-solve'
@@ -1226,11 +1624,10 @@ class BlackHoleSolver_Hint(Base_Solver_Hint):
 
         return board
 
-    def computeHints(self):
+    def solveBoard(self, board):
         game = self.game
         game_type = self.game_type
 
-        board = self.calcBoardString()
         if DEBUG:
             print('--------------------\n', board, '--------------------')
         if use_bh_solve_lib:
@@ -1267,7 +1664,8 @@ class BlackHoleSolver_Hint(Base_Solver_Hint):
         if use_bh_solve_lib:
             ret_code = bh_solve_lib_obj.resume_solution()
         else:
-            pout, perr = self.run_solver(command, board)
+            p = self.start_solver(command, board)
+            pout = p.stdout
 
             for sbytes in pout:
                 s = six.text_type(sbytes, encoding='utf-8')
@@ -1297,9 +1695,9 @@ class BlackHoleSolver_Hint(Base_Solver_Hint):
                     if len(game.s.rows) > found_stack_idx >= 0:
                         src = game.s.rows[found_stack_idx]
 
-                        hints.append([1, src, None])
+                        self._addHint(hints, [1, src, None])
                     else:
-                        hints.append([1, game.s.talon, None])
+                        self._addHint(hints, [1, game.s.talon, None])
                     m = bh_solve_lib_obj.get_next_move()
         else:
             self.solver_state = result.lower()
@@ -1309,7 +1707,7 @@ class BlackHoleSolver_Hint(Base_Solver_Hint):
                     print(s)
 
                 if s.strip() == 'Deal talon':
-                    hints.append([1, game.s.talon, None])
+                    self._addHint(hints, [1, game.s.talon, None])
                     continue
 
                 m = re.match(
@@ -1332,13 +1730,14 @@ class BlackHoleSolver_Hint(Base_Solver_Hint):
                 found_stack_idx = int(m.group(1))
                 src = game.s.rows[found_stack_idx]
 
-                hints.append([1, src, None])
-            pout.close()
-            perr.close()
+                self._addHint(hints, [1, src, None])
+            self.finish_solver(p)
 
         if DEBUG:
             print('time:', time.time()-start_time)
 
+        if self._isCancelled():
+            self.solver_state = 'cancelled'
         hints.append(None)
         self.hints = hints
 
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+# Copyright (C) 1998-2003 Markus Franz Xaver Johannes Oberhumer
+# Copyright (C) 2003 Mt. Hood Playing Card Co.
+# Copyright (C) 2005-2009 Skomoroh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import hashlib
+import math
+import os
+import threading
+from collections import OrderedDict
+
+from pysollib.mfxutil import Image, print_err
+
+from six.moves import queue
+
+# ************************************************************************
+# * The scaled images of the cardsets (see Images.resize), so that going
+# * back to a size does not resample all the images of the cardset again.
+# *
+# * A set of images of the same size is keyed by (cardset ident, what
+# * the set contains, width, height, resampling). The latest sets are
+# * kept in memory, and the sets made with a slow resampling are saved
+# * as one PNG picture (the images side by side) in a directory; the
+# * least recently used files are removed.
+# ************************************************************************
+
+
+class ScaledImageCache:
+    MAX_MEMORY = 4
+    MAX_FILES = 100
+
+    def __init__(self, dirname):
+        self.dirname = dirname
+        self._memory = OrderedDict()    # key: list of PIL images
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+        self._saved = 0
+
+    def _filename(self, key):
+        digest = hashlib.md5(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.dirname, digest + '.png')
+
+    def get(self, key, count):
+        # returns a list of count PIL images or None
+        with self._lock:
+            images = self._memory.get(key)
+            if images is not None:
+                self._memory.move_to_end(key)
+                return images
+        if not self._isSaved(key):
+            return None
+        filename = self._filename(key)
+        try:
+            picture = Image.open(filename)
+            picture.load()
+            images = _split(picture, key[-3], key[-2], count)
+            os.utime(filename, None)
+        except Exception:
+            return None
+        self._remember(key, images)
+        return images
+
+    def _isSaved(self, key):
+        # NEAREST is faster than reading the file
+        return key[-1] != Image.NEAREST
+
+    def _remember(self, key, images):
+        with self._lock:
+            self._memory[key] = images
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.MAX_MEMORY:
+                self._memory.popitem(last=False)
+
+    def put(self, key, images):
+        self._remember(key, images)
+        if not self._isSaved(key):
+            return
+        # save the picture in the background
+        self._queue.put((key, images))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            key, images = self._queue.get()
+            try:
+                self._save(key, _join(images, key[-3], key[-2]))
+            except Exception as ex:
+                print_err('scaled images of %s: %r' % (key[0], ex))
+            finally:
+                self._queue.task_done()
+
+    def _save(self, key, picture):
+        if not os.path.isdir(self.dirname):
+            os.makedirs(self.dirname)
+        # write to a temporary file, a reader must not see a part of it
+        filename = self._filename(key)
+        tmp = filename + '.tmp'
+        picture.save(tmp, 'PNG', compress_level=1)
+        os.replace(tmp, filename)
+        self._saved += 1
+        if self._saved % 10 == 1:
+            self._prune()
+
+    def _prune(self):
+        files = []
+        for name in os.listdir(self.dirname):
+            if name.endswith('.png'):
+                filename = os.path.join(self.dirname, name)
+                files.append((os.path.getmtime(filename), filename))
+        files.sort()
+        for mtime, filename in files[:-self.MAX_FILES]:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+
+def _columns(count):
+    return max(1, int(math.ceil(math.sqrt(count))))
+
+
+def _join(images, width, height):
+    columns = _columns(len(images))
+    rows = (len(images) + columns - 1) // columns
+    picture = Image.new('RGBA', (columns * width, rows * height))
+    for i, im in enumerate(images):
+        picture.paste(im, ((i % columns) * width, (i // columns) * height))
+    return picture
+
+
+def _split(picture, width, height, count):
+    columns = _columns(count)
+    images = []
+    for i in range(count):
+        x, y = (i % columns) * width, (i // columns) * height
+        images.append(picture.crop((x, y, x + width, y + height)))
+    return images
@@ -76,6 +76,8 @@ class Images:
         self._highlighted_images = {}   # key: (suit, rank)
 
         self.cardset_bottoms = False
+        self.cache = None               # ScaledImageCache
+        self.loader_job = None          # CardsetJob
 
     def destruct(self):
         pass
@@ -87,7 +89,12 @@ class Images:
             print_err('card image path %s does not exist' % f)
             return None
         try:
-            img = loadImage(file=f)
+            img = None
+            if self.loader_job is not None:
+                # decoded in the threads of the CardsetLoader
+                img = self.loader_job.getImage(f)
+            if img is None:
+                img = loadImage(file=f)
         except Exception:
             return None
 
@@ -442,41 +449,22 @@ class Images:
         self._resampling = resample
         # ???self._setSize(xf, yf)
         self.setOffsets()
-        # cards
-        cards = []
-        for c in self._card:
-            c = c.resize(xf, yf, resample=resample)
-            cards.append(c)
-        self._card = cards
-        # back
-        for b in self._back:
-            b.image = b.image.resize(xf, yf, resample=resample)
-
         # stack bottom image
         neg = self._bottom is self._bottom_negative  # dont know
-
-        bottom_negative = []
-        bottom_positive = []
-        for c in self._bottom_negative:
-            c = c.resize(xf, yf, resample=resample)
-            bottom_negative.append(c)
-        self._bottom_negative = bottom_negative
-        for c in self._bottom_positive:
-            c = c.resize(xf, yf, resample=resample)
-            bottom_positive.append(c)
-        self._bottom_positive = bottom_positive
-
-        # letters
-        letter_negative = []
-        letter_positive = []
-        for c in self._letter_negative:
-            c = c.resize(xf, yf, resample=resample)
-            letter_negative.append(c)
-        self._letter_negative = letter_negative
-        for c in self._letter_positive:
-            c = c.resize(xf, yf, resample=resample)
-            letter_positive.append(c)
-        self._letter_positive = letter_positive
+        # cards, back, bottoms and letters
+        groups = (self._card, [b.image for b in self._back],
+                  self._bottom_negative, self._bottom_positive,
+                  self._letter_negative, self._letter_positive)
+        images = [im for group in groups for im in group]
+        images = self._scaleImages(
+            images, xf, yf, resample,
+            lambda im: im.resize(xf, yf, resample=resample))
+        groups = [images[i:i+n] for i, n in self._groupSlices(groups)]
+        self._card = groups[0]
+        for b, im in zip(self._back, groups[1]):
+            b.image = im
+        (self._bottom_negative, self._bottom_positive,
+         self._letter_negative, self._letter_positive) = groups[2:]
 
         self._createMissingImages()
         self.setNegative(neg)
@@ -491,6 +479,50 @@ class Images:
         print('Image.reset')
         self.resize(1, 1)
 
+    def _groupSlices(self, groups):
+        i = 0
+        for group in groups:
+            yield i, len(group)
+            i += len(group)
+
+    def _scaleImages(self, images, xf, yf, resample, func, from_orig=True):
+        # the images scaled with func, from the cache if they were
+        # scaled to this size before (all PIL images of the same size);
+        # func scales the original images (resize) or, if not from_orig,
+        # the images as they are (subsample)
+        cache = self.cache
+        if cache is None or not images or \
+                not all(hasattr(im, '_pil_image_orig') for im in images):
+            return [func(im) for im in images]
+        if from_orig:
+            sources = [im._pil_image_orig for im in images]
+        else:
+            sources = [im._pil_image for im in images]
+        size = sources[0].size
+        if any(source.size != size for source in sources):
+            return [func(im) for im in images]
+        try:
+            mtime = os.stat(self.cs.dir).st_mtime
+        except OSError:
+            mtime = None
+        w, h = int(size[0] * xf), int(size[1] * yf)
+        key = (self.cs.ident, mtime, self.cardset_bottoms, len(images),
+               size[0], size[1], w, h, resample)
+        scaled = cache.get(key, len(images))
+        if scaled is not None:
+            # same class as the image, keeping the original for the next
+            # resize (see PIL_Image in tkutil.py)
+            if not from_orig:
+                return [im.__class__(image=pil_image)
+                        for im, pil_image in zip(images, scaled)]
+            return [im.__class__(image=pil_image,
+                                 pil_image_orig=im._pil_image_orig)
+                    for im, pil_image in zip(images, scaled)]
+        images = [func(im) for im in images]
+        if all(im._pil_image.size == (w, h) for im in images):
+            cache.put(key, [im._pil_image for im in images])
+        return images
+
 
 # ************************************************************************
 # *
@@ -503,20 +535,32 @@ class SubsampledImages(Images):
             r = max(images.CARDW, images.CARDH) // size_cap
 
         Images.__init__(self, None, images.cs, r=r)
-        self._card = self._subsample(images._card, r)
-        self._bottom_positive = self._subsample(images._bottom_positive, r)
-        self._letter_positive = self._subsample(images._letter_positive, r)
-        self._bottom_negative = self._subsample(images._bottom_negative, r)
-        self._letter_negative = self._subsample(images._letter_negative, r)
+        self.cardset_bottoms = images.cardset_bottoms
+        self.cache = images.cache
+        backs = [b for b in images._back if b is not None]
+        groups = (images._card, images._bottom_positive,
+                  images._letter_positive, images._bottom_negative,
+                  images._letter_negative, [b.image for b in backs])
+        if r == 1:
+            groups = [list(group) for group in groups]
+        else:
+            subsampled = self._scaleImages(
+                [im for group in groups for im in group], 1.0 / r, 1.0 / r,
+                'subsample', lambda im: im.subsample(r), from_orig=False)
+            groups = [subsampled[i:i+n]
+                      for i, n in self._groupSlices(groups)]
+        (self._card, self._bottom_positive, self._letter_positive,
+         self._bottom_negative, self._letter_negative) = groups[:5]
         self._bottom = self._bottom_positive
         self._letter = self._letter_positive
 
         #
+        subsampled = iter(groups[5])
         for _back in images._back:
             if _back is None:
                 self._back.append(None)
             else:
-                im = _back.image.subsample(r)
+                im = next(subsampled)
                 self._back.append(
                     ImagesCardback(len(self._back), _back.name, im, im))
         #
@@ -527,12 +571,3 @@ class SubsampledImages(Images):
 
     def getShadow(self, ncards):
         return None
-
-    def _subsample(self, images_list, r):
-        s = []
-        for im in images_list:
-            if im is None or r == 1:
-                s.append(im)
-            else:
-                s.append(im.subsample(r))
-        return s
@@ -23,6 +23,7 @@ from __future__ import division
 
 import logging
 import math
+import time
 import traceback
 
 from kivy.animation import Animation
@@ -126,36 +127,107 @@ class LPopCommander(LBase):
 # =============================================================================
 
 
+class LAnimationJob(object):
+    # a move of a widget; the moves queued on a widget are coalesced
+    # into one job, the callbacks of all of them are called.
+    def __init__(self, widget, spos, x, y, duration, transition):
+        self.widget = widget
+        self.spos = spos
+        self.x, self.y = x, y
+        self.duration = duration
+        self.transition = transition
+        self.bindS = []
+        self.bindE = []
+        self.anim = None
+
+    def merge(self, x, y, duration):
+        # go straight to the target of the later move
+        self.x, self.y = x, y
+        self.duration = max(self.duration, duration)
+
+
 class LAnimationMgr(object):
+    # starts the animations of independent widgets in parallel. The
+    # queued animations are started in the next frames, as long as the
+    # starts of a frame take less than FRAME_BUDGET seconds.
+    FRAME_BUDGET = 0.004
+
     def __init__(self, **kw):
         super(LAnimationMgr, self).__init__()
-        self.animations = []
-        self.widgets = {}
+        self.animations = []            # running kivy animations
+        self.widgets = {}               # widget: [running job, next job]
+        self.pending = []               # jobs to be started
+        self.frame_event = None
+        self.resetCounters()
+
+    def resetCounters(self):
+        self.counters = dict(
+            frames=0, started=0, coalesced=0, max_frame=0.0, max_starts=0)
+
+    def logCounters(self):
+        c = self.counters
+        logging.info(
+            'LAnimationMgr: %d animations (%d coalesced) in %d frames, '
+            'max frame %.1f ms, max %d starts per frame' % (
+                c['started'], c['coalesced'], c['frames'],
+                c['max_frame'] * 1000, c['max_starts']))
 
     def animEnd(self, anim, widget):
         # print('LAnimationMgr: animEnd = %s.%s' % (anim, widget))
 
-        self.widgets[widget] = self.widgets[widget][1:]
         self.animations.remove(anim)
-        if len(self.widgets[widget]) > 0:
+        jobs = self.widgets[widget][1:]
+        if jobs:
             # start next animation on widget
-            nanim = self.widgets[widget][0]
-            self.animations.append(nanim)
-            print('LAnimationMgr: animEnd, append = %s' % (nanim))
-            nanim.start(widget)
+            self.widgets[widget] = jobs
+            self.pending.append(jobs[0])
         else:
             # no further animations for widget so stop
             del self.widgets[widget]
 
-    def makeAnimStart(self, anim, spos, widget):
-        def animStart(dt):
-            widget.pos = spos
-            # print('LAnimationMgr: animStart = %s ... %s' % (anim, dt))
-            anim.start(widget)
-        return animStart
+    def startJob(self, job):
+        anim = Animation(x=job.x, y=job.y, duration=job.duration,
+                         transition=job.transition)
+        anim.bind(on_complete=self.animEnd)
+        # kivy calls the last bound function first, the callbacks of
+        # the coalesced moves are called in their order
+        if job.bindE:
+            anim.bind(on_complete=self.makeCallbacks(job.bindE))
+        if job.bindS:
+            anim.bind(on_start=self.makeCallbacks(job.bindS))
+        job.anim = anim
+        self.animations.append(anim)
+        if job.spos is not None:
+            job.widget.pos = job.spos
+        anim.start(job.widget)
+        self.counters['started'] += 1
+
+    def makeCallbacks(self, funcs):
+        def callbacks(anim, widget):
+            for func in funcs:
+                func(anim, widget)
+        return callbacks
+
+    def frame(self, dt):
+        c = self.counters
+        c['frames'] += 1
+        c['max_frame'] = max(c['max_frame'], dt)
+        starttime = time.perf_counter()
+        starts = 0
+        while self.pending:
+            self.startJob(self.pending.pop(0))
+            starts += 1
+            if time.perf_counter() - starttime > self.FRAME_BUDGET:
+                break
+        c['max_starts'] = max(c['max_starts'], starts)
+        if not self.checkRunning():
+            self.frame_event.cancel()
+            self.frame_event = None
+            self.logCounters()
+            self.resetCounters()
 
     def checkRunning(self):
-        return len(self.animations) > 0
+        return len(self.animations) > 0 or len(self.pending) > 0
 
     def create(self, spos, widget, **kw):
         x = 0.0
@@ -171,28 +243,31 @@ class LAnimationMgr(object):
         if 'transition' in kw:
             transition = kw['transition']
 
-        anim = Animation(x=x, y=y, duration=duration, transition=transition)
-        anim.bind(on_complete=self.animEnd)
+        jobs = self.widgets.get(widget)
+        if jobs and jobs[-1].anim is None:
+            # the widget has a job that is not started: move to the
+            # new target from there
+            job = jobs[-1]
+            job.merge(x, y, duration)
+            self.counters['coalesced'] += 1
+        else:
+            job = LAnimationJob(widget, spos, x, y, duration, transition)
+            if jobs:
+                # append additional animation to widget; it starts
+                # from where the running one ends
+                job.spos = None
+                jobs.append(job)
+            else:
+                # setup first animation for widget
+                self.widgets[widget] = [job]
+                self.pending.append(job)
         if 'bindE' in kw:
-            anim.bind(on_complete=kw['bindE'])
+            job.bindE.append(kw['bindE'])
         if 'bindS' in kw:
-            anim.bind(on_start=kw['bindS'])
-
-        offset = duration / 3.0
-        # offset = duration*1.2
-        timedelay = offset * len(self.animations)
-        # print('offset = %s'% offset)
-        print('LAnimationMgr: timedelay = %s' % timedelay)
+            job.bindS.append(kw['bindS'])
 
-        if widget in self.widgets:
-            # append additional animation to widget
-            self.widgets[widget].append(anim)
-        else:
-            # setup first animation for widget
-            self.animations.append(anim)
-            self.widgets[widget] = [anim]
-            Clock.schedule_once(self.makeAnimStart(
-                anim, spos, widget), timedelay)
+        if self.frame_event is None:
+            self.frame_event = Clock.schedule_interval(self.frame, 0)
 
 
 LAnimationManager = LAnimationMgr()
@@ -1930,6 +2005,12 @@ class LApp(App):
         except Exception:
             traceback.print_exc()
             pass
+        # save solutions
+        try:
+            app.saveSolverCache()
+        except Exception:
+            traceback.print_exc()
+            pass
         logging.info("LApp: on_pause - gamesaved")
 
         logging.info("LApp: on_pause, Window.size=%s" % str(Window.size))
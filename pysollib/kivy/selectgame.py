@@ -145,13 +145,15 @@ class SelectGameData(SelectDialogTreeData):
         if 1 and gg:
             s_all_games = SelectGameNode(None, _("All Games"), tuple(gg))
         #
+        index = app.gdb.getSearchIndex()
         s_by_compatibility, gg = None, []
         for name, games in GI.GAMES_BY_COMPATIBILITY:
+            games = index.compatibility.get(name)
+            if not games:
+                continue
+
             def select_func(gi, games=games):
                 return gi.id in games
-            if name is None or not list(filter(
-                    select_func, self.all_games_gi)):
-                continue
             gg.append(SelectGameNode(None, name, select_func))
         if 1 and gg:
             s_by_compatibility = SelectGameNode(None, _("by Compatibility"),
@@ -160,11 +162,12 @@ class SelectGameData(SelectDialogTreeData):
         #
         s_by_pysol_version, gg = None, []
         for name, games in GI.GAMES_BY_PYSOL_VERSION:
+            games = index.versions.get(name)
+            if not games:
+                continue
+
             def select_func(gi, games=games):
                 return gi.id in games
-            if name is None or not list(filter(
-                    select_func, self.all_games_gi)):
-                continue
             name = _("New games in v. %(version)s") % {'version': name}
             gg.append(SelectGameNode(None, name, select_func))
         if 1 and gg:
@@ -173,11 +176,12 @@ class SelectGameData(SelectDialogTreeData):
         #
         s_by_inventors, gg = None, []
         for name, games in GI.GAMES_BY_INVENTORS:
+            games = index.inventors.get(name)
+            if not games:
+                continue
+
             def select_func(gi, games=games):
                 return gi.id in games
-            if name is None or not list(filter(
-                    select_func, self.all_games_gi)):
-                continue
             gg.append(SelectGameNode(None, name, select_func))
         if 1 and gg:
             s_by_inventors = SelectGameNode(None, _("by Inventors"),
@@ -220,7 +220,7 @@ class MfxCanvasImage(object):
             self.addtag(group)
 
     def __del__(self):
-        print('MfxCanvasImage: __del__(%s)' % self.image)
+        # print('MfxCanvasImage: __del__(%s)' % self.image)
         self.canvas.clear_widgets([self.image])
 
     def config(self, **kw):
@@ -256,11 +256,15 @@ class MfxCanvasImage(object):
     def move(self, dx, dy):
         # print ('MfxCanvasImage: move %s, %s' % (dx, dy))
         image = self.image
-        dsize = image.coreSize
-        dpos = (image.corePos[0] + dx, image.corePos[1] + dy)
-        image.corePos = dpos
+        image.corePos = (image.corePos[0] + dx, image.corePos[1] + dy)
+        # the widget is moved in the next frame (see MfxCanvas.flush)
+        self.canvas.moveLater(self)
+
+    def updatePos(self):
         if not self.animation:
-            image.pos, image.size = self.canvas.CoreToKivy(dpos, dsize)
+            image = self.image
+            image.pos, image.size = self.canvas.CoreToKivy(
+                image.corePos, image.coreSize)
 
     def makeAnimStart(self):
         def animStart(anim, widget):
@@ -476,6 +480,45 @@ class MfxCanvas(Widget):
         self.bind(pos=self.pos_update_widget)
         self.bind(size=self.size_update_widget)
 
+        # the moved items and the widgets raised to the top, updated
+        # once per frame (dealing moves and raises every card)
+        self._moved = set()
+        self._raised = []
+        self._flush_trigger = Clock.create_trigger(self.flush)
+
+    def moveLater(self, item):
+        self._moved.add(item)
+        self._flush_trigger()
+
+    def flush(self, *args):
+        self.flushRaised()
+        moved, self._moved = self._moved, set()
+        for item in moved:
+            item.updatePos()
+
+    def flushRaised(self):
+        if not self._raised:
+            return
+        raised, self._raised = self._raised, []
+        # the last raise of a widget counts
+        seen = set()
+        order = []
+        for w in reversed(raised):
+            if w not in seen:
+                seen.add(w)
+                order.append(w)
+        order.reverse()
+        for w in order:
+            # deleted meanwhile?
+            if w.parent is self:
+                super(MfxCanvas, self).remove_widget(w)
+                super(MfxCanvas, self).add_widget(w)
+
+    def add_widget(self, widget, *args, **kwargs):
+        # a new widget is above the widgets raised before
+        self.flushRaised()
+        super(MfxCanvas, self).add_widget(widget, *args, **kwargs)
+
     def KivyToCoreP(self, pos, size, scale):
         cpos = pos
         cpos = (cpos[0] - self.pos[0], self.pos[1] +
@@ -676,12 +719,17 @@ class MfxCanvas(Widget):
     def tag_raise(self, itm, abitm=None):
         # print('MfxCanvas: tag_raise, itm=%s, aboveThis=%s' % (itm, abitm))
         if (itm is not None):
-            if (abitm is None):
+            if (abitm is None and itm.parent is self):
                 # print('MfxCanvas: tag_raise: to top')
+                self._raised.append(itm)
+                self._flush_trigger()
+            elif (abitm is None):
+                self.flushRaised()
                 self.clear_widgets([itm])
                 self.add_widget(itm)
             else:
-                print('MfxCanvas: tag_raise: to specified position')
+                # print('MfxCanvas: tag_raise: to specified position')
+                self.flushRaised()
                 ws = []
                 for c in reversed(self.children):   # reversed!
                     if c != itm and c != abitm:
@@ -866,5 +914,5 @@ class MfxCanvas(Widget):
         pass
 
     def update_idletasks(self):
-        print('MfxCanvas: update_idletasks')
+        # print('MfxCanvas: update_idletasks')
         self.wmain.update_idletasks()
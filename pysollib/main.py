@@ -29,7 +29,7 @@ import traceback
 
 from pysollib.app import Application
 from pysollib.gamedb import GAME_DB
-from pysollib.mfxutil import print_err
+from pysollib.mfxutil import print_err, uclock
 from pysollib.mygettext import _
 from pysollib.pysolaudio import AbstractAudioClient
 from pysollib.pysolaudio import KivyAudioClient, OSSAudioClient
@@ -91,6 +91,7 @@ def parse_option(argv):
                                        "noplugins",
                                        "nosound",
                                        "sound-mod=",
+                                       "timing",
                                        "help"])
     except getopt.GetoptError as err:
         print_err(str(err) + "\n" + _("try %s --help for more information") %
@@ -104,6 +105,7 @@ def parse_option(argv):
             "noplugins": False,
             "nosound": False,
             "sound-mod": None,
+            "timing": False,
             }
     for i in optlist:
         if i[0] in ("-h", "--help"):
@@ -123,6 +125,8 @@ def parse_option(argv):
         elif i[0] == "--sound-mod":
             assert i[1] in ('pss', 'pygame', 'oss', 'win')
             opts["sound-mod"] = i[1]
+        elif i[0] == "--timing":
+            opts["timing"] = True
 
     if opts["help"]:
         print(_("""Usage: %s [OPTIONS] [FILE]
@@ -132,6 +136,7 @@ def parse_option(argv):
         --sound-mod=MOD
         --nosound              disable sound support
         --noplugins            disable load plugins
+        --timing               print the startup times
   -h    --help                 display this help and exit
 
   FILE - file name of a saved game
@@ -234,14 +239,23 @@ def pysol_init(app, args):
     def progressCallback(*args):
         app.intro.progress.update(step=1)
     GAME_DB.setCallback(progressCallback)
-    import pysollib.games
-    if not opts['french-only']:
-        import pysollib.games.ultra
-        import pysollib.games.mahjongg
-        import pysollib.games.special
-        pysollib.games.special.no_use()
+    t = uclock()
+    # the game modules are imported when their games are used if the
+    # manifest (see scripts/gen_games_manifest.py) is up to date
+    manifest = os.path.join(app.dataloader.dir, 'games.json')
+    if not GAME_DB.loadManifest(manifest,
+                                subpackages=not opts['french-only']):
+        import pysollib.games
+        if not opts['french-only']:
+            import pysollib.games.ultra
+            import pysollib.games.mahjongg
+            import pysollib.games.special
+            pysollib.games.special.no_use()
+    games_time = uclock() - t
+    register_time = GAME_DB.register_time
 
     # try to load plugins
+    t = uclock()
     if not opts["noplugins"]:
         for dir in (os.path.join(app.dataloader.dir, "games"),
                     os.path.join(app.dataloader.dir, "plugins"),
@@ -251,6 +265,15 @@ def pysol_init(app, args):
             except Exception:
                 pass
     GAME_DB.setCallback(None)
+    plugins_time = uclock() - t
+    if opts["timing"]:
+        # registration is part of the imports (or of the manifest)
+        print("startup: %d games: %s %.3f sec (registration %.3f sec), "
+              "plugins %.3f sec (registration %.3f sec)" %
+              (len(GAME_DB.getGamesIdSortedById()),
+               "manifest" if GAME_DB.manifest_loaded else "imports",
+               games_time - register_time, register_time, plugins_time,
+               GAME_DB.register_time - register_time))
 
     # init audio 1)
     app.audio = None
@@ -314,6 +337,10 @@ Please check your %(app)s installation.
         return 1
 
     # init cardsets
+    try:
+        app.loadResourceIndex()
+    except Exception:
+        traceback.print_exc()
     app.initCardsets()
     cardset = None
     c = app.opt.cardset.get(0).get(0)
@@ -369,6 +396,10 @@ Cardsets package is up to date.
     # init samples and music resources
     app.initSamples()
     app.initMusic()
+    try:
+        app.saveResourceIndex()
+    except Exception:
+        traceback.print_exc()
 
     # init audio 2)
     if not app.audio.CAN_PLAY_SOUND:
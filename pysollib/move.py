@@ -22,6 +22,7 @@
 # ---------------------------------------------------------------------------##
 
 import sys
+from array import array
 
 if sys.version_info > (3,):
     def cmp(a, b):
@@ -129,6 +130,7 @@ class AFlipMove(AtomicMove):
     # do the actual move
     def _doMove(self, game, stack):
         card = stack.cards[-1]
+        stack.snapshot_key = None
         # game.animatedFlip(stack)
         if card.face_up:
             card.showBack()
@@ -149,6 +151,7 @@ class AFlipMove(AtomicMove):
 class ASingleFlipMove(AFlipMove):
     def _doMove(self, game, stack):
         card = stack.cards[-1]
+        stack.snapshot_key = None
         game.animatedFlip(stack)
         if card.face_up:
             card.showBack()
@@ -210,6 +213,7 @@ class AFlipAllMove(AtomicMove):
 
     def redo(self, game):
         stack = game.allstacks[self.stack_id]
+        stack.snapshot_key = None
         for card in stack.cards:
             if card.face_up:
                 card.showBack()
@@ -219,6 +223,7 @@ class AFlipAllMove(AtomicMove):
 
     def undo(self, game):
         stack = game.allstacks[self.stack_id]
+        stack.snapshot_key = None
         for card in stack.cards:
             if card.face_up:
                 card.showBack()
@@ -308,6 +313,7 @@ class NEW_ATurnStackMove(AtomicMove):
                 card.showBack(unhide=0)
         to_stack.cards = from_stack.cards
         from_stack.cards = []
+        from_stack.snapshot_key = to_stack.snapshot_key = None
         from_stack.refreshView()
         from_stack.updateText()
         to_stack.refreshView()
@@ -353,6 +359,8 @@ class AUpdateStackMove(AtomicMove):
         if self.flags & 64:
             # model
             stack.updateModel(undo, self.flags)
+            stack.snapshot_key = None
+            game.hint_cache.clear()
         else:
             # view
             if self.flags & 16:
@@ -465,6 +473,7 @@ class AShuffleStackMove(AtomicMove):
             j = game.random.randint(0, n)
             seq[n], seq[j] = seq[j], seq[n]
             n = n - 1
+        stack.snapshot_key = None
         stack.refreshView()
 
     def undo(self, game):
@@ -476,6 +485,7 @@ class AShuffleStackMove(AtomicMove):
             assert c.id == id
             cards.append(c)
         stack.cards = cards
+        stack.snapshot_key = None
         # restore the state
         game.random.setstate(self.state)
         stack.refreshView()
@@ -554,3 +564,207 @@ class AInnerMove(AtomicMove):
     def cmpForRedo(self, other):
         return cmp((self.stack_id, self.from_pos, self.to_pos),
                    (other.stack_id, other.from_pos, other.to_pos))
+
+
+# ************************************************************************
+# * MoveHistory - the move history (GameMoves.history) in packed form
+# *
+# * It is used like a list of moves, where a move is the list of atomic
+# * moves that Game.finishMove() has collected, but every atomic move is
+# * stored as a record of RECORD_SIZE ints: the opcode and the int
+# * attributes. Other attributes (saved random and game states, card ids)
+# * are kept in a list of objects and the record has their index there.
+# * Atomic moves of other classes are kept as objects (opcode 0).
+# * Indexing returns new atomic move instances.
+# ************************************************************************
+
+# opcode: (class, int attributes, object attributes)
+# NOTE: the opcodes are stored in saved games, only append to this list
+_PACKED_MOVES = (
+    (None, (), ()),
+    (AMoveMove,
+     ('ncards', 'from_stack_id', 'to_stack_id', 'frames', 'shadow'), ()),
+    (AFlipMove, ('stack_id',), ()),
+    (ASingleFlipMove, ('stack_id',), ()),
+    (AFlipAndMoveMove, ('from_stack_id', 'to_stack_id', 'frames'), ()),
+    (AFlipAllMove, ('stack_id',), ()),
+    (ATurnStackMove, ('from_stack_id', 'to_stack_id'), ()),
+    (NEW_ATurnStackMove,
+     ('from_stack_id', 'to_stack_id', 'update_flags'), ()),
+    (AUpdateStackMove, ('stack_id', 'flags'), ()),
+    (ANextRoundMove, ('stack_id',), ()),
+    (ASaveSeedMove, (), ('state',)),
+    (ASaveStateMove, ('flags',), ('state',)),
+    (AShuffleStackMove, ('stack_id',), ('card_ids', 'state')),
+    (ASingleCardMove,
+     ('from_stack_id', 'to_stack_id', 'from_pos', 'frames', 'shadow'), ()),
+    (AInnerMove, ('stack_id', 'from_pos', 'to_pos'), ()),
+)
+_MOVE_OPCODES = dict((m[0], op) for op, m in enumerate(_PACKED_MOVES))
+
+
+class MoveHistory:
+    RECORD_SIZE = 6
+
+    def __init__(self, history=()):
+        self._records = array('i')
+        self._objects = []
+        # index of the first record and the first object of each move
+        self._moves = array('i')
+        self._move_objects = array('i')
+        for move in history:
+            self.append(move)
+
+    def __len__(self):
+        return len(self._moves)
+
+    def __repr__(self):
+        return '%s(%d moves, %d atomic moves)' % (
+            self.__class__.__name__, len(self._moves),
+            len(self._records) // self.RECORD_SIZE)
+
+    def _index(self, i):
+        n = len(self._moves)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('move index out of range')
+        return i
+
+    def _recordRange(self, i):
+        start = self._moves[i]
+        if i + 1 < len(self._moves):
+            end = self._moves[i + 1]
+        else:
+            end = len(self._records) // self.RECORD_SIZE
+        return start, end
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        start, end = self._recordRange(self._index(i))
+        return [self._unpack(r) for r in range(start, end)]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __setitem__(self, i, value):
+        if isinstance(i, slice):
+            # history[i:] = moves
+            assert i.step is None and i.stop is None
+            self.truncate(i.indices(len(self))[0])
+            for move in value:
+                self.append(move)
+            return
+        i = self._index(i)
+        records, objects = array('i'), []
+        for am in value:
+            self._pack(am, records, objects)
+        start, end = self._recordRange(i)
+        ostart = self._move_objects[i]
+        oend = (self._move_objects[i + 1] if i + 1 < len(self._moves)
+                else len(self._objects))
+        if (len(records) == (end - start) * self.RECORD_SIZE and
+                len(objects) == oend - ostart):
+            # the usual case: a redo move (see Game.finishMove)
+            self._records[start*self.RECORD_SIZE:end*self.RECORD_SIZE] = \
+                records
+            self._objects[ostart:oend] = objects
+            return
+        tail = self[i+1:]
+        self.truncate(i)
+        self.append(value)
+        for move in tail:
+            self.append(move)
+
+    def __delitem__(self, i):
+        # del history[i:]
+        assert isinstance(i, slice) and i.step is None and i.stop is None
+        self.truncate(i.indices(len(self))[0])
+
+    def append(self, move):
+        self._moves.append(len(self._records) // self.RECORD_SIZE)
+        self._move_objects.append(len(self._objects))
+        for am in move:
+            self._pack(am, self._records, self._objects)
+
+    def truncate(self, n):
+        # remove the moves from index n on
+        if n >= len(self._moves):
+            return
+        del self._records[self._moves[n]*self.RECORD_SIZE:]
+        del self._objects[self._move_objects[n]:]
+        del self._moves[n:]
+        del self._move_objects[n:]
+
+    def _pack(self, am, records, objects):
+        op = _MOVE_OPCODES.get(am.__class__, 0)
+        record = [op] + [0] * (self.RECORD_SIZE - 1)
+        if op:
+            cls, int_attrs, obj_attrs = _PACKED_MOVES[op]
+            d = am.__dict__
+            i = 1
+            for attr in int_attrs:
+                # None if missing (a move of an older version)
+                v = d.get(attr)
+                if not isinstance(v, int) or not -2**31 <= v < 2**31:
+                    op = 0
+                    break
+                record[i] = v
+                i += 1
+            if op and (len(d) != len(int_attrs) + len(obj_attrs) or
+                       not all(attr in d for attr in obj_attrs)):
+                # an instance with other attributes
+                op = 0
+            if op:
+                for attr in obj_attrs:
+                    record[i] = len(objects)
+                    objects.append(d[attr])
+                    i += 1
+        if not op:
+            record = [0, len(objects)] + [0] * (self.RECORD_SIZE - 2)
+            objects.append(am)
+        records.extend(record)
+
+    def _unpack(self, r):
+        record = self._records[r*self.RECORD_SIZE:(r+1)*self.RECORD_SIZE]
+        cls, int_attrs, obj_attrs = _PACKED_MOVES[record[0]]
+        if cls is None:
+            return self._objects[record[1]]
+        am = cls.__new__(cls)
+        d = am.__dict__
+        i = 1
+        for attr in int_attrs:
+            d[attr] = record[i]
+            i += 1
+        for attr in obj_attrs:
+            d[attr] = self._objects[record[i]]
+            i += 1
+        return am
+
+    # saved games store the arrays as little-endian bytes
+
+    def __getstate__(self):
+        arrays = [array('i', a) for a in
+                  (self._records, self._moves, self._move_objects)]
+        if sys.byteorder == 'big':
+            for a in arrays:
+                a.byteswap()
+        return {
+            'records': arrays[0].tobytes(),
+            'moves': arrays[1].tobytes(),
+            'move_objects': arrays[2].tobytes(),
+            'objects': self._objects,
+        }
+
+    def __setstate__(self, state):
+        arrays = []
+        for key in ('records', 'moves', 'move_objects'):
+            a = array('i')
+            a.frombytes(state[key])
+            if sys.byteorder == 'big':
+                a.byteswap()
+            arrays.append(a)
+        self._records, self._moves, self._move_objects = arrays
+        self._objects = state['objects']
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+# Copyright (C) 1998-2003 Markus Franz Xaver Johannes Oberhumer
+# Copyright (C) 2003 Mt. Hood Playing Card Co.
+# Copyright (C) 2005-2009 Skomoroh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from pysollib.headless import HeadlessApp, HeadlessImages
+from pysollib.mfxutil import Image, ImageDraw, print_err
+from pysollib.pysolrandom import PysolRandom
+
+from six.moves import queue
+
+if Image:
+    from PIL.PngImagePlugin import PngInfo
+
+# ************************************************************************
+# * Pictures of dealt games for the preview of the select game dialog.
+# *
+# * A picture is keyed by (game id, cardset, width, height). It is drawn
+# * with PIL from a headless game (see headless.py) in a background
+# * thread, so browsing the games never constructs a game on the canvas.
+# * The pictures are kept in memory and as PNG files (with the seed of
+# * the deal) in a directory; the least recently used files are removed.
+# ************************************************************************
+
+
+class PreviewCache:
+    MAX_MEMORY = 64
+    MAX_FILES = 500
+
+    def __init__(self, dirname):
+        self.dirname = dirname
+        self._memory = OrderedDict()    # key: (image, seed)
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._thread = None
+        self._saved = 0
+
+    def getKey(self, gi, cardset, width, height):
+        return (gi.id, cardset.ident, width, height)
+
+    def _filename(self, key):
+        gameid, ident, width, height = key
+        ident = hashlib.md5(ident.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(
+            self.dirname, '%d-%s-%dx%d.png' % (gameid, ident, width, height))
+
+    def get(self, key):
+        # returns (PIL image, seed) or None
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+        filename = self._filename(key)
+        try:
+            image = Image.open(filename)
+            image.load()
+            seed = int(image.info['seed'])
+            os.utime(filename, None)
+        except Exception:
+            return None
+        self._remember(key, image, seed)
+        return image, seed
+
+    def _remember(self, key, image, seed):
+        with self._lock:
+            self._memory[key] = (image, seed)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.MAX_MEMORY:
+                self._memory.popitem(last=False)
+
+    def request(self, key, gi, cardset):
+        # render the picture in the background; get() returns it when
+        # it is ready
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+        self._queue.put((key, gi, cardset))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def isPending(self, key):
+        with self._lock:
+            return key in self._pending
+
+    def _run(self):
+        app = HeadlessApp()
+        faces = {}
+        while True:
+            key, gi, cardset = self._queue.get()
+            try:
+                seed = PysolRandom().initial_seed
+                image = renderPreview(app, gi, cardset, key[2], key[3],
+                                      seed, faces)
+                self._remember(key, image, seed)
+                self._save(key, image, seed)
+            except Exception as ex:
+                print_err('preview of game %d: %r' % (gi.id, ex))
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+
+    def _save(self, key, image, seed):
+        if not os.path.isdir(self.dirname):
+            os.makedirs(self.dirname)
+        info = PngInfo()
+        info.add_text('seed', str(seed))
+        image.save(self._filename(key), pnginfo=info)
+        self._saved += 1
+        if self._saved % 50 == 1:
+            self._prune()
+
+    def _prune(self):
+        files = []
+        for name in os.listdir(self.dirname):
+            if name.endswith('.png'):
+                filename = os.path.join(self.dirname, name)
+                files.append((os.path.getmtime(filename), filename))
+        files.sort()
+        for mtime, filename in files[:-self.MAX_FILES]:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+
+def _loadFace(cardset, name, size, faces):
+    key = (cardset.dir, name, size)
+    image = faces.get(key)
+    if image is None:
+        image = Image.open(os.path.join(cardset.dir, name)).convert('RGBA')
+        image = image.resize(size, Image.LANCZOS)
+        if len(faces) > 1000:
+            faces.clear()
+        faces[key] = image
+    return image
+
+
+def renderPreview(app, gi, cardset, width, height, seed, faces):
+    # deal the game headlessly with the geometry of the cardset and
+    # paste the cards, scaled to fit into width x height
+    cs = cardset
+    app.images = HeadlessImages(cs.CARDW, cs.CARDH,
+                                cs.CARD_XOFFSET, cs.CARD_YOFFSET)
+    game = app.constructGame(gi.id)
+    try:
+        app.newGame(game, seed)
+        scale = min(1.0, float(width) / max(1, game.width),
+                    float(height) / max(1, game.height))
+        w, h = int(game.width * scale), int(game.height * scale)
+        cw, ch = max(1, int(cs.CARDW * scale)), max(1, int(cs.CARDH * scale))
+        image = Image.new('RGBA', (max(1, w), max(1, h)), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        names = cs.getFaceCardNames()
+        back = cs.backnames[cs.backindex % len(cs.backnames)]
+        for stack in game.allstacks:
+            if not stack.is_visible:
+                continue
+            x, y = int(stack.x * scale), int(stack.y * scale)
+            draw.rectangle((x, y, x + cw - 1, y + ch - 1),
+                           outline=(0, 0, 0, 96))
+            # headless cards are not moved on the canvas, so ask the
+            # stack where they are
+            cards = stack.cards
+            if stack.can_hide_cards:
+                cards = cards[-1:]
+            for card in cards:
+                if card.face_up:
+                    index = card.suit * len(cs.ranks) + card.rank
+                    name = names[index % cs.ncards] + cs.ext
+                else:
+                    name = back
+                face = _loadFace(cs, name, (cw, ch), faces)
+                x, y = stack.getPositionFor(card)
+                image.paste(face, (int(x * scale), int(y * scale)), face)
+        return image
+    finally:
+        game.destruct()
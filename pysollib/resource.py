@@ -25,9 +25,9 @@ import glob
 import os
 import traceback
 
-from pysollib.mfxutil import KwStruct, Struct
+from pysollib.mfxutil import KwStruct, Struct, pickle, unpickle
 from pysollib.mygettext import _
-from pysollib.settings import DEBUG
+from pysollib.settings import DEBUG, VERSION
 
 import six
 
@@ -684,3 +684,63 @@ class Music(Sample):
 
 class MusicManager(SampleManager):
     pass
+
+
+# ************************************************************************
+# * The contents of the resource directories and the parsed cardset
+# * configs, by the modification times of the files they come from, so
+# * that the unchanged directories are not scanned and parsed again at
+# * the next start. Application keeps it in resources.dat in the config
+# * dir, with the version that wrote it.
+# ************************************************************************
+
+class ResourceIndex:
+    def __init__(self):
+        self.changed = False
+        self._entries = {}      # (kind, path): (mtimes, value)
+        self._used = set()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, kind, path, mtimes, func):
+        # the value of (kind, path), computed by func() if mtimes changed
+        key = (kind, path)
+        self._used.add(key)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != mtimes:
+            entry = (mtimes, func())
+            self._entries[key] = entry
+            self.changed = True
+        return entry[1]
+
+    def listdir(self, dirname):
+        # returns (names, names of the regular files); raises
+        # EnvironmentError if dirname does not exist
+        def scan():
+            names = os.listdir(dirname)
+            return names, [n for n in names
+                           if os.path.isfile(os.path.join(dirname, n))]
+        mtimes = (os.stat(dirname).st_mtime,)
+        return self.lookup('dir', dirname, mtimes, scan)
+
+    def load(self, filename):
+        data = unpickle(filename)
+        if not isinstance(data, tuple) or len(data) != 2 or \
+                data[0] != VERSION:
+            # another version may parse the files in another way
+            return
+        entries = data[1]
+        entries.update(self._entries)
+        self._entries = entries
+
+    def save(self, filename):
+        # forget the directories that were not used in this run
+        for key in list(self._entries):
+            if key not in self._used:
+                del self._entries[key]
+                self.changed = True
+        if not self.changed:
+            return
+        pickle((VERSION, self._entries), filename, protocol=-1)
+        self.changed = False
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+# Copyright (C) 1998-2003 Markus Franz Xaver Johannes Oberhumer
+# Copyright (C) 2003 Mt. Hood Playing Card Co.
+# Copyright (C) 2005-2009 Skomoroh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import struct
+
+
+# ************************************************************************
+# * Zobrist hashing of game positions
+# *
+# * Every (stack, position, suit, rank, face_up) combination has a random
+# * 64-bit key and the key of a stack is the xor of the keys of its cards.
+# * A stack caches its key in Stack.snapshot_key; the methods that change
+# * a stack (addCard, insertCard, removeCard and the atomic moves that
+# * flip or reorder cards) reset it to None and it is only recalculated
+# * for those stacks when the next snapshot is taken.
+# * The key of a position (see Game.getSnapshot) is the xor of the keys
+# * of all stacks.
+# ************************************************************************
+
+_MASK64 = (1 << 64) - 1
+_zobrist_keys = {}
+
+
+def _splitmix64(x):
+    # the keys only depend on the index, not on the order they are used in
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def stack_snapshot_key(stack):
+    keys = _zobrist_keys
+    key = 0
+    base = stack.id * 1024
+    for pos, card in enumerate(stack.cards):
+        i = (((base + pos) * 256 + card.suit) * 128 + card.rank) * 2 + \
+            (card.face_up and 1 or 0)
+        k = keys.get(i)
+        if k is None:
+            k = keys[i] = _splitmix64(i)
+        key ^= k
+    return key
+
+
+# ************************************************************************
+# * An ordered set of snapshots with an optional size limit; when the
+# * limit is reached the least recently added snapshot is dropped.
+# * Used for Game.snapshots, Game.failed_snapshots and the demo.
+# ************************************************************************
+
+class SnapshotStore:
+    def __init__(self, snapshots=(), maxlen=None):
+        self.maxlen = maxlen
+        self._snapshots = {}
+        for sn in snapshots:
+            self.add(sn)
+
+    def __contains__(self, sn):
+        return (sn & _MASK64) in self._snapshots
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    def __iter__(self):
+        return iter(self._snapshots)
+
+    def __repr__(self):
+        return '%s(%d snapshots)' % (self.__class__.__name__, len(self))
+
+    # add a snapshot or mark it as the most recent one
+    def add(self, sn):
+        sn &= _MASK64
+        snapshots = self._snapshots
+        if sn in snapshots:
+            del snapshots[sn]
+        elif self.maxlen is not None and len(snapshots) >= self.maxlen:
+            del snapshots[next(iter(snapshots))]
+        snapshots[sn] = None
+    append = add
+
+    def clear(self):
+        self._snapshots.clear()
+
+    # 8 bytes per snapshot, oldest first
+    def tobytes(self):
+        return struct.pack('<%dQ' % len(self._snapshots), *self._snapshots)
+
+    @classmethod
+    def frombytes(cls, data, maxlen=None):
+        n = len(data) // 8
+        return cls(struct.unpack('<%dQ' % n, data[:n*8]), maxlen=maxlen)
@@ -181,6 +181,8 @@ class Stack:
         model.id = id
         model.game = game
         model.cards = []
+        # cached Zobrist key of the cards (see pysollib.snapshot)
+        model.snapshot_key = None
         #
         model.is_filled = False
 
@@ -222,6 +224,8 @@ class Stack:
         view.INIT_CARD_OFFSETS = (0, 0)
         view.INIT_CARD_YOFFSET = 0      # for reallocateCards
         view.group = MfxCanvasGroup(view.canvas)
+        # no view work at all (see Game.createHeadless)
+        view.headless = False
 
         if (TOOLKIT == 'kivy'):
             if hasattr(view.group, 'stack'):
@@ -259,6 +263,8 @@ class Stack:
         view.max_shadow_cards = -1
         view.current_cursor = ''
         view.cursor_changed = False
+        # (card, face_up) of the cards at the last refreshView()
+        view.refreshed_cards = ()
 
     def destruct(self):
         # help breaking circular references
@@ -266,7 +272,7 @@ class Stack:
 
     def prepareStack(self):
         self.prepareView()
-        if self.is_visible:
+        if self.is_visible and not self.headless:
             self.initBindings()
 
     def _calcMouseBind(self, binding_format):
@@ -394,6 +400,10 @@ class Stack:
     def addCard(self, card, unhide=1, update=1):
         model, view = self, self
         model.cards.append(card)
+        model.snapshot_key = None
+        if view.headless:
+            self.closeStack()
+            return card
         card.tkraise(unhide=unhide)
         if view.can_hide_cards and len(model.cards) >= 3:
             # we only need to display the 2 top cards
@@ -408,6 +418,10 @@ class Stack:
     def insertCard(self, card, position, unhide=1, update=1):
         model, view = self, self
         model.cards.insert(position, card)
+        model.snapshot_key = None
+        if view.headless:
+            self.closeStack()
+            return card
         for c in model.cards[position:]:
             c.tkraise(unhide=unhide)
         if (view.can_hide_cards and len(model.cards) >= 3 and
@@ -415,8 +429,7 @@ class Stack:
             # we only need to display the 2 top cards
             model.cards[-3].hide(self)
         card.item.addtag(view.group)
-        for c in model.cards[position:]:
-            view._position(c)
+        view._positionCards(position)
         if update:
             view.updateText()
         self.closeStack()
@@ -426,6 +439,14 @@ class Stack:
     def removeCard(self, card=None, unhide=1, update=1, update_positions=0):
         model, view = self, self
         assert len(model.cards) > 0
+        model.snapshot_key = None
+        if view.headless:
+            if card is None:
+                card = model.cards.pop()
+            else:
+                model.cards.remove(card)
+            self.is_filled = False
+            return card
         if card is None:
             card = model.cards[-1]
             # optimized a little bit (compare with the else below)
@@ -447,8 +468,7 @@ class Stack:
             card_index = model.cards.index(card)
             model.cards.remove(card)
             if update_positions:
-                for c in model.cards[card_index:]:
-                    view._position(c)
+                view._positionCards(card_index)
 
         if update:
             view.updateText()
@@ -477,6 +497,22 @@ class Stack:
         x, y = self.getPositionFor(card)
         card.moveTo(x, y)
 
+    # Position the cards from index first on {view}. The positions are
+    # computed in one pass over the stack, and the cards which are at
+    # their position are not moved.
+    def _positionCards(self, first=0):
+        if (type(self)._position is not Stack._position or
+                type(self).getPositionFor is not Stack.getPositionFor):
+            for c in self.cards[first:]:
+                self._position(c)
+            return
+        positions = self._getPositions()
+        for i in range(first, len(self.cards)):
+            c = self.cards[i]
+            x, y = positions[i]
+            if c.x != x or c.y != y:
+                c.moveTo(x, y)
+
     # find card
     def _findCard(self, event):
         model, view = self, self
@@ -492,13 +528,12 @@ class Stack:
             cards = model.cards
         images = self.game.app.images
         cw, ch = images.getSize()
-        index = -1
-        for i in range(len(cards)):
+        # the topmost card wins
+        for i in range(len(cards) - 1, -1, -1):
             c = cards[i]
-            r = (c.x, c.y, c.x + cw, c.y + ch)
-            if r[0] <= x < r[2] and r[1] <= y < r[3]:
-                index = i
-        return index
+            if c.x <= x < c.x + cw and c.y <= y < c.y + ch:
+                return i
+        return -1
 
     # generic model update (can be used for undo/redo - see move.py)
     def updateModel(self, undo, flags):
@@ -701,6 +736,27 @@ class Stack:
             iy = (iy + 1) % ly
         return int(x), int(y)
 
+    # the positions of all the cards, see getPositionFor()
+    def _getPositions(self):
+        model, view = self, self
+        x, y = view.x, view.y
+        if view.can_hide_cards:
+            return [(x, y)] * len(model.cards)
+        positions = []
+        ix, iy, lx, ly = 0, 0, len(view.CARD_XOFFSET), len(view.CARD_YOFFSET)
+        d = self.shrink_face_down
+        for c in model.cards:
+            positions.append((int(x), int(y)))
+            if c.face_up:
+                x += self.CARD_XOFFSET[ix]
+                y += self.CARD_YOFFSET[iy]
+            else:
+                x += self.CARD_XOFFSET[ix]//d
+                y += self.CARD_YOFFSET[iy]//d
+            ix = (ix + 1) % lx
+            iy = (iy + 1) % ly
+        return positions
+
     def getPositionForNextCard(self):
         model, view = self, self
         x, y = view.x, view.y
@@ -731,11 +787,13 @@ class Stack:
 
     # Fully update the view of a stack - updates
     # hiding, card positions and stacking order.
-    # Avoid calling this as it is rather slow.
+    # The stacking order is updated from the first card that changed
+    # (or was flipped) since the last refresh, and only the cards which
+    # are not at their position are moved.
     def refreshView(self):
         model, view = self, self
         cards = model.cards
-        if not view.is_visible or len(cards) < 2:
+        if not view.is_visible or view.headless or len(cards) < 2:
             return
         if view.can_hide_cards:
             # hide all lower cards
@@ -747,27 +805,25 @@ class Stack:
                 # print "refresh unhide 1", c, c.hide_stack
                 c.unhide()
                 # print "refresh unhide 1", c, c.hide_stack
-        # update the card postions and stacking order
-        item = cards[0].item
-        x, y = view.x, view.y
-        ix, iy, lx, ly = 0, 0, len(view.CARD_XOFFSET), len(view.CARD_YOFFSET)
-        for c in cards[1:]:
-            c.item.tkraise(item)
-            item = c.item
-            if not view.can_hide_cards:
-                d = self.shrink_face_down
-                if c.face_up:
-                    x += self.CARD_XOFFSET[ix]
-                    y += self.CARD_YOFFSET[iy]
-                else:
-                    x += int(self.CARD_XOFFSET[ix]/d)
-                    y += int(self.CARD_YOFFSET[iy]/d)
-                ix = (ix + 1) % lx
-                iy = (iy + 1) % ly
-                c.moveTo(x, y)
+        # update the stacking order
+        refreshed = [(c, c.face_up) for c in cards]
+        old = view.refreshed_cards
+        first, n = 0, min(len(old), len(cards))
+        while first < n and old[first] == refreshed[first]:
+            first += 1
+        for i in range(max(1, first), len(cards)):
+            cards[i].item.tkraise(cards[i-1].item)
+        view.refreshed_cards = refreshed
+        # update the card postions
+        if not view.can_hide_cards:
+            positions = self._getPositions()
+            for c, (x, y) in zip(cards, positions):
+                if c.x != x or c.y != y:
+                    c.moveTo(x, y)
 
     def updateText(self):
-        if self.game.preview > 1 or self.texts.ncards is None:
+        if (self.game.preview > 1 or self.headless or
+                self.texts.ncards is None):
             return
         t = ""
         format = "%d"
@@ -792,9 +848,10 @@ class Stack:
 
     def updatePositions(self):
         # compact the stack when a cards goes off screen
+        if self.headless:
+            return
         if self.reallocateCards():
-            for c in self.cards:
-                self._position(c)
+            self._positionCards()
 
     def reallocateCards(self):
         # change CARD_YOFFSET if a cards is off-screen
@@ -838,7 +895,8 @@ class Stack:
             if dy < yoffset:
                 # print 'compact:', dy
                 self.CARD_YOFFSET = (dy,)
-            return True
+                return True
+            return False
         elif stack_height < height:
             # expande stack
             if self.CARD_YOFFSET == self.INIT_CARD_YOFFSET:
@@ -846,6 +904,8 @@ class Stack:
             n = num_face_down // self.shrink_face_down + num_face_up
             dy = float(height - self.y - cardh) / n
             dy = min(dy, self.INIT_CARD_YOFFSET[0])
+            if dy == yoffset:
+                return False
             # print 'expande:', dy
             self.CARD_YOFFSET = (dy,)
             return True
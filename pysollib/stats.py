@@ -45,7 +45,7 @@ class PysolStatsFormatter:
                 _('Avg. win moves'),
                 _("% won"))
 
-    def getStatResults(self, player, sort_by='name'):
+    def getSortedGames(self, player, sort_by='name'):
         app = self.app
         #
         sort_functions = {
@@ -58,10 +58,15 @@ class PysolStatsFormatter:
             'percent': app.getGamesIdSortedByPercent,
             }
         sort_func = sort_functions[sort_by]
-        g = sort_func(player=player)
+        return sort_func(player=player)
+
+    def getStatResults(self, player, sort_by='name'):
+        app = self.app
+        g = self.getSortedGames(player, sort_by)
+        index = app.getStatsIndex(player)
         t_won, tlost, tgames, ttime, tmoves = 0, 0, 0, 0, 0
         for id in g:
-            won, lost, time, moves = app.stats.getFullStats(player, id)
+            won, lost, time, moves = index.getFullStats(id)
             tot = won + lost
             if tot > 0 or id == app.game.id:
                 # yield only played games
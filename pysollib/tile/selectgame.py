@@ -24,11 +24,13 @@
 import os
 
 from pysollib.gamedb import GI
-from pysollib.mfxutil import KwStruct, Struct, destruct
+from pysollib.mfxutil import ImageTk, KwStruct, Struct, destruct
 from pysollib.mfxutil import format_time
 from pysollib.mygettext import _
+from pysollib.pysolrandom import construct_random
 from pysollib.resource import CSI
 from pysollib.ui.tktile.selecttree import SelectDialogTreeData
+from pysollib.ui.tktile.tkcanvas import MfxCanvasImage
 from pysollib.ui.tktile.tkutil import bind, unbind_destroy
 
 from six.moves import UserList
@@ -126,13 +128,15 @@ class SelectGameData(SelectDialogTreeData):
         if g[5]:
             s_mahjongg = g[5]
         #
+        index = app.gdb.getSearchIndex()
         s_by_compatibility, gg = None, []
         for name, games in GI.GAMES_BY_COMPATIBILITY:
+            games = index.compatibility.get(name)
+            if not games:
+                continue
+
             def select_func(gi, games=games):
                 return gi.id in games
-            if name is None or not list(filter(
-                    select_func, self.all_games_gi)):
-                continue
             gg.append(SelectGameNode(None, name, select_func))
         if 1 and gg:
             s_by_compatibility = SelectGameNode(None, _("by Compatibility"),
@@ -140,11 +144,12 @@ class SelectGameData(SelectDialogTreeData):
         #
         s_by_pysol_version, gg = None, []
         for name, games in GI.GAMES_BY_PYSOL_VERSION:
+            games = index.versions.get(name)
+            if not games:
+                continue
+
             def select_func(gi, games=games):
                 return gi.id in games
-            if name is None or not list(filter(
-                    select_func, self.all_games_gi)):
-                continue
             name = _("New games in v. %(version)s") % {'version': name}
             gg.append(SelectGameNode(None, name, select_func))
         if 1 and gg:
@@ -152,11 +157,12 @@ class SelectGameData(SelectDialogTreeData):
                                                 tuple(gg))
         s_by_inventors, gg = None, []
         for name, games in GI.GAMES_BY_INVENTORS:
+            games = index.inventors.get(name)
+            if not games:
+                continue
+
             def select_func(gi, games=games):
                 return gi.id in games
-            if name is None or not list(filter(
-                    select_func, self.all_games_gi)):
-                continue
             gg.append(SelectGameNode(None, name, select_func))
         if 1 and gg:
             s_by_inventors = SelectGameNode(None, _("by Inventors"),
@@ -483,6 +489,8 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         self.preview_key = -1
         self.preview_game = None
         self.preview_app = None
+        self.thumbnail_timer = None
+        self.loading_cardset = None     # see pollCardset()
         self.updatePreview(gameid, animations=0)
         # focus = self.tree.frame
         self.mainloop(focus, kw.timeout, geometry=geometry)
@@ -496,6 +504,10 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         return SelectGameDialog.initKw(self, kw)
 
     def destroy(self):
+        if self.thumbnail_timer:
+            self.top.after_cancel(self.thumbnail_timer)
+            self.thumbnail_timer = None
+        self.cancelCardsetLoading()
         self.deletePreview(destroy=1)
         self.preview.unbind_all()
         SelectGameDialog.destroy(self)
@@ -533,119 +545,56 @@ class SelectGameDialogWithPreview(SelectGameDialog):
     def performSearch(self):
         self.list.delete(0, "end")
         self.list.vbar_show = True
-        games = self.app.gdb.getAllGames()
-
-        results = []
-        for game in games:
-            if (self.criteria.category != "" and
-                    self.criteria.categoryOptions[self.criteria.category]
-                    != game.category):
-                continue
-            if (self.criteria.type != ""
-                    and self.criteria.typeOptions[self.criteria.type]
-                    != game.si.game_type):
-                continue
-            if (self.criteria.skill != ""
-                    and self.criteria.skillOptions[self.criteria.skill]
-                    != game.skill_level):
-                continue
-            if (self.criteria.decks != ""
-                    and self.criteria.deckOptions[self.criteria.decks]
-                    != game.decks):
-                continue
-            if (self.criteria.redeals != "" and
-                    self.criteria.redeals != "Other number of redeals"
-                    and self.criteria.redealOptions[self.criteria.redeals]
-                    != game.redeals):
-                continue
-            if self.criteria.redeals == "Other number of redeals"\
-                    and game.redeals < 4:
-                continue
-
-            compat_okay = True
-            for name, games in GI.GAMES_BY_COMPATIBILITY:
-                if self.criteria.compat == name:
-                    if game.id not in games:
-                        compat_okay = False
-                        break
-
-            if not compat_okay:
-                continue
-
-            invent_okay = True
-            for name, games in GI.GAMES_BY_INVENTORS:
-                if self.criteria.inventor == name:
-                    if game.id not in games:
-                        invent_okay = False
-                        break
-
-            if not invent_okay:
-                continue
-
-            if self.criteria.version != "":
-                version_okay = False
-                version_found = False
-                for name, games in GI.GAMES_BY_PYSOL_VERSION:
-                    if self.criteria.version == name:
-                        version_found = True
-                        if game.id in games:
-                            version_okay = True
-                            break
-                    elif ((not version_found and
-                           self.criteria.versioncompare == "Present in")
-                          or (version_found and
-                              self.criteria.versioncompare == "New since")):
-                        if game.id in games:
-                            version_okay = True
-                            break
-
-                if not version_okay:
-                    continue
-
-            if self.criteria.statistics != '':
+        criteria = self.criteria
+        index = self.app.gdb.getSearchIndex()
+
+        kw = {}
+        if criteria.category != "":
+            kw['category'] = criteria.categoryOptions[criteria.category]
+        if criteria.type != "":
+            kw['game_type'] = criteria.typeOptions[criteria.type]
+        if criteria.skill != "":
+            kw['skill_level'] = criteria.skillOptions[criteria.skill]
+        if criteria.decks != "":
+            kw['decks'] = criteria.deckOptions[criteria.decks]
+        if criteria.redeals == "Other number of redeals":
+            kw['min_redeals'] = 4
+        elif criteria.redeals != "":
+            kw['redeals'] = criteria.redealOptions[criteria.redeals]
+        if criteria.version != "":
+            kw['version'] = criteria.version
+            kw['version_compare'] = criteria.versioncompare
+        flags = 0
+        for option, flag in ((criteria.popular, GI.GT_POPULAR),
+                             (criteria.children, GI.GT_CHILDREN),
+                             (criteria.scoring, GI.GT_SCORE),
+                             (criteria.stripped, GI.GT_STRIPPED),
+                             (criteria.separate, GI.GT_SEPARATE_DECKS),
+                             (criteria.open, GI.GT_OPEN),
+                             (criteria.relaxed, GI.GT_RELAXED),
+                             (criteria.original, GI.GT_ORIGINAL)):
+            if option:
+                flags |= flag
+        games = index.select(compatibility=criteria.compat,
+                             inventor=criteria.inventor, flags=flags, **kw)
+
+        if criteria.statistics != '':
+            statoption = criteria.statisticsOptions[criteria.statistics]
+            for gameid in list(games):
                 won, lost = (self.app.stats.getStats
-                             (self.app.opt.player, game.id))
-                statoption = \
-                    self.criteria.statisticsOptions[self.criteria.statistics]
+                             (self.app.opt.player, gameid))
                 if statoption == 'played' and won + lost == 0:
-                    continue
+                    games.discard(gameid)
                 elif statoption == 'won' and won == 0:
-                    continue
+                    games.discard(gameid)
                 elif statoption == 'not won' and (won != 0 or lost == 0):
-                    continue
+                    games.discard(gameid)
                 elif statoption == 'not played' and won + lost != 0:
-                    continue
-
-            if (self.criteria.popular and
-                    not (game.si.game_flags & GI.GT_POPULAR)):
-                continue
-            if (self.criteria.children and
-                    not (game.si.game_flags & GI.GT_CHILDREN)):
-                continue
-            if (self.criteria.scoring and
-                    not (game.si.game_flags & GI.GT_SCORE)):
-                continue
-            if (self.criteria.stripped and
-                    not (game.si.game_flags & GI.GT_STRIPPED)):
-                continue
-            if (self.criteria.separate and
-                    not (game.si.game_flags & GI.GT_SEPARATE_DECKS)):
-                continue
-            if (self.criteria.open and not (game.si.game_flags & GI.GT_OPEN)):
-                continue
-            if (self.criteria.relaxed and
-                    not (game.si.game_flags & GI.GT_RELAXED)):
-                continue
-            if (self.criteria.original and
-                    not (game.si.game_flags & GI.GT_ORIGINAL)):
-                continue
+                    games.discard(gameid)
 
-            if self.app.checkSearchString(self.criteria.name, game.name):
-                results.append(game.name)
-            if self.criteria.usealt:
-                for altname in game.altnames:
-                    if self.app.checkSearchString(self.criteria.name, altname):
-                        results.append(altname)
+        results = [name for name, gameid, altname
+                   in index.searchNames(criteria.name, criteria.usealt)
+                   if gameid in games]
         results.sort(key=lambda x: x.lower())
         pos = 0
         for result in results:
@@ -699,6 +648,95 @@ class SelectGameDialogWithPreview(SelectGameDialog):
     def updatePreview(self, gameid, animations=10):
         if gameid == self.preview_key:
             return
+        gi = self.app.gdb.get(gameid)
+        self.cancelCardsetLoading(keep=gi and self.getPreviewCardset(gi))
+        if gameid != self.gameid and self.showThumbnail(gameid):
+            return
+        self.dealPreview(gameid, animations)
+
+    def getPreviewCardset(self, gi):
+        cardset = self.app.cardset_manager.getByName(
+            self.app.opt.cardset[gi.category][gi.subcategory][0])
+        return cardset or self.app.cardset
+
+    def showThumbnail(self, gameid):
+        # show the cached picture of a deal instead of dealing a preview
+        # game; a missing picture is rendered in the background (see
+        # previewcache.py) and shown by pollThumbnail()
+        cache = self.app.preview_cache
+        gi = self.app.gdb.get(gameid)
+        if cache is None or not gi:
+            return False
+        canvas = self.preview.canvas
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            # not mapped yet
+            return False
+        cardset = self.getPreviewCardset(gi)
+        key = cache.getKey(gi, cardset, width, height)
+        entry = cache.get(key)
+        self.deletePreview()
+        if entry is None:
+            cache.request(key, gi, cardset)
+            self.random = None
+            if self.thumbnail_timer:
+                self.top.after_cancel(self.thumbnail_timer)
+            self.thumbnail_timer = self.top.after(
+                100, self.pollThumbnail, gameid, key)
+        else:
+            image, seed = entry
+            MfxCanvasImage(canvas, 0, 0, image=ImageTk.PhotoImage(image),
+                           anchor='nw')
+            canvas.config(scrollregion=(0, 0) + image.size)
+            canvas.xview_moveto(0)
+            canvas.yview_moveto(0)
+            self.random = construct_random(str(seed))
+            self.random.origin = self.random.ORIGIN_PREVIEW
+        self.preview_key = gameid
+        self.updateGameInfo(gameid)
+        return True
+
+    def pollThumbnail(self, gameid, key):
+        self.thumbnail_timer = None
+        if self.preview_key != gameid:
+            # another game was selected meanwhile
+            return
+        cache = self.app.preview_cache
+        if cache.isPending(key):
+            self.thumbnail_timer = self.top.after(
+                100, self.pollThumbnail, gameid, key)
+            return
+        self.preview_key = -1
+        if cache.get(key) is None or not self.showThumbnail(gameid):
+            # the picture could not be rendered
+            self.dealPreview(gameid)
+
+    def pollCardset(self, gameid, cardset):
+        self.thumbnail_timer = None
+        if self.preview_key != gameid:
+            # another game was selected meanwhile
+            self.cancelCardsetLoading()
+            return
+        gi = self.app.gdb.get(gameid)
+        if self.app.loadCardset(cardset, id=gi.category,
+                                tocache=True, noprogress=True, wait=False):
+            self.loading_cardset = None
+            # the same deal with the images of the cardset
+            self.dealPreview(gameid, animations=0, random=self.random)
+        elif self.app.isCardsetLoading(cardset):
+            self.thumbnail_timer = self.top.after(
+                100, self.pollCardset, gameid, cardset)
+        else:
+            self.loading_cardset = None
+
+    def cancelCardsetLoading(self, keep=None):
+        # the images of a cardset that the preview waits for are not
+        # needed any more, unless the next preview uses the cardset too
+        cardset, self.loading_cardset = self.loading_cardset, None
+        if cardset is not None and cardset is not keep:
+            self.app.cardset_loader.discard(cardset)
+
+    def dealPreview(self, gameid, animations=10, random=None):
         self.deletePreview()
         canvas = self.preview.canvas
         #
@@ -738,13 +776,20 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         if c:
             c2 = c.get(gi.subcategory)
         if not c2:
-            cardset = self.app.cardset_manager.getByName(
-                self.app.opt.cardset[gi.category][gi.subcategory][0])
+            cardset = self.getPreviewCardset(gi)
             self.app.loadCardset(cardset, id=gi.category,
-                                 tocache=True, noprogress=True)
+                                 tocache=True, noprogress=True, wait=False)
             c = self.app.cardsets_cache.get(gi.category)
             if c:
                 c2 = c.get(gi.subcategory)
+            if not c2 and self.app.isCardsetLoading(cardset):
+                # deal with the current cardset until the images of the
+                # cardset are decoded, see pollCardset()
+                if self.thumbnail_timer:
+                    self.top.after_cancel(self.thumbnail_timer)
+                self.loading_cardset = cardset
+                self.thumbnail_timer = self.top.after(
+                    100, self.pollCardset, gameid, cardset)
         if c2:
             self.preview_app.images = c2[2]
         else:
@@ -757,16 +802,12 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         if self.preview_game:
             self.preview_game.endGame()
             self.preview_game.destruct()
-        # self.top.wm_title("Select Game - " +
-        #   self.app.getGameTitleName(gameid))
-        title = self.app.getGameTitleName(gameid)
-        self.top.wm_title(_("Select Game - %(game)s") % {'game': title})
-        #
         self.preview_game = gi.gameclass(gi)
         self.preview_game.createPreview(self.preview_app)
         #
-        random = None
-        if gameid == self.gameid:
+        if random is not None:
+            random = random.copy()
+        elif gameid == self.gameid:
             random = self.app.game.random.copy()
         if gameid == self.gameid and self.bookmark:
             self.preview_game.restoreGameFromBookmark(self.bookmark)
@@ -786,6 +827,13 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         self.random = self.preview_game.random.copy()
         self.random.origin = self.random.ORIGIN_PREVIEW
         self.preview_key = gameid
+        self.updateGameInfo(gameid)
+
+    def updateGameInfo(self, gameid):
+        # self.top.wm_title("Select Game - " +
+        #   self.app.getGameTitleName(gameid))
+        title = self.app.getGameTitleName(gameid)
+        self.top.wm_title(_("Select Game - %(game)s") % {'game': title})
         #
         self.updateInfo(gameid)
         #
@@ -472,7 +472,21 @@ class AllGamesFrame(ttk.Frame):
         if self.sort_by == sort_by:
             return
         self.sort_by = sort_by
-        self.fillTreeview(self.player)
+        if self.tree_items:
+            self.sortTreeview(self.player)
+        else:
+            self.fillTreeview(self.player)
+
+    def sortTreeview(self, player):
+        # the rows don't change, only their order (the "Total" row stays
+        # at the end)
+        items = dict((gameid, item) for item, gameid in self.games.items())
+        index = 0
+        for gameid in self.formatter.getSortedGames(player, self.sort_by):
+            item = items.get(gameid)
+            if item is not None:
+                self.tree.move(item, '', index)
+                index += 1
 
     def createHeader(self, player):
         header = self.formatter.getStatHeader()
@@ -483,6 +497,7 @@ class AllGamesFrame(ttk.Frame):
             for item in self.tree.get_children():
                 self.tree.delete(item)
             self.tree_items = []
+            self.games = {}
         self.formatter.writeStats(player, sort_by=self.sort_by)
         if self.dialog.buttons:
             run_button = self.dialog.buttons[0]
@@ -125,13 +125,15 @@ class SelectGameData(SelectDialogTreeData):
         if g[5]:
             s_mahjongg = g[5]
         #
+        index = app.gdb.getSearchIndex()
         s_by_compatibility, gg = None, []
         for name, games in GI.GAMES_BY_COMPATIBILITY:
+            games = index.compatibility.get(name)
+            if not games:
+                continue
+
             def select_func(gi, games=games):
                 return gi.id in games
-            if name is None or not list(filter(
-                    select_func, self.all_games_gi)):
-                continue
             gg.append(SelectGameNode(None, name, select_func))
         if 1 and gg:
             s_by_compatibility = SelectGameNode(None, _("by Compatibility"),
@@ -139,11 +141,12 @@ class SelectGameData(SelectDialogTreeData):
         #
         s_by_pysol_version, gg = None, []
         for name, games in GI.GAMES_BY_PYSOL_VERSION:
+            games = index.versions.get(name)
+            if not games:
+                continue
+
             def select_func(gi, games=games):
                 return gi.id in games
-            if name is None or not list(filter(
-                    select_func, self.all_games_gi)):
-                continue
             name = _("New games in v. %(version)s") % {'version': name}
             gg.append(SelectGameNode(None, name, select_func))
         if 1 and gg:
@@ -151,11 +154,12 @@ class SelectGameData(SelectDialogTreeData):
                                                 tuple(gg))
         s_by_inventors, gg = None, []
         for name, games in GI.GAMES_BY_INVENTORS:
+            games = index.inventors.get(name)
+            if not games:
+                continue
+
             def select_func(gi, games=games):
                 return gi.id in games
-            if name is None or not list(filter(
-                    select_func, self.all_games_gi)):
-                continue
             gg.append(SelectGameNode(None, name, select_func))
         if 1 and gg:
             s_by_inventors = SelectGameNode(None, _("by Inventors"),
@@ -431,6 +435,8 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         self.preview_key = -1
         self.preview_game = None
         self.preview_app = None
+        self.cardset_timer = None
+        self.loading_cardset = None     # see pollCardset()
         self.updatePreview(gameid, animations=0)
         # focus = self.tree.frame
         self.mainloop(focus, kw.timeout)
@@ -444,6 +450,10 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         return SelectGameDialog.initKw(self, kw)
 
     def destroy(self):
+        if self.cardset_timer:
+            self.top.after_cancel(self.cardset_timer)
+            self.cardset_timer = None
+        self.cancelCardsetLoading()
         self.deletePreview(destroy=1)
         self.preview.unbind_all()
         SelectGameDialog.destroy(self)
@@ -471,7 +481,7 @@ class SelectGameDialogWithPreview(SelectGameDialog):
                 destruct(self.preview_app)
             self.preview_app = None
 
-    def updatePreview(self, gameid, animations=10):
+    def updatePreview(self, gameid, animations=10, random=None):
         if gameid == self.preview_key:
             return
         self.deletePreview()
@@ -479,6 +489,7 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         #
         gi = self.app.gdb.get(gameid)
         if not gi:
+            self.cancelCardsetLoading()
             self.preview_key = -1
             return
         #
@@ -512,14 +523,23 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         c2 = None
         if c:
             c2 = c.get(gi.subcategory)
+        cardset = self.app.cardset_manager.getByName(
+            self.app.opt.cardset[gi.category][gi.subcategory][0])
+        self.cancelCardsetLoading(keep=cardset)
         if not c2:
-            cardset = self.app.cardset_manager.getByName(
-                self.app.opt.cardset[gi.category][gi.subcategory][0])
             self.app.loadCardset(cardset, id=gi.category,
-                                 tocache=True, noprogress=True)
+                                 tocache=True, noprogress=True, wait=False)
             c = self.app.cardsets_cache.get(gi.category)
             if c:
                 c2 = c.get(gi.subcategory)
+            if not c2 and self.app.isCardsetLoading(cardset):
+                # deal with the current cardset until the images of the
+                # cardset are decoded, see pollCardset()
+                if self.cardset_timer:
+                    self.top.after_cancel(self.cardset_timer)
+                self.loading_cardset = cardset
+                self.cardset_timer = self.top.after(
+                    100, self.pollCardset, gameid, cardset)
         if c2:
             self.preview_app.images = c2[2]
         else:
@@ -540,8 +560,9 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         self.preview_game = gi.gameclass(gi)
         self.preview_game.createPreview(self.preview_app)
         #
-        random = None
-        if gameid == self.gameid:
+        if random is not None:
+            random = random.copy()
+        elif gameid == self.gameid:
             random = self.app.game.random.copy()
         if gameid == self.gameid and self.bookmark:
             self.preview_game.restoreGameFromBookmark(self.bookmark)
@@ -570,6 +591,32 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         else:
             rules_button.config(state="disabled")
 
+    def pollCardset(self, gameid, cardset):
+        self.cardset_timer = None
+        if self.preview_key != gameid:
+            # another game was selected meanwhile
+            self.cancelCardsetLoading()
+            return
+        gi = self.app.gdb.get(gameid)
+        if self.app.loadCardset(cardset, id=gi.category,
+                                tocache=True, noprogress=True, wait=False):
+            self.loading_cardset = None
+            self.preview_key = -1
+            # the same deal with the images of the cardset
+            self.updatePreview(gameid, animations=0, random=self.random)
+        elif self.app.isCardsetLoading(cardset):
+            self.cardset_timer = self.top.after(
+                100, self.pollCardset, gameid, cardset)
+        else:
+            self.loading_cardset = None
+
+    def cancelCardsetLoading(self, keep=None):
+        # the images of a cardset that the preview waits for are not
+        # needed any more, unless the next preview uses the cardset too
+        cardset, self.loading_cardset = self.loading_cardset, None
+        if cardset is not None and cardset is not keep:
+            self.app.cardset_loader.discard(cardset)
+
     def updateInfo(self, gameid):
         gi = self.app.gdb.get(gameid)
         # info
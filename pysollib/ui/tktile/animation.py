@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------
+#
+# Copyright (C) 1998-2003 Markus Franz Xaver Johannes Oberhumer
+# Copyright (C) 2003 Mt. Hood Playing Card Co.
+# Copyright (C) 2005-2009 Skomoroh
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+
+import time
+import traceback
+
+# ************************************************************************
+# * Animations of the canvas, driven by the Tk event loop.
+# *
+# * All the running animations are stepped by one timer of the
+# * AnimationScheduler; the frame of an animation is computed from the
+# * time since its start, so a slow frame does not slow down the motion.
+# * The canvas is updated once per frame for all the animations.
+# ************************************************************************
+
+
+class Animation:
+    # step(p) is called once per frame with the progress p (0.0 - 1.0),
+    # the last call is step(1.0) and then done(). An animation without a
+    # duration runs until it is cancelled, step gets the seconds since
+    # the start.
+    def __init__(self, step, duration=None, done=None):
+        self.step = step
+        self.duration = duration
+        self.done = done
+        self.start = None
+        self.finished = False
+
+
+class CardsMotion(Animation):
+    # move cards so that cards[0] ends at (x, y); shadows() returns the
+    # shadow items, created in the first frame and moved with the cards
+    def __init__(self, cards, x, y, duration, shadows=None):
+        Animation.__init__(self, self._step, duration)
+        self.cards = cards
+        self.x, self.y = x, y
+        self.x0, self.y0 = cards[0].x, cards[0].y
+        self.shadows = shadows
+        self._shadows = None
+        self._moved = (0, 0)
+
+    def _step(self, p):
+        cards = self.cards
+        if p >= 1.0:
+            # last frame: delete shadows, move cards to final position
+            for s in self._shadows or ():
+                s.delete()
+            dx, dy = self.x - cards[0].x, self.y - cards[0].y
+            for card in cards:
+                card.moveBy(dx, dy)
+            return
+        if self._shadows is None:
+            self._shadows = self.shadows() if self.shadows else ()
+        tx = int(round((self.x - self.x0) * p))
+        ty = int(round((self.y - self.y0) * p))
+        mx, my = tx - self._moved[0], ty - self._moved[1]
+        if mx == 0 and my == 0:
+            return
+        self._moved = (tx, ty)
+        for s in self._shadows:
+            s.move(mx, my)
+        for card in cards:
+            card.moveBy(mx, my)
+
+
+class AnimationScheduler:
+    FRAME = 1.0 / 60                    # seconds per frame
+
+    def __init__(self, widget, clock=time.monotonic):
+        self.widget = widget
+        self.clock = clock
+        self.animations = []
+        self._timer = None
+
+    def start(self, animation):
+        animation.start = self.clock()
+        self.animations.append(animation)
+        if self._timer is None:
+            self._timer = self.widget.after(int(self.FRAME * 1000),
+                                            self._tick)
+        return animation
+
+    def cancel(self, animation):
+        # stop the animation where it is, without the last step
+        if animation in self.animations:
+            self.animations.remove(animation)
+        animation.finished = True
+        if not self.animations and self._timer is not None:
+            self.widget.after_cancel(self._timer)
+            self._timer = None
+
+    def finish(self):
+        # fast-forward: the animations end in the next frame
+        for animation in self.animations:
+            if animation.duration is not None:
+                animation.duration = 0
+
+    def wait(self, *animations):
+        # run the event loop until the animations are finished
+        while not all(a.finished for a in animations):
+            assert self.animations
+            self.widget.tk.dooneevent()
+
+    def _tick(self):
+        self._timer = None
+        now = self.clock()
+        for animation in self.animations[:]:
+            if animation.duration is None:
+                p = now - animation.start
+            elif animation.duration <= 0:
+                p = 1.0
+            else:
+                p = min(1.0, (now - animation.start) / animation.duration)
+            try:
+                animation.step(p)
+            except Exception:
+                traceback.print_exc()
+                p = 1.0
+            if animation.duration is not None and p >= 1.0:
+                self.animations.remove(animation)
+                animation.finished = True
+                if animation.done:
+                    animation.done()
+        self.widget.update_idletasks()
+        if self.animations and self._timer is None:
+            delay = self.FRAME - (self.clock() - now)
+            self._timer = self.widget.after(max(1, int(delay * 1000)),
+                                            self._tick)
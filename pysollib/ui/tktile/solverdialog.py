@@ -1,3 +1,4 @@
+from pysollib.hint import solver_worker
 from pysollib.mygettext import _
 from pysollib.settings import TITLE
 from pysollib.ui.tktile.tkconst import EVENT_HANDLED
@@ -32,6 +33,10 @@ class BaseSolverDialog:
         top_frame, bottom_frame = self.createFrames(kw)
         self.createBitmaps(top_frame, kw)
         self.games = {}                 # key: gamename; value: gameid
+        self.solver_job = None
+        self.poll_timer = None
+        # (board, preset, max_iters) of the last intractable search
+        self.intractable = None
 
         #
         frame = self._calcToolkit().Frame(top_frame)
@@ -134,6 +139,7 @@ class BaseSolverDialog:
         elif button == 2:
             self.app.menubar.mNewGame()
         elif button == 3:
+            self.stopSolving()
             global solver_dialog
             solver_dialog = None
             self.destroy()
@@ -159,11 +165,15 @@ class BaseSolverDialog:
         self.top.update_idletasks()
 
     def reset(self):
+        # the position has changed
+        self.stopSolving()
         self.play_button.config(state='disabled')
 
     def startSolving(self):
-        from pysollib.mygettext import ungettext
-
+        if self.solver_job:
+            # the Start button stops a running search
+            self.stopSolving()
+            return
         self._reset()
         game = self.app.game
         solver = game.Solver_Class(game, self)  # create solver instance
@@ -172,13 +182,60 @@ class BaseSolverDialog:
         max_iters = self._getMaxIters()
         progress = self.app.opt.solver_show_progress
         iters_step = self.app.opt.solver_iterations_output_step
+        board = solver.calcBoardString()
+        if self.intractable and self.intractable[:2] == (board, preset):
+            # Start on the same intractable position extends the search
+            max_iters += self.intractable[2]
+        self.intractable = None
         solver.config(preset=preset, max_iters=max_iters, progress=progress,
                       iters_step=iters_step)
-        try:
-            solver.computeHints()
-        except RuntimeError:
-            self.result_label['text'] = _('Solver not found in the PATH')
+        self.solver_job = solver_worker.submit(solver, board)
+        self.start_button.config(text=_('Stop'))
+        self._pollSolver()
+
+    def stopSolving(self):
+        job = self.solver_job
+        if job is None:
             return
+        job.cancel()
+        self._endSolving()
+        self.result_label['text'] = ''
+
+    def _endSolving(self):
+        self.solver_job = None
+        if self.poll_timer:
+            self.top.after_cancel(self.poll_timer)
+            self.poll_timer = None
+        self.start_button.config(text=_('Start'))
+
+    def _pollSolver(self):
+        self.poll_timer = None
+        job = self.solver_job
+        for event, value in job.events():
+            if event == 'progress':
+                self.setText(**value)
+            elif event == 'error':
+                self._endSolving()
+                if isinstance(value, RuntimeError):
+                    self.result_label['text'] = \
+                        _('Solver not found in the PATH')
+                else:
+                    # raised in the solver_worker thread, there is
+                    # nobody else to tell
+                    self.result_label['text'] = \
+                        _('Solver error: %s') % (value,)
+                return
+            elif event == 'done':
+                self._endSolving()
+                if not job.solver.cached:
+                    job.solver.cacheSuffixes(job.board)
+                self._showResult(job.solver, job.board)
+                return
+        self.poll_timer = self.top.after(100, self._pollSolver)
+
+    def _showResult(self, solver, board):
+        from pysollib.mygettext import ungettext
+
         hints_len = len(solver.hints)-1
         if hints_len > 0:
             if solver.solver_state == 'intractable':
@@ -198,6 +255,9 @@ class BaseSolverDialog:
                  if solver.solver_state == 'unsolved'
                  else _('Iterations count exceeded (Intractable)'))
             self.play_button.config(state='disabled')
+        if solver.solver_state == 'intractable':
+            self.intractable = (board, solver.options['preset'],
+                                solver.options['max_iters'])
 
     def startPlay(self):
         self.play_button.config(state='disabled')
@@ -288,12 +288,12 @@ class MfxCanvas(tkinter.Canvas):
             x = event.x+dx+self.xview()[0]*int(self.cget('width'))
             y = event.y+dy+self.yview()[0]*int(self.cget('height'))
             # x, y = event.x, event.y
-            items = list(self.find_overlapping(x, y, x, y))
-            items.reverse()
-            for item in items:
-                for i in range(len(stack.cards)):
-                    if stack.cards[i].item.id == item:
-                        return i
+            # the topmost item of a card in the stack
+            ids = dict((c.item.id, i) for i, c in enumerate(stack.cards))
+            for item in reversed(self.find_overlapping(x, y, x, y)):
+                i = ids.get(item)
+                if i is not None:
+                    return i
         return -1
 
     def setTextColor(self, color):
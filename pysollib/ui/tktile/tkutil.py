@@ -252,17 +252,7 @@ if Image:
         def __init__(self, file=None, image=None, pil_image_orig=None):
 
             if file:
-                image = Image.open(file).convert('RGBA')
-
-                basename = os.path.basename(file)
-                file_name = os.path.splitext(basename)[0]
-
-                findsum = findfile(file_name)
-
-                if findsum != -3:  # -1 for every check
-                    image = masking(image)
-
-                    image.filename = file_name
+                image = decodeImage(file)
 
             ImageTk.PhotoImage.__init__(self, image)
             self._pil_image = image
@@ -310,6 +300,23 @@ if Image:
             return PIL_Image(image=im, pil_image_orig=self._pil_image_orig)
 
 
+def decodeImage(file):
+    # the PIL image of PIL_Image(file); does not need Tk, so the images
+    # of a cardset can be decoded in other threads (see cardsetloader.py)
+    image = Image.open(file).convert('RGBA')
+
+    basename = os.path.basename(file)
+    file_name = os.path.splitext(basename)[0]
+
+    findsum = findfile(file_name)
+
+    if findsum != -3:  # -1 for every check
+        image = masking(image)
+
+        image.filename = file_name
+    return image
+
+
 def masking(image):
 
     # eliminates the 0 in alphachannel
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- mode: python; coding: utf-8; -*-
+#
+# Deal and autoplay every game headlessly and report the throughput of
+# dealing, hint calculation and moves per game.
+#
+# Usage:
+#   PYTHONPATH=. python3 scripts/benchmark_games.py [--seeds N] [id ...]
+#
+
+import argparse
+import sys
+import time
+
+import pysollib.games
+import pysollib.games.mahjongg
+import pysollib.games.special
+import pysollib.games.ultra  # noqa: F401
+from pysollib.gamedb import GAME_DB
+from pysollib.headless import HeadlessApp
+
+
+def _rate(count, secs):
+    if secs <= 0:
+        return 0.0
+    return count / secs
+
+
+def benchmark_game(app, id, seeds, level=2, max_moves=500):
+    game = app.constructGame(id)
+    # count the hint calculations of showHint()
+    hint_calls = [0]
+    get_hints = game.getHints
+
+    def counting_get_hints(*args, **kw):
+        hint_calls[0] += 1
+        return get_hints(*args, **kw)
+    game.getHints = counting_get_hints
+
+    deal_time = play_time = 0.0
+    moves = won = 0
+    for seed in seeds:
+        t = time.perf_counter()
+        app.newGame(game, seed)     # shuffle, startGame and _autoPlay
+        deal_time += time.perf_counter() - t
+        t = time.perf_counter()
+        if app.playDemo(game, level=level, max_moves=max_moves):
+            won += 1
+        play_time += time.perf_counter() - t
+        moves += game.moves.index
+    game.destruct()
+    return {
+        'deals': _rate(len(seeds), deal_time),
+        'hints': _rate(hint_calls[0], play_time),
+        'moves': _rate(moves, play_time),
+        'won': won,
+        'time': deal_time + play_time,
+    }
+
+
+def main(args):
+    parser = argparse.ArgumentParser(
+        description='Deal and autoplay games without a GUI and report '
+        'deals/sec, hint calls/sec and moves/sec per game.')
+    parser.add_argument('ids', metavar='id', type=int, nargs='*',
+                        help='game ids (default: all games)')
+    parser.add_argument('--seeds', type=int, default=5,
+                        help='number of deals per game (default: 5)')
+    parser.add_argument('--first-seed', type=int, default=1)
+    parser.add_argument('--level', type=int, default=2,
+                        help='hint level of the demo (default: 2)')
+    parser.add_argument('--max-moves', type=int, default=500,
+                        help='give up a deal after this many moves')
+    parser.add_argument('--sort', choices=('id', 'deals', 'hints', 'moves',
+                                           'time'),
+                        default='id', help='sort the table by this column')
+    opts = parser.parse_args(args)
+
+    ids = opts.ids or GAME_DB.getGamesIdSortedById()
+    seeds = range(opts.first_seed, opts.first_seed + opts.seeds)
+    app = HeadlessApp()
+    results, errors = [], []
+    for id in ids:
+        gi = GAME_DB.get(id)
+        if gi is None:
+            errors.append((id, '?', 'unknown game'))
+            continue
+        try:
+            r = benchmark_game(app, id, seeds, level=opts.level,
+                               max_moves=opts.max_moves)
+        except Exception as ex:
+            errors.append((id, gi.name, repr(ex)))
+            continue
+        r['id'], r['name'] = id, gi.name
+        results.append(r)
+
+    if opts.sort == 'id':
+        results.sort(key=lambda r: r['id'])
+    elif opts.sort == 'time':
+        results.sort(key=lambda r: r['time'], reverse=True)
+    else:
+        # slowest first
+        results.sort(key=lambda r: r[opts.sort])
+
+    print('%6s  %-32s %10s %10s %10s %5s' %
+          ('id', 'name', 'deals/s', 'hints/s', 'moves/s', 'won'))
+    for r in results:
+        print('%6d  %-32.32s %10.1f %10.1f %10.1f %5d' %
+              (r['id'], r['name'], r['deals'], r['hints'], r['moves'],
+               r['won']))
+    total = sum(r['time'] for r in results)
+    print('%d games, %d deals each, %.1f sec' %
+          (len(results), len(seeds), total))
+    for id, name, err in errors:
+        print('ERROR %6d  %s: %s' % (id, name, err), file=sys.stderr)
+    return int(bool(errors))
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- mode: python; coding: utf-8; -*-
+#
+# Write the manifest of the games in pysollib.games (see
+# GameManager.loadManifest), so that the game modules are imported only
+# when their games are used. The manifest is checked against the
+# sources of the game modules at startup; regenerate it after changing
+# them.
+#
+# Usage:
+#   PYTHONPATH=. python3 scripts/gen_games_manifest.py [data/games.json]
+#
+
+import sys
+
+import pysollib.settings
+# the names in the manifest are translated when it is loaded
+pysollib.settings.TRANSLATE_GAME_NAMES = False
+
+import pysollib.games  # noqa: E402,I100,I202
+import pysollib.games.mahjongg  # noqa: E402
+import pysollib.games.special  # noqa: E402
+import pysollib.games.ultra  # noqa: E402,F401
+from pysollib.gamedb import GAME_DB, GameManager  # noqa: E402
+
+
+def main(args):
+    filename = args[0] if args else 'data/games.json'
+    GAME_DB.writeManifest(filename)
+    # check that the games of the manifest equal the registered ones
+    gdb = GameManager()
+    if not gdb.loadManifest(filename):
+        print('%s: the manifest could not be loaded' % filename)
+        return 1
+    bad = 0
+    for id in GAME_DB.getGamesIdSortedById():
+        gi, gi2 = GAME_DB.get(id), gdb.get(id)
+        d1, d2 = dict(gi.__dict__), dict(gi2.__dict__)
+        for d in (d1, d2):
+            del d['gameclass'], d['module']
+            d['si'] = d['si'].__dict__
+        if d1 != d2:
+            print('%d %s: %r != %r' % (id, gi.name, d1, d2))
+            bad += 1
+    if bad:
+        return 1
+    print('%s: %d games' % (filename, len(gdb.getAllGames())))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- mode: python; coding: utf-8; -*-
+#
+# Deal a range of seeds of a game headlessly and run the game's solver
+# (FreeCell Solver or Black Hole Solver) on each deal in a pool of
+# processes, to find out which deals are winnable.
+#
+# Usage:
+#   PYTHONPATH=. python3 scripts/solver_survey.py [--seeds N] [-j N] id
+#
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pysollib.games
+import pysollib.games.mahjongg
+import pysollib.games.special
+import pysollib.games.ultra  # noqa: F401
+from pysollib.gamedb import GAME_DB
+from pysollib.headless import HeadlessApp
+
+# one app and game per worker process, the seeds are dealt in turn
+_app = None
+_games = {}
+
+
+class _Progress:
+    # stands in for the solver dialog and keeps the last counters
+    def __init__(self):
+        self.iter = self.states = 0
+
+    def setText(self, **kw):
+        if kw.get('iter'):
+            self.iter = kw['iter']
+        if kw.get('states'):
+            self.states = kw['states']
+
+
+def solve_deal(id, seed, max_iters, preset):
+    global _app
+    if _app is None:
+        _app = HeadlessApp()
+    game = _games.get(id)
+    if game is None:
+        game = _games[id] = _app.constructGame(id)
+    _app.newGame(game, seed)
+    progress = _Progress()
+    solver = game.Solver_Class(game, progress)
+    solver.config(max_iters=max_iters, preset=preset)
+    t = time.perf_counter()
+    # solveBoard() does not look at the solver_cache, so every deal is
+    # really solved
+    solver.solveBoard(solver.calcBoardString())
+    return {
+        'seed': seed,
+        'state': solver.solver_state,
+        'moves': len(solver.hints) - 1,
+        'iters': progress.iter,
+        'states': progress.states,
+        'time': time.perf_counter() - t,
+    }
+
+
+def main(args):
+    parser = argparse.ArgumentParser(
+        description='Run the solver on many deals of a game and report '
+        'which ones are solvable.')
+    parser.add_argument('id', type=int, help='game id')
+    parser.add_argument('--seeds', type=int, default=100,
+                        help='number of deals (default: 100)')
+    parser.add_argument('--first-seed', type=int, default=1)
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='number of processes (default: all CPUs)')
+    parser.add_argument('--max-iters', type=int, default=100000,
+                        help='give up a deal after this many iterations '
+                        '(default: 100000)')
+    parser.add_argument('--preset', default=None,
+                        help='FreeCell Solver preset (e.g. "video-editing")')
+    parser.add_argument('--solvable', action='store_true',
+                        help='only print the seeds of the solvable deals')
+    opts = parser.parse_args(args)
+
+    gi = GAME_DB.get(opts.id)
+    if gi is None:
+        print('ERROR: unknown game %d' % opts.id, file=sys.stderr)
+        return 1
+    if opts.id not in GAME_DB.getGamesForSolver():
+        print('ERROR: %s has no solver' % gi.name, file=sys.stderr)
+        return 1
+    seeds = range(opts.first_seed, opts.first_seed + opts.seeds)
+
+    t = time.perf_counter()
+    results, errors = [], []
+    with ProcessPoolExecutor(max_workers=opts.jobs) as pool:
+        futures = [(seed, pool.submit(solve_deal, opts.id, seed,
+                                      opts.max_iters, opts.preset))
+                   for seed in seeds]
+        for seed, future in futures:
+            try:
+                results.append(future.result())
+            except Exception as ex:
+                errors.append((seed, repr(ex)))
+    total = time.perf_counter() - t
+
+    if opts.solvable:
+        for r in results:
+            if r['state'] == 'solved':
+                print(r['seed'])
+    else:
+        print('%20s  %-12s %6s %10s %10s %8s' %
+              ('seed', 'result', 'moves', 'iters', 'states', 'secs'))
+        for r in results:
+            print('%20d  %-12s %6d %10d %10d %8.2f' %
+                  (r['seed'], r['state'], max(r['moves'], 0), r['iters'],
+                   r['states'], r['time']))
+        counts = {}
+        for r in results:
+            counts[r['state']] = counts.get(r['state'], 0) + 1
+        summary = ['%d deals' % len(results)]
+        summary += ['%d %s' % (counts[k], k) for k in sorted(counts)]
+        print('%s: %s, %.1f sec' % (gi.name, ', '.join(summary), total))
+    for seed, err in errors:
+        print('ERROR %d: %s' % (seed, err), file=sys.stderr)
+    return int(bool(errors))
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
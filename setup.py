@@ -45,6 +45,8 @@ for d in ddirs:
                                  os.path.join(data_dir, d))
 
 data_files += get_data_files('locale', locale_dir)
+if os.path.exists('data/games.json'):
+    data_files.append((data_dir, ['data/games.json']))
 
 if os.name == 'posix':
     for size in os.listdir('data/images/icons'):
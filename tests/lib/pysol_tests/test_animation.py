@@ -0,0 +1,77 @@
+import unittest
+
+from pysollib.ui.tktile.animation import Animation, AnimationScheduler
+from pysollib.ui.tktile.animation import CardsMotion
+
+
+class _Widget:
+    # the Tk event loop with a clock that runs only in the timers
+    def __init__(self):
+        self.now = 0.0
+        self.timers = []
+        self.updates = 0
+        self.tk = self
+
+    def clock(self):
+        return self.now
+
+    def after(self, ms, func):
+        self.timers.append((self.now + ms / 1000.0, func))
+        return func
+
+    def after_cancel(self, timer):
+        self.timers = [t for t in self.timers if t[1] is not timer]
+
+    def update_idletasks(self):
+        self.updates += 1
+
+    def dooneevent(self):
+        self.timers.sort(key=lambda t: t[0])
+        when, func = self.timers.pop(0)
+        # a slow computer
+        self.now = when + 0.03
+        func()
+
+
+class _Card:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+    def moveBy(self, dx, dy):
+        self.x += dx
+        self.y += dy
+
+
+class AnimationSchedulerTests(unittest.TestCase):
+    def test_wait(self):
+        widget = _Widget()
+        scheduler = AnimationScheduler(widget, clock=widget.clock)
+        cards = [_Card(0, 0), _Card(0, 10)]
+        positions = []
+        motion = scheduler.start(CardsMotion(cards, 100, 50, 0.15))
+        other = scheduler.start(
+            Animation(lambda p: positions.append(cards[0].x), 0.3))
+        scheduler.wait(motion)
+        # TEST
+        self.assertEqual((cards[0].x, cards[0].y), (100, 50))
+        self.assertEqual((cards[1].x, cards[1].y), (100, 60))
+        # the frames are skipped on a slow computer
+        self.assertEqual(widget.updates, 4)
+        self.assertFalse(other.finished)
+        scheduler.finish()
+        scheduler.wait(other)
+        self.assertEqual(widget.updates, 5)
+        self.assertEqual(widget.timers, [])
+
+    def test_cancel(self):
+        widget = _Widget()
+        scheduler = AnimationScheduler(widget, clock=widget.clock)
+        seconds = []
+        animation = scheduler.start(Animation(seconds.append))
+        widget.dooneevent()
+        widget.dooneevent()
+        scheduler.cancel(animation)
+        # TEST
+        self.assertTrue(animation.finished)
+        self.assertEqual(len(seconds), 2)
+        self.assertEqual(widget.timers, [])
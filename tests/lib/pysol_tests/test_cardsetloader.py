@@ -0,0 +1,48 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pysollib.cardsetloader import CardsetLoader
+from pysollib.mfxutil import Image
+from pysollib.resource import Cardset
+
+
+@unittest.skipUnless(Image, 'needs PIL')
+class CardsetLoaderTests(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_load(self):
+        cs = Cardset()
+        cs.update(dict(ident='test', dir=self.dirname, ext='.png',
+                       suits='cs', ranks=(0, 1), ncards=4,
+                       backnames=('back01.png',), nbottoms=1, nletters=0))
+        names = cs.getFaceCardNames()
+        for i, name in enumerate(names + ['back01']):
+            im = Image.new('RGBA', (10, 10), (i, 0, 0, 255))
+            im.save(os.path.join(self.dirname, name + '.png'))
+        # not an image
+        with open(os.path.join(self.dirname, 'bottom01.png'), 'w') as f:
+            f.write('x')
+        loader = CardsetLoader(Image.open, lambda image: image)
+        job = loader.start(cs)
+        # TEST
+        self.assertIs(loader.start(cs), job)
+        self.assertEqual(len(job.filenames), 6)
+        for i, name in enumerate(names):
+            im = job.getImage(os.path.join(self.dirname, name + '.png'))
+            self.assertEqual(im.getpixel((0, 0)), (i, 0, 0, 255))
+        self.assertIsNone(
+            job.getImage(os.path.join(self.dirname, 'bottom01.png')))
+        self.assertIsNone(
+            job.getImage(os.path.join(self.dirname, 'l01.png')))
+        self.assertTrue(job.isDone())
+        loader.discard(cs)
+        self.assertIsNone(loader.get(cs))
+        self.assertTrue(job.discarded)
+        self.assertIsNot(loader.start(cs), job)
+        loader.discard(cs)
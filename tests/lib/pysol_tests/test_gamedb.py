@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+import pysollib.games  # noqa: F401
+import pysollib.games.mahjongg  # noqa: F401
+from pysollib.gamedb import GAME_DB, GI, GameInfo, GameInfoException
+from pysollib.gamedb import GameManager
+
+
+def _contains(search_string, name):
+    # Application.checkSearchString()
+    return all(t.upper() in name.upper() for t in search_string.split())
+
+
+class GameSearchIndexTests(unittest.TestCase):
+    def test_search_names(self):
+        index = GAME_DB.getSearchIndex()
+        games = GAME_DB.getAllGames()
+        for search in ('', 'cell', 'FREE cell', 'ki', 'a', 'klondike x',
+                       'spider ette'):
+            expected = sorted(gi.name for gi in games
+                              if _contains(search, gi.name))
+            result = sorted(name for name, id, alt in
+                            index.searchNames(search, usealt=False))
+            # TEST
+            self.assertEqual(result, expected, search)
+        result = index.searchNames('patience', usealt=True)
+        # TEST
+        self.assertTrue(any(alt for name, id, alt in result))
+
+    def test_select(self):
+        index = GAME_DB.getSearchIndex()
+        games = GAME_DB.getAllGames()
+        expected = set(gi.id for gi in games if gi.decks == 2 and
+                       gi.si.game_flags & GI.GT_OPEN and gi.redeals >= 4)
+        # TEST
+        self.assertEqual(index.select(decks=2, min_redeals=4,
+                                      flags=GI.GT_OPEN), expected)
+        name, ids = GI.GAMES_BY_PYSOL_VERSION[3]
+        present = set()
+        for n, g in GI.GAMES_BY_PYSOL_VERSION[:4]:
+            present.update(g)
+        # TEST
+        self.assertEqual(index.select(version=name),
+                         set(ids) & index.ids)
+        self.assertEqual(index.select(version=name,
+                                      version_compare='Present in'),
+                         present & index.ids)
+
+
+class GameManagerTests(unittest.TestCase):
+    def test_duplicates(self):
+        gdb = GameManager()
+        klondike = GAME_DB.get(2)
+        gdb._check_game(klondike)
+        gdb.register(klondike)
+        t = GI.GT_1DECK_TYPE
+        for gi in (GameInfo(900001, klondike.gameclass, 'Other', t, 1, 0),
+                   GameInfo(900002, object, klondike.name, t, 1, 0),
+                   GameInfo(900003, object, 'Other', t, 1, 0,
+                            altnames=klondike.name)):
+            # TEST
+            self.assertRaises(GameInfoException, gdb._check_game, gi)
+        gdb._check_game(GameInfo(900004, object, 'Other',
+                                 GI.GT_1DECK_TYPE, 1, 0))
+
+    def test_manifest(self):
+        fd, filename = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            GAME_DB.writeManifest(filename)
+            gdb = GameManager()
+            # TEST
+            self.assertTrue(gdb.loadManifest(filename))
+        finally:
+            os.remove(filename)
+        self.assertEqual(gdb.getGamesIdSortedByName(),
+                         GAME_DB.getGamesIdSortedByName())
+        self.assertEqual(sorted(gdb.getGamesForSolver()),
+                         sorted(GAME_DB.getGamesForSolver()))
+        klondike, gi = GAME_DB.get(2), gdb.get(2)
+        self.assertEqual((gi.short_name, gi.altnames, gi.si.game_flags),
+                         (klondike.short_name, klondike.altnames,
+                          klondike.si.game_flags))
+        # a plugin with the id of the game
+        self.assertRaises(GameInfoException, gdb.register,
+                          GameInfo(2, object, 'Plugin', GI.GT_1DECK_TYPE,
+                                   1, 0))
+        self.assertIsNone(gi.__dict__['gameclass'])
+        # the game is registered again when its module is imported
+        gdb.register(klondike)
+        self.assertIs(gdb.get(2), gi)
+        self.assertIs(gi.gameclass, klondike.gameclass)
@@ -0,0 +1,45 @@
+import unittest
+
+import pysollib.games  # noqa: F401
+from pysollib.headless import HeadlessApp
+
+
+class HeadlessTests(unittest.TestCase):
+    def _game(self, id, seed):
+        app = HeadlessApp()
+        game = app.constructGame(id)
+        app.newGame(game, seed)
+        return game
+
+    def test_freecell_deal(self):
+        game = self._game(8, 1)
+        # TEST
+        self.assertEqual(sum(len(r.cards) for r in game.s.rows), 52)
+        # TEST
+        self.assertEqual(
+            game.getSnapshotHash(), self._game(8, 1).getSnapshotHash(),
+            'the same seed gives the same deal')
+
+    def test_undo_redo(self):
+        game = self._game(2, 100)
+        ntalon = len(game.s.talon.cards)
+        before = game.getSnapshotHash(), game.getSnapshot()
+        game.dealCards()
+        after = game.getSnapshotHash(), game.getSnapshot()
+        # TEST
+        self.assertEqual(len(game.s.talon.cards), ntalon - 1)
+        self.assertNotEqual(before[1], after[1])
+        game.undo()
+        # TEST
+        self.assertEqual((game.getSnapshotHash(), game.getSnapshot()), before)
+        game.redo()
+        # TEST
+        self.assertEqual((game.getSnapshotHash(), game.getSnapshot()), after)
+
+    def test_demo(self):
+        app = HeadlessApp()
+        game = app.constructGame(8)
+        app.newGame(game, 24)
+        app.playDemo(game, max_moves=10)
+        # TEST
+        self.assertTrue(game.moves.index > 0, 'the demo made some moves')
@@ -1,9 +1,17 @@
 # Written by Shlomi Fish, under the MIT Expat License.
 
+import os
+import sys
+import tempfile
+import time
 import unittest
 
+import pysollib.games  # noqa: F401
+import pysollib.hint
 from pysollib.acard import AbstractCard
-from pysollib.hint import Base_Solver_Hint
+from pysollib.headless import HeadlessApp
+from pysollib.hint import Base_Solver_Hint, HintCache, SolverCache
+from pysollib.hint import SolverJob, solver_worker
 
 
 class HintTests(unittest.TestCase):
@@ -20,3 +28,183 @@ class HintTests(unittest.TestCase):
         # TEST
         self.assertEqual(got, '8D', 'card2str2 works')
         # diag('got == ' + got)
+
+    def test_hint_cache(self):
+        cache = HintCache(maxlen=2)
+        cache.put(1, ['a'])
+        cache.put(2, ['b'])
+        cache.get(1)
+        cache.put(3, ['c'])
+        # TEST
+        self.assertEqual(cache.get(1), ['a'])
+        self.assertIsNone(cache.get(2), 'least recently used is dropped')
+
+    def test_cached_hints(self):
+        app = HeadlessApp()
+        game = app.constructGame(8)
+        app.newGame(game, 1)
+        hints = game.getHints(0)
+        # TEST
+        self.assertIs(game.getHints(0), hints, 'same position')
+        self.assertIsNot(game.getHints(1), hints, 'other level')
+        score, pos, ncards, from_stack, to_stack, color, forced = hints[0]
+        from_stack.moveMove(ncards, to_stack, frames=0)
+        game.finishMove()
+        # TEST
+        self.assertIsNot(game.getHints(0), hints, 'other position')
+        game.undo()
+        # TEST
+        self.assertIs(game.getHints(0), hints, 'position after undo')
+
+    def _solve_with(self, script, cancel=False):
+        # run a fake fc-solve command in the solver worker
+        fd, filename = tempfile.mkstemp(suffix='.py')
+        with os.fdopen(fd, 'w') as fh:
+            fh.write(script)
+        old = (pysollib.hint.FCS_COMMAND, pysollib.hint.FCS_VERSION,
+               pysollib.hint.solver_cache)
+        pysollib.hint.FCS_COMMAND = '"%s" "%s"' % (sys.executable, filename)
+        pysollib.hint.FCS_VERSION = (4, 0, 0)
+        pysollib.hint.solver_cache = SolverCache()
+        try:
+            app = HeadlessApp()
+            game = app.constructGame(8)
+            app.newGame(game, 1)
+            solver = game.Solver_Class(game, None)
+            job = solver_worker.submit(solver)
+            if cancel:
+                while job.process is None and not job.finished:
+                    time.sleep(0.01)
+                job.cancel()
+            t = time.time()
+            while not job.finished and time.time() - t < 20:
+                time.sleep(0.01)
+            return game, solver, list(job.events())
+        finally:
+            (pysollib.hint.FCS_COMMAND, pysollib.hint.FCS_VERSION,
+             pysollib.hint.solver_cache) = old
+            os.remove(filename)
+
+    def test_solver_lib_cancel(self):
+        job = None
+
+        class _FakeLib:
+            # freecell_solver that never finds a solution
+            resumes = 0
+
+            def input_cmd_line(self, args):
+                pass
+
+            def limit_iterations(self, n):
+                self.limit = n
+
+            def solve_board(self, board):
+                # FCS_STATE_SUSPEND_PROCESS
+                return 5
+
+            def resume_solution(self):
+                self.resumes += 1
+                if self.resumes == 2:
+                    job.cancel()
+                return 5
+
+            def get_num_times(self):
+                return self.limit
+
+            def get_num_states_in_collection(self):
+                return 0
+
+        lib = _FakeLib()
+        old = (pysollib.hint.use_fc_solve_lib, pysollib.hint.FCS_VERSION,
+               getattr(pysollib.hint, 'fc_solve_lib_obj', None))
+        pysollib.hint.use_fc_solve_lib = True
+        pysollib.hint.fc_solve_lib_obj = lib
+        try:
+            app = HeadlessApp()
+            game = app.constructGame(8)
+            app.newGame(game, 1)
+            solver = game.Solver_Class(game, None)
+            solver.config(max_iters=100000)
+            board = solver.calcBoardString()
+            job = SolverJob(solver, board)
+            solver.job = job
+            solver.solveBoard(board)
+        finally:
+            (pysollib.hint.use_fc_solve_lib, pysollib.hint.FCS_VERSION,
+             pysollib.hint.fc_solve_lib_obj) = old
+        # TEST
+        self.assertEqual(lib.resumes, 2)
+        self.assertEqual(solver.solver_state, 'cancelled')
+        self.assertIn(('progress', {'iter': 2000, 'states': 0}),
+                      list(job.events()))
+
+    @unittest.skipIf(pysollib.hint.use_fc_solve_lib, 'uses fc-solve lib')
+    def test_solver_worker(self):
+        game, solver, events = self._solve_with(
+            'import sys\n'
+            'sys.stdin.read()\n'
+            'print("Move a card from stack 3 to freecell 0")\n'
+            'print("Move 2 cards from stack 1 to stack 2")\n')
+        # TEST
+        self.assertEqual(events, [
+            ('move', [1, game.s.rows[3], game.s.reserves[0]]),
+            ('move', [2, game.s.rows[1], game.s.rows[2]]),
+            ('done', 'solved'),
+        ])
+        self.assertEqual(len(solver.hints), 3)
+
+    @unittest.skipIf(pysollib.hint.use_fc_solve_lib, 'uses fc-solve lib')
+    def test_solver_worker_cancel(self):
+        game, solver, events = self._solve_with(
+            'import time\n'
+            'time.sleep(30)\n', cancel=True)
+        # TEST
+        self.assertEqual(events, [('done', 'cancelled')])
+
+    @unittest.skipIf(pysollib.hint.use_fc_solve_lib, 'uses fc-solve lib')
+    def test_solver_cache(self):
+        fd, filename = tempfile.mkstemp(suffix='.py')
+        with os.fdopen(fd, 'w') as fh:
+            fh.write('import sys\n'
+                     'sys.stdin.read()\n'
+                     'print("Move a card from stack 3 to freecell 0")\n'
+                     'print("Move a card from stack 1 to freecell 1")\n'
+                     'print("Move a card from stack 2 to freecell 2")\n')
+        old = (pysollib.hint.FCS_COMMAND, pysollib.hint.FCS_VERSION,
+               pysollib.hint.solver_cache)
+        pysollib.hint.FCS_COMMAND = '"%s" "%s"' % (sys.executable, filename)
+        pysollib.hint.FCS_VERSION = (4, 0, 0)
+        pysollib.hint.solver_cache = cache = SolverCache()
+        try:
+            app = HeadlessApp()
+            game = app.constructGame(8)
+            app.newGame(game, 1)
+            solver = game.Solver_Class(game, None)
+            solver.computeHints()
+            # TEST
+            self.assertEqual(len(cache), 3, 'the solution and 2 suffixes')
+            game.s.rows[3].moveMove(1, game.s.reserves[0], frames=0)
+            game.finishMove()
+            # the solver is not run again
+            pysollib.hint.FCS_COMMAND = 'false'
+            solver = game.Solver_Class(game, None)
+            solver.computeHints()
+            # TEST
+            self.assertEqual(solver.solver_state, 'solved')
+            self.assertTrue(solver.cached)
+            self.assertEqual(len(cache), 3)
+            self.assertEqual(solver.hints, [
+                [1, game.s.rows[1], game.s.reserves[1]],
+                [1, game.s.rows[2], game.s.reserves[2]],
+                None,
+            ])
+            cache.save(filename)
+            loaded = SolverCache()
+            loaded.load(filename)
+            key = solver._getCacheKey(solver.calcBoardString())
+            # TEST
+            self.assertEqual(loaded.get(key), cache.get(key))
+        finally:
+            (pysollib.hint.FCS_COMMAND, pysollib.hint.FCS_VERSION,
+             pysollib.hint.solver_cache) = old
+            os.remove(filename)
@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pysollib.imagecache import ScaledImageCache
+from pysollib.images import Images
+from pysollib.mfxutil import Image
+from pysollib.resource import Cardset
+
+
+class _Image:
+    # PIL_Image without Tk
+    resized = 0
+
+    def __init__(self, image=None, pil_image_orig=None):
+        self._pil_image = image
+        self._pil_image_orig = pil_image_orig or image
+
+    def resize(self, xf, yf, resample=-1):
+        _Image.resized += 1
+        w, h = self._pil_image_orig.size
+        im = self._pil_image_orig.resize((int(w*xf), int(h*yf)), resample)
+        return _Image(image=im, pil_image_orig=self._pil_image_orig)
+
+    def subsample(self, r):
+        _Image.resized += 1
+        w, h = self._pil_image.size
+        return _Image(image=self._pil_image.resize((w // r, h // r)))
+
+
+@unittest.skipUnless(Image, 'needs PIL')
+class ScaledImageCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_resize(self):
+        cs = Cardset()
+        cs.update(dict(ident='test', dir=os.path.join(self.dirname, 'cs'),
+                       CARDW=20, CARDH=30))
+        os.mkdir(cs.dir)
+        images = Images(None, cs)
+        images.cache = cache = ScaledImageCache(
+            os.path.join(self.dirname, 'cache'))
+        originals = [_Image(Image.new('RGBA', (20, 30), (i, 0, 0, 255)))
+                     for i in range(5)]
+
+        def scale(xf):
+            return images._scaleImages(
+                originals, xf, xf, Image.BILINEAR,
+                lambda im: im.resize(xf, xf, Image.BILINEAR))
+        scaled = scale(2)
+        # TEST
+        self.assertEqual(_Image.resized, 5)
+        self.assertEqual(scaled[3]._pil_image.size, (40, 60))
+        scale(1.5)
+        again = scale(2)
+        self.assertEqual(_Image.resized, 10)
+        self.assertEqual([im._pil_image.getpixel((0, 0)) for im in again],
+                         [(i, 0, 0, 255) for i in range(5)])
+        self.assertIs(again[3]._pil_image_orig, originals[3]._pil_image_orig)
+        # from the file, after the background thread saved it
+        cache._queue.join()
+        cache._memory.clear()
+        scaled = scale(2)
+        self.assertEqual(_Image.resized, 10)
+        self.assertEqual([im._pil_image.getpixel((0, 0)) for im in scaled],
+                         [(i, 0, 0, 255) for i in range(5)])
+
+    def test_subsample(self):
+        cs = Cardset()
+        cs.update(dict(ident='test', dir=self.dirname, CARDW=20, CARDH=30))
+        images = Images(None, cs)
+        images.cache = ScaledImageCache(os.path.join(self.dirname, 'cache'))
+        originals = [_Image(Image.new('RGBA', (20, 30), (i, 0, 0, 255)))
+                     for i in range(5)]
+        resized = [im.resize(2, 2, Image.BILINEAR) for im in originals]
+        _Image.resized = 0
+
+        def subsample(images_):
+            return images._scaleImages(
+                images_, 0.5, 0.5, 'subsample', lambda im: im.subsample(2),
+                from_orig=False)
+        subsample(resized)
+        subsampled = subsample(resized)
+        # TEST
+        self.assertEqual(_Image.resized, 5)
+        self.assertEqual(subsampled[0]._pil_image.size, (20, 30))
+        # the key depends on the size of the images that are subsampled
+        self.assertEqual(subsample(originals)[0]._pil_image.size, (10, 15))
+        self.assertEqual(_Image.resized, 10)
@@ -0,0 +1,74 @@
+import pickle
+import unittest
+
+import pysollib.games  # noqa: F401
+from pysollib.headless import HeadlessApp
+from pysollib.move import AMoveMove, AShuffleStackMove, AtomicMove
+from pysollib.move import MoveHistory
+
+
+class _OtherMove(AtomicMove):
+    def __init__(self, value):
+        self.value = value
+
+
+def _dicts(history):
+    return [[(am.__class__, am.__dict__) for am in move] for move in history]
+
+
+class MoveHistoryTests(unittest.TestCase):
+    def _history(self):
+        app = HeadlessApp()
+        game = app.constructGame(2)
+        app.newGame(game, 3)
+        app.playDemo(game, max_moves=20)
+        return game, game.moves.history
+
+    def test_packed(self):
+        game, history = self._history()
+        # TEST
+        self.assertIsInstance(history, MoveHistory)
+        self.assertEqual(len(history), game.moves.index)
+        copy = pickle.loads(pickle.dumps(history, -1))
+        # TEST
+        self.assertEqual(_dicts(copy), _dicts(history))
+
+    def test_list_operations(self):
+        game, history = self._history()
+        moves = list(history)
+        other = [_OtherMove((1, 2))]
+        history[3] = other
+        # TEST
+        self.assertEqual(_dicts(history), _dicts(moves[:3] + [other] +
+                                                 moves[4:]))
+        history[2] = moves[2]
+        history[5:] = [moves[1]]
+        # TEST
+        self.assertEqual(_dicts(history), _dicts(moves[:3] + [other] +
+                                                 moves[4:5] + moves[1:2]))
+        self.assertEqual(_dicts([history[-1]]), _dicts([moves[1]]))
+
+    def test_old_moves(self):
+        game, history = self._history()
+        moves = list(history)
+        # moves unpickled from an older save, without the later attributes
+        old = [am for move in moves for am in move
+               if am.__class__ is AShuffleStackMove or
+               am.__class__ is AMoveMove][:2]
+        for am in old:
+            del am.__dict__['state' if am.__class__ is AShuffleStackMove
+                            else 'shadow']
+        history = MoveHistory(moves)
+        # TEST
+        self.assertEqual(_dicts(history), _dicts(moves))
+
+    def test_undo_redo(self):
+        game, history = self._history()
+        index = game.moves.index
+        end = game.getSnapshot()
+        while game.moves.index > 0:
+            game.undo()
+        while game.moves.index < index:
+            game.redo()
+        # TEST
+        self.assertEqual(game.getSnapshot(), end)
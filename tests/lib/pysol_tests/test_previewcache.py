@@ -0,0 +1,54 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import pysollib.games  # noqa: F401
+from pysollib.gamedb import GAME_DB
+from pysollib.mfxutil import Image
+from pysollib.previewcache import PreviewCache
+from pysollib.resource import Cardset
+
+
+@unittest.skipUnless(Image, 'needs PIL')
+class PreviewCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        cs_dir = os.path.join(self.dir, 'cardset')
+        os.mkdir(cs_dir)
+        self.cardset = cs = Cardset()
+        cs.update(dict(ident='test', dir=cs_dir, ext='.png', CARDW=40,
+                       CARDH=60, CARD_XOFFSET=8, CARD_YOFFSET=12,
+                       suits='cshd', ranks=list(range(13)), trumps=(),
+                       ncards=52, backnames=['back.png'], backindex=0))
+        for name in self.cardset.getFaceCardNames() + ['back']:
+            Image.new('RGB', (40, 60), 'white').save(
+                os.path.join(cs_dir, name + '.png'))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _wait(self, cache, key):
+        for i in range(100):
+            if not cache.isPending(key):
+                break
+            time.sleep(0.1)
+
+    def test_render(self):
+        dirname = os.path.join(self.dir, 'previews')
+        cache = PreviewCache(dirname)
+        gi = GAME_DB.get(2)
+        key = cache.getKey(gi, self.cardset, 200, 150)
+        # TEST
+        self.assertIsNone(cache.get(key))
+        cache.request(key, gi, self.cardset)
+        self._wait(cache, key)
+        image, seed = cache.get(key)
+        # TEST
+        self.assertTrue(image.size[0] <= 200 and image.size[1] <= 150)
+        self.assertEqual(len(os.listdir(dirname)), 1)
+        # from the file
+        image, seed2 = PreviewCache(dirname).get(key)
+        # TEST
+        self.assertEqual(seed2, seed)
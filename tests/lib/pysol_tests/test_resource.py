@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pysollib.mfxutil import pickle
+from pysollib.resource import ResourceIndex
+
+
+class ResourceIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def _touch(self, name):
+        with open(os.path.join(self.dirname, name), 'w'):
+            pass
+
+    def test_listdir(self):
+        self._touch('a.png')
+        os.mkdir(os.path.join(self.dirname, 'sub'))
+        os.utime(self.dirname, (1000, 1000))
+        index = ResourceIndex()
+        names, files = index.listdir(self.dirname)
+        # TEST
+        self.assertEqual((sorted(names), files), (['a.png', 'sub'],
+                                                  ['a.png']))
+        # unchanged mtime: the directory is not read again
+        self._touch('b.png')
+        os.utime(self.dirname, (1000, 1000))
+        self.assertEqual(index.listdir(self.dirname)[1], ['a.png'])
+        os.utime(self.dirname, (2000, 2000))
+        self.assertEqual(sorted(index.listdir(self.dirname)[1]),
+                         ['a.png', 'b.png'])
+
+    def test_save(self):
+        filename = os.path.join(self.dirname, 'resources.dat')
+        index = ResourceIndex()
+        index.lookup('cardset', 'x', (1,), lambda: {'name': 'X'})
+        index.lookup('cardset', 'y', (1,), lambda: None)
+        index.save(filename)
+        index = ResourceIndex()
+        index.load(filename)
+        # TEST
+        self.assertEqual(index.lookup('cardset', 'x', (1,), dict),
+                         {'name': 'X'})
+        self.assertFalse(index.changed)
+        # y was not used
+        index.save(filename)
+        index = ResourceIndex()
+        index.load(filename)
+        self.assertEqual(len(index), 1)
+        # saved by another version
+        pickle(('0.0', {('cardset', 'x'): ((1,), {'name': 'X'})}),
+               filename, protocol=-1)
+        index = ResourceIndex()
+        index.load(filename)
+        self.assertEqual(len(index), 0)
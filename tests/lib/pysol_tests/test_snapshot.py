@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from pickle import Pickler
+
+import pysollib.games  # noqa: F401
+from pysollib.game import GameMoves
+from pysollib.headless import HeadlessApp
+from pysollib.snapshot import SnapshotStore
+
+
+class SnapshotStoreTests(unittest.TestCase):
+    def test_store(self):
+        store = SnapshotStore([3, 1, 2])
+        # TEST
+        self.assertTrue(1 in store)
+        self.assertFalse(4 in store)
+        self.assertEqual(list(store), [3, 1, 2])
+        store.add(3)
+        # TEST
+        self.assertEqual(list(store), [1, 2, 3], 'moved to the end')
+
+    def test_maxlen(self):
+        store = SnapshotStore(range(10), maxlen=4)
+        # TEST
+        self.assertEqual(list(store), [6, 7, 8, 9])
+        store.add(7)
+        store.add(10)
+        # TEST
+        self.assertEqual(list(store), [8, 9, 7, 10])
+
+    def test_bytes(self):
+        store = SnapshotStore([-1, 0, 2**64 - 2, 12345])
+        data = store.tobytes()
+        # TEST
+        self.assertEqual(len(data), 4 * 8)
+        copy = SnapshotStore.frombytes(data)
+        # TEST
+        self.assertEqual(list(copy), list(store))
+        self.assertTrue(-1 in copy)
+
+    def test_save_and_load(self):
+        app = HeadlessApp()
+        game = app.constructGame(2)
+        app.newGame(game, 7)
+        app.playDemo(game, max_moves=10)
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            game._saveGame(filename)
+            loaded = game._loadGame(filename, app)
+        finally:
+            os.remove(filename)
+        # TEST
+        self.assertEqual(list(loaded.snapshots), list(game.snapshots))
+
+    def test_load_format_1(self):
+        app = HeadlessApp()
+        game = app.constructGame(2)
+        app.newGame(game, 7)
+        app.playDemo(game, max_moves=10)
+        fd, filename = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                game._dumpGame(_Format1Pickler(Pickler(f, -1)))
+            loaded = game._loadGame(filename, app)
+        finally:
+            os.remove(filename)
+        # TEST
+        self.assertEqual(list(loaded.snapshots), list(game.snapshots))
+        self.assertEqual(len(loaded.moves.history), len(game.moves.history))
+        self.assertEqual(loaded.moves.index, game.moves.index)
+
+
+class _Format1Pickler:
+    # writes a game as the versions before SAVE_FORMAT 2 did
+    def __init__(self, p):
+        self.p = p
+
+    def dump(self, obj):
+        if isinstance(obj, tuple) and obj[:1] == ('save_format',):
+            return
+        if isinstance(obj, bytes):
+            obj = list(SnapshotStore.frombytes(obj))
+        elif isinstance(obj, GameMoves):
+            obj = GameMoves(current=obj.current, history=list(obj.history),
+                            index=obj.index, state=obj.state)
+        self.p.dump(obj)
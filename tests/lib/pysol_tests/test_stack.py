@@ -0,0 +1,90 @@
+import unittest
+
+import pysollib.stack
+from pysollib.acard import AbstractCard
+from pysollib.game import StackIndex
+
+from .common_mocks import MockApp, MockCanvas, MockItem
+
+
+class _Item(MockItem):
+    def __init__(self, raised):
+        self.raised = raised
+        self.moves = 0
+
+    def tkraise(self, above=None):
+        self.raised.append(self)
+
+    def move(self, dx, dy):
+        self.moves += 1
+
+
+class MockGame:
+    def __init__(self):
+        self.app = MockApp()
+        self.allstacks = []
+        self.stackmap = {}
+        self.canvas = MockCanvas()
+        self.preview = 0
+
+
+class RefreshViewTests(unittest.TestCase):
+    def test_refreshView(self):  # noqa: N802
+        g = MockGame()
+        stack = pysollib.stack.OpenStack(0, 0, g)
+        stack.CARD_XOFFSET, stack.CARD_YOFFSET = (0,), (10,)
+        stack.can_hide_cards = 0
+        stack.shrink_face_down = 2
+        raised = []
+        cards = []
+        for r in range(6):
+            c = AbstractCard(1000+r, 0, 0, r, g)
+            c.face_up = True
+            c.item = _Item(raised)
+            cards.append(c)
+            stack.addCard(c)
+        stack.refreshView()
+        # TEST
+        self.assertEqual([c.y for c in cards], [0, 10, 20, 30, 40, 50])
+        del raised[:]
+        for c in cards:
+            c.item.moves = 0
+        stack.refreshView()
+        self.assertEqual(raised, [])
+        # only the cards from the flipped one are raised, and only the
+        # cards above it are moved
+        cards[3].face_up = False
+        stack.refreshView()
+        self.assertEqual(raised, [c.item for c in cards[3:]])
+        self.assertEqual([c.y for c in cards], [0, 10, 20, 30, 35, 45])
+        self.assertEqual([c.item.moves for c in cards], [0, 0, 0, 0, 1, 1])
+
+
+class _Stack:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+
+class StackIndexTests(unittest.TestCase):
+    def _linear(self, cx, cy, stacks):
+        closest, cdist = None, 999999999
+        for stack in stacks:
+            dist = (stack.x - cx)**2 + (stack.y - cy)**2
+            if dist < cdist:
+                closest, cdist = stack, dist
+        return closest
+
+    def test_closest(self):
+        # some stacks on the same place, the first one wins
+        stacks = tuple(_Stack(x, y) for y in (0, 100, 200)
+                       for x in (300, 0, 100, 100, 200))
+        index = StackIndex(stacks)
+        # TEST
+        for cx in range(-50, 400, 25):
+            for cy in range(-50, 300, 25):
+                self.assertIs(index.closest(cx, cy),
+                              self._linear(cx, cy, stacks))
+        self.assertIs(index.closest(90, 0), stacks[2])
+        self.assertIs(index.closest(90, 0, lambda s, d: s.x != 100),
+                      stacks[1])
+        self.assertIsNone(StackIndex(()).closest(0, 0))
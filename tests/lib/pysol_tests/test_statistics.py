@@ -0,0 +1,161 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pysollib.games  # noqa: F401
+from pysollib.app_stat_journal import StatisticsJournal
+from pysollib.app_stat_result import GameStatResult, TopResults
+from pysollib.app_statistics import Statistics
+from pysollib.headless import HeadlessApp
+from pysollib.mfxutil import Struct, pickle, unpickle
+from pysollib.settings import TOP_SIZE
+
+
+class StatisticsJournalTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.checkpoint = os.path.join(self.dir, 'statistics.dat')
+        self.filename = os.path.join(self.dir, 'statistics.journal')
+        app = HeadlessApp()
+        self.game = app.constructGame(2)
+        app.newGame(self.game, 1)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _load(self):
+        stats = Statistics()
+        StatisticsJournal(self.checkpoint, self.filename).load(stats)
+        return stats
+
+    def test_journal(self):
+        stats = self._load()
+        stats.updateStats('p', self.game, 1)
+        stats.updateStats('p', self.game, 0)
+        stats = self._load()
+        # TEST
+        self.assertEqual(stats.getStats('p', self.game.id), (1, 1))
+        self.assertEqual(len(stats.prev_games['p']), 2)
+        stats.journal.compact(stats)
+        stats.updateStats('p', self.game, 1)
+        stats = self._load()
+        # TEST
+        self.assertEqual(stats.getStats('p', self.game.id), (2, 1))
+        self.assertEqual(len(stats.prev_games['p']), 3)
+        stats.resetStats('p', self.game.id)
+        stats = self._load()
+        # TEST
+        self.assertEqual(stats.getStats('p', self.game.id), (0, 0))
+        self.assertEqual(stats.prev_games.get('p'), [])
+        self.assertEqual(len(stats.all_prev_games['p']), 3)
+
+    def test_compaction(self):
+        stats = self._load()
+        for i in range(StatisticsJournal.COMPACT_RECORDS):
+            stats.updateStats('p', self.game, 1)
+        # TEST
+        self.assertTrue(os.path.exists(self.checkpoint))
+        self.assertEqual(stats.journal.records, 0)
+        stats = self._load()
+        # TEST
+        self.assertEqual(stats.getStats('p', self.game.id),
+                         (StatisticsJournal.COMPACT_RECORDS, 0))
+
+    def test_torn_write(self):
+        stats = self._load()
+        stats.updateStats('p', self.game, 1)
+        stats.updateStats('p', self.game, 0)
+        # the last record was not written completely
+        size = os.path.getsize(self.filename)
+        with open(self.filename, 'r+b') as fh:
+            fh.truncate(size - 13)
+        stats = self._load()
+        # TEST
+        self.assertEqual(stats.getStats('p', self.game.id), (1, 0))
+        stats.updateStats('p', self.game, 1)
+        stats.updateStats('p', self.game, 0)
+        stats = self._load()
+        # TEST
+        self.assertEqual(stats.getStats('p', self.game.id), (2, 1))
+        self.assertEqual(len(stats.prev_games['p']), 3)
+
+    def test_old_format(self):
+        stats = Statistics()
+        stats.updateStats('p', self.game, 1)
+        pickle(stats, self.checkpoint, protocol=-1)
+        stats = self._load()
+        # TEST
+        self.assertTrue(stats.journal.rewrite)
+        stats.journal.compact(stats)
+        stats = self._load()
+        # TEST
+        self.assertEqual(stats.getStats('p', self.game.id), (1, 0))
+        self.assertEqual(len(stats.prev_games['p']), 1)
+        self.assertEqual(len(stats.all_prev_games['p']), 1)
+
+
+class StatisticsIndexTests(unittest.TestCase):
+    def _sorted(self, stats, games, key):
+        # what Application.getGamesIdSortedBy*() used to do
+        def _key(a):
+            won, lost, time, moves = stats.getFullStats('p', a)
+            return (won + lost, won, lost, time, moves)[key]
+        return sorted(games, key=_key)[::-1]
+
+    def test_sorted_views(self):
+        app = HeadlessApp()
+        stats = Statistics()
+        games = app.gdb.getGamesIdSortedByName()
+        index = stats.getStatsIndex('p', games)
+        # TEST
+        self.assertEqual(index.getGamesIdSortedBy('played'),
+                         self._sorted(stats, games, 0))
+        for id, status in ((2, 1), (2, 0), (7, 1), (8, 0), (7, 1)):
+            game = app.constructGame(id)
+            app.newGame(game, 1)
+            stats.updateStats('p', game, status)
+        stats.resetStats('p', 8)
+        # TEST
+        self.assertIs(stats.getStatsIndex('p', games), index)
+        for key, sort_by in enumerate(('played', 'won', 'lost')):
+            self.assertEqual(index.getGamesIdSortedBy(sort_by),
+                             self._sorted(stats, games, key))
+        self.assertEqual(index.getFullStats(7), stats.getFullStats('p', 7))
+        self.assertEqual(stats.getSessionStats('p', 2), (1, 1))
+        self.assertEqual(stats.getSessionStats('p', 8), (0, 0))
+
+
+class TopResultsTests(unittest.TestCase):
+    def test_top(self):
+        top = TopResults()
+        positions = [top.add(1, v, str(v), 0) for v in (5, 3, 5, 4)]
+        # TEST
+        self.assertEqual(positions, [1, 1, 3, 2])
+        self.assertEqual([(r.value, r.game_number) for r in top],
+                         [(3, '3'), (4, '4'), (5, '5'), (5, '5')])
+        self.assertEqual(top.rank(4), 3)
+        for v in range(TOP_SIZE):
+            top.add(1, 10 + v, '', 0)
+        # TEST
+        self.assertEqual(len(top), TOP_SIZE)
+        self.assertIsNone(top.rank(top[-1].value))
+        self.assertIsNone(top.add(1, 100, '', 0))
+
+    def test_old_format(self):
+        result = GameStatResult()
+        result.update(2, 7, '7', 0)
+        result.__dict__['top'] = [
+            Struct(gameid=2, value=v, game_number=str(v), game_start_time=0)
+            for v in (1, 2)]
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            pickle(result, filename, protocol=-1)
+            result = unpickle(filename)
+        finally:
+            os.remove(filename)
+        # TEST
+        self.assertIsInstance(result.top, TopResults)
+        self.assertEqual([r.value for r in result.top], [1, 2])
+        self.assertEqual(result.update(2, 0, '0', 0), 1)